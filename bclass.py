@@ -22,291 +22,184 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 #=======================================================================
+import os
+from collections import namedtuple
+from output_file_writer import OutputFileWriter
+from class_generator import generate_cpp_class_from_file_buffer, ERROR_SEVERITY
+from file_buffer import FileBuffer, MappedFileBuffer
+from generation_profile import null_profile
 
-import time
-from type_info import TypeInfo
-from type_and_name_info import TypeAndNameInfo
-from function_info import FunctionInfo
-from bparse import Bparse
+# A generated class and the names of the class files that were written
+# for it.  The text chunks of the generated class can refer to the input
+# file, which is closed, so only the include names, the implementation
+# size and the diagnostics of the generated class are used.
+CreatedClass = namedtuple('CreatedClass', ['generated_class', 'file_name_list'])
 
-def get_date_and_year():
-    now = time.ctime()
-    now_list = now.split()
-    time_list = now_list[3].split(':')
-    day_of_week = now_list[0]
-    month = now_list[1]
-    day_number = now_list[2]
-    year = now_list[4]
-    date = '{0} {1}, {2}'.format(month, day_number, year)
-    return date, year
+# Input files that are at least this size are memory-mapped instead of
+# being read into memory.
+memory_map_threshold = 1048576
+
+def open_file_buffer(input_file):
+    """ Return a file buffer for the input file.  Large input files
+        are memory-mapped, so that method bodies are copied to the
+        output files without copying them into strings.
+    """
+    if os.name != 'nt' and os.fstat(input_file.fileno()).st_size >= memory_map_threshold:
+        return MappedFileBuffer(input_file)
+    return FileBuffer(input_file)
 
 def create_cpp_class_files(input_file_name,
                            class_name,
                            base_class,
                            author,
                            full_header,
-                           abstract_class):
-    """ Create class files. """
-    # Generate all of the class name strings.
-    if not author:
-        author = 'William Hallahan'
-    class_definition_file_name = '{0}.h'.format(class_name)
-    class_implementation_file_name = '{0}.cpp'.format(class_name)
-    conditional_include_name_text = '{0}_H'.format(class_name)
-    conditional_include_name_text = conditional_include_name_text.upper()
-    # Open the input file.
-    with open(input_file_name, 'r') as input_file:
-        # Create a parser.
-        parser = Bparse(input_file)
-        # Parse the input file.
-        data_member_type_and_name_info_list = []
-        definition_class_name_set = set()
-        implementation_class_name_set = set()
-        function_info_list = []
-        parse_success_status = True
-        exception_line_number = 0
+                           abstract_class,
+                           output_directory='',
+                           output_file_writer=None,
+                           date_time=None,
+                           profile=None,
+                           parse_index=None,
+                           project_class_name_set=None,
+                           minimal_includes=False,
+                           precompiled_header_name=''):
+    """ Create class files in the output directory.  The default
+        output directory is the current directory.  The output file
+        writer only writes a class file if the file text changed, and
+        counts the written and unchanged files.  The date and time for
+        the file headers can be fixed by passing a time.struct_time.
+        If a GenerationProfile is passed, then the time of each phase
+        and the counters are added to the profile, and the profile is
+        finished when the class files are written.  If a ParseIndex is
+        passed, then only the changed declarations are parsed.  If a set
+        of project class names is passed, then the project classes that
+        the class definition does not need by value are forward declared,
+        and if minimal includes is True, then every class that the class
+        definition does not need by value is forward declared.  If a
+        precompiled header name is passed, then the class implementation
+        file includes it first.  Return the list of the class file names.
+    """
+    return create_cpp_class(input_file_name,
+                            class_name,
+                            base_class,
+                            author,
+                            full_header,
+                            abstract_class,
+                            output_directory,
+                            output_file_writer,
+                            date_time,
+                            profile,
+                            parse_index,
+                            project_class_name_set,
+                            minimal_includes,
+                            precompiled_header_name).file_name_list
+
+def create_cpp_class(input_file_name,
+                     class_name,
+                     base_class,
+                     author,
+                     full_header,
+                     abstract_class,
+                     output_directory='',
+                     output_file_writer=None,
+                     date_time=None,
+                     profile=None,
+                     parse_index=None,
+                     project_class_name_set=None,
+                     minimal_includes=False,
+                     precompiled_header_name='',
+                     message_list=None):
+    """ Create class files the same as create_cpp_class_files does, and
+        return a CreatedClass tuple with the generated class and the list
+        of the class file names.  If a message list is passed, then the
+        messages about the class files are added to the list instead of
+        being printed.
+    """
+    if profile is None:
+        profile = null_profile
+    if output_file_writer is None:
+        output_file_writer = OutputFileWriter()
+    try:
+        # Read or memory-map the input file.
+        with profile.time_phase('read'):
+            with open(input_file_name, 'r') as input_file:
+                file_buffer = open_file_buffer(input_file)
+        profile.add_count('bytes_read', file_buffer.get_file_size())
         try:
-            parser.parse(data_member_type_and_name_info_list,
-                         definition_class_name_set,
-                         implementation_class_name_set,
-                         function_info_list,
-                         class_name)
-        except Exception as err:
-            # Something bad happened in the parser.  Attach the input file line number to
-            # The exception information.
-            err.args = ['{0}\nError parsing input file at line {1}.'.format(err.args[0], parser.get_line_number())]
-            raise
-        # If the class is derived from a base class, then include
-        # the header file for the base class.
-        if base_class:
-            base_class_type_info = TypeInfo()
-            base_class_type_info.set_name(base_class)
-            parser.save_include_name(definition_class_name_set,
-                                     implementation_class_name_set,
-                                     base_class_type_info)
-        # If a pure abstract class then ensure that all virtual method
-        # declarations end with '= 0'
-        if abstract_class:
-            for function_info in function_info_list:
-                # Only make 'virtual' methods be abstract.
-                method_type_and_name_info = function_info.get_method_type_and_name_info()
-                method_type_info = method_type_and_name_info.get_type_info()
-                # Test for a virtual method.  Do not make a virtual destructor be abstract
-                # unless the user already specified '= 0' at the end in the input file.
-                if (method_type_info.get_static_virtual_qualifier_type() == TypeInfo.VIRTUAL_QUALIFIER_TYPE
-                    and function_info.get_method_type() != FunctionInfo.METHOD_DESTRUCTOR):
-                    qualifier_text = function_info.get_qualifier()
-                    if not '=' in qualifier_text:
-                        qualifier_text = '{0} = 0'.format(qualifier_text)
-                        function_info.set_qualifier(qualifier_text)
-                    # Do not implement abstract functions.
-                    function_info.set_write_the_implementation(False)
-        # If there is a single virtual method then set the destructor to be virtual.
-        # Check for any virtual method.  Treat the destructor as a regular method.
-        has_virtual_method = False
-        for function_info in function_info_list:
-            method_type_and_name_info = function_info.get_method_type_and_name_info()
-            method_type_info = method_type_and_name_info.get_type_info()
-            if method_type_info.get_static_virtual_qualifier_type() == TypeInfo.VIRTUAL_QUALIFIER_TYPE:
-                has_virtual_method = True
-                break
-        if has_virtual_method:
-            for function_info in function_info_list:
-                if function_info.get_method_type() == FunctionInfo.METHOD_DESTRUCTOR:
-                    method_type_and_name_info = function_info.get_method_type_and_name_info()
-                    method_type_info = method_type_and_name_info.get_type_info()
-                    method_type_info.set_static_virtual_qualifier_type(TypeInfo.VIRTUAL_QUALIFIER_TYPE)
-        #--------------------------------------------------------------
-        # Write the class definition file.
-        #--------------------------------------------------------------
-        # Open the class definition file.
-        with open(class_definition_file_name, 'w') as class_definition_file:
-            # Write the class definition file header.
-            date_text, year_text = get_date_and_year()
-            stars_text = '//**********************************************************************'
-            class_definition_file.write('{0}\n'.format(stars_text))
-            class_definition_file.write('// Class Definition File: {0}\n'.format(class_definition_file_name))
-            class_definition_file.write('// Author: {0}\n'.format(author))
-            class_definition_file.write('// Date: {0}\n'.format(date_text))
-            class_definition_file.write('//\n')
-            class_definition_file.write('// Abstract:\n')
-            class_definition_file.write('//\n')
-            class_definition_file.write('//   This file contains the class definition for class {0}.\n'.format(class_name))
-            class_definition_file.write('//\n')
-            class_definition_file.write('// Copyright (c) {0}, {1}.\n'.format(year_text, author))
-            class_definition_file.write('//\n')
-            class_definition_file.write('{0}\n'.format(stars_text))
-            class_definition_file.write('\n')
-            class_definition_file.write('#ifndef {0}\n'.format(conditional_include_name_text))
-            class_definition_file.write('#define {0}\n'.format(conditional_include_name_text))
-            # Write the class definition include statements.
-            # Write the bracketed include statements first.
-            include_name = ''
-            if len(definition_class_name_set) > 0:
-                class_definition_file.write('\n')
-                # Write the include files lines for file names that are bracketed, such as '#include <vector>'.
-                for include_name in definition_class_name_set:
-                    if include_name[0] == '<':
-                        class_definition_file.write('#include {0};\n'.format(include_name))
-                # Write the include files lines for ordinary file names, such as '#include 'Foo.h''.
-                for include_name in definition_class_name_set:
-                    if include_name[0] != '<':
-                        if '.h' not in include_name:
-                            include_name = '{0}.h'.format(include_name)
-                        class_definition_file.write('#include "{0}";\n'.format(include_name))
-            # Write forward declarations.
-            if len(implementation_class_name_set)  > 0:
-                class_definition_file.write('\n')
-                for implementation_class_name in implementation_class_name_set:
-                    class_definition_file.write('class {0};\n'.format(implementation_class_name))
-            # Write the class definition header.
-            function_header_separator_text = '//======================================================================'
-            class_definition_file.write('\n{0}\n'.format(function_header_separator_text))
-            if abstract_class:
-                class_definition_file.write('// Abstract class Definition')
-            else:
-                class_definition_file.write('// Class Definition\n')
-            class_definition_file.write('{0}\n\n'.format(function_header_separator_text))
-            # Start the class definition.
-            if base_class:
-                class_definition_file.write('class {0} : public {1}\n{2}\n'.format(class_name, base_class, '{'))
-            else:
-                class_definition_file.write('class {0}\n{1}\n'.format(class_name, '{'))
-            # Write the class definition data member declarations.
-            # Skip the static data members in this loop and write
-            # the static declarations afterward.
-            if not abstract_class:
-                class_definition_file.write('protected:\n\n')
-                for data_member_type_and_name in data_member_type_and_name_info_list:
-                    the_type_info = data_member_type_and_name.get_type_info()
-                    if the_type_info.get_static_virtual_qualifier_type() != TypeInfo.STATIC_QUALIFIER_TYPE:
-                        render_text = data_member_type_and_name.get_type_and_name_text(TypeInfo.RENDER_DEFINITION_DATA_TYPE,
-                                                                                       TypeAndNameInfo.RENDER_NO_VALUE)
-                        class_definition_file.write('    {0};\n'.format(render_text))
-                class_definition_file.write('\n')
-                # Write the static data members.
-                for data_member_type_and_name in data_member_type_and_name_info_list:
-                    the_type_info = data_member_type_and_name.get_type_info()
-                    if the_type_info.get_static_virtual_qualifier_type() == TypeInfo.STATIC_QUALIFIER_TYPE:
-                        render_text = data_member_type_and_name.get_type_and_name_text(TypeInfo.RENDER_DEFINITION_DATA_TYPE,
-                                                                                       TypeAndNameInfo.RENDER_NO_VALUE)
-                        class_definition_file.write('    {0};\n'.format(render_text))
-            # Write the class definition functions declarations
-            # For the 'no copy' copy constructor and operator=().
-            # Only write the 'private:' keyword if a nocopy method exists
-            # and this is not an abstract class.
-            wrote_private = False
-            if not abstract_class:
-                for function_info in function_info_list:
-                    if not function_info.write_the_implementation():
-                        if not wrote_private:
-                            wrote_private = True
-                            class_definition_file.write('\n')
-                            class_definition_file.write('private:\n')
-                            in_class_header_separator_text = '    //------------------------------------------------------------------'
-                            class_definition_file.write('{0}\n'.format(in_class_header_separator_text))
-                            class_definition_file.write("    // Don't allow copying instances of this class.\n")
-                            class_definition_file.write('{0}\n'.format(in_class_header_separator_text))
-                        class_definition_file.write('\n')
-                        function_info.write_definition(class_definition_file)
-                class_definition_file.write('\n')
-            # Write the class definition functions declarations.
-            class_definition_file.write('public:\n')
-            for function_info in function_info_list:
-                if function_info.write_the_implementation():
-                    class_definition_file.write('\n')
-                    function_info.write_definition(class_definition_file)
-            # End the class definition.
-            class_definition_file.write('};\n\n')
-            # Close the conditional include statement
-            class_definition_file.write('#endif\n')
-            # Close the class definition file.
-            print 'Created class definition file {0}.'.format(class_definition_file_name)
-        #--------------------------------------------------------------
-        # Write the class implementation file.
-        #--------------------------------------------------------------
-        # Determine if there are any non-inline methods.
-        has_non_inline_methods = False
-        for function_info in function_info_list:
-            if not function_info.is_inline():
-                has_non_inline_methods = True
-        # If all methods are inline methods or this a pure abstract class
-        # then there is no implementation file.
-        if has_non_inline_methods:
-            # Open the class implementation file.
-            with open(class_implementation_file_name, 'w') as class_implementation_file:
-                # Write the class implementation file header.
-                class_implementation_file.write('{0}\n'.format(stars_text))
-                class_implementation_file.write('// Class Implementation File: {0}\n'.format(class_implementation_file_name))
-                class_implementation_file.write('// Author: {0}\n'.format(author))
-                class_implementation_file.write('// Date: {0}\n'.format(date_text))
-                class_implementation_file.write('//\n')
-                class_implementation_file.write('// Abstract:\n')
-                class_implementation_file.write('//\n')
-                class_implementation_file.write('//   This file contains the class implementation for class {0}.\n'.format(class_name))
-                class_implementation_file.write('//\n')
-                class_implementation_file.write('// Copyright (c) {0}, {1}.\n'.format(year_text, author))
-                class_implementation_file.write('//\n')
-                class_implementation_file.write('{0}\n\n'.format(stars_text))
-                # Write the class implementation include statements.
-                # Write the bracketed include statements first.
-                # Write the line to include the class header file.
-                class_implementation_file.write('#include "{0}.h\"\n'.format(class_name))
-                # Write the include files lines for file names that are bracketed, such as '#include <vector>'.
-                for include_name in implementation_class_name_set:
-                    if include_name[0] == '<':
-                        class_implementation_file.write('#include {0}\n'.format(include_name))
-                # Write the include files lines for ordinary file names, such as '#include "Foo.h"'.
-                for include_name in implementation_class_name_set:
-                    if include_name[0] != '<':
-                        if '.h' not in include_name:
-                            include_name = '{0}.h'.format(include_name)
-                        class_implementation_file.write('#include "{0}"\n'.format(include_name))
-                # Determine if there are any static data member declarations.
-                has_static_data_member = False
-                # Determine if there are any static data members.
-                for data_member_type_and_name_info in data_member_type_and_name_info_list:
-                    type_info = data_member_type_and_name_info.get_type_info()
-                    if type_info.get_static_virtual_qualifier_type() == type_info.STATIC_QUALIFIER_TYPE:
-                        has_static_data_member = True
-                # Are there any static data members?
-                if has_static_data_member:
-                    # Write the implementation static data member
-                    # declarations.  First write the section header.
-                    class_implementation_file.write('\n')
-                    class_implementation_file.write('{0}\n'.format(function_header_separator_text))
-                    class_implementation_file.write('// Static data member declarations\n')
-                    class_implementation_file.write('{0}\n\n'.format(function_header_separator_text))
-                    # Write the declaration for each static data member.
-                    for data_member_type_and_name_info in data_member_type_and_name_info_list:
-                        type_info = data_member_type_and_name_info.get_type_info()
-                        if type_info.get_static_virtual_qualifier_type() == type_info.STATIC_QUALIFIER_TYPE:
-                            # Put the '<classname>::' in front of the variable name.
-                            static_variable_name = '{0}::{1}'.format(class_name, data_member_type_and_name_info.get_name())
-                            static_data_type_and_name_info = TypeAndNameInfo()
-                            static_data_type_and_name_info.set_name(static_variable_name)
-                            # If no value is specified for the type and the type is a pointer type, then set the value to 'NULL'.
-                            # If the type is a pointer type then set the data member to NULL.
-                            static_data_member_value = data_member_type_and_name_info.get_value()
-                            if static_data_member_value:
-                                static_data_type_info = data_member_type_and_name_info.get_type_info()
-                                type_modifier_text = static_data_type_info.get_type_modifier()
-                                if  type_modifier_text == '*' or type_modifier_text == '**':
-                                    static_data_type_and_name_info.set_value('NULL')
-                            static_declaration_text = data_member_type_and_name_info.get_type_and_name_text(TypeInfo.RENDER_IMPLEMENTATION_OR_ARGUMENT_TYPE,
-                                                                                                            TypeAndNameInfo.RENDER_VALUE)
-                            class_implementation_file.write('{0};\n'.format(static_declaration_text))
-                # Write the class implementation function
-                # declarations.
-                for function_info in function_info_list:
-                    if function_info.write_the_implementation():
-                        function_info.write_implementation_header(class_implementation_file,
+            # Generate the class in memory.
+            generated_class = generate_cpp_class_from_file_buffer(file_buffer,
                                                                   class_name,
-                                                                  function_header_separator_text,
-                                                                  full_header)
-                        function_info.write_implementation(class_implementation_file,
-                                                           data_member_type_and_name_info_list,
-                                                           class_name)
-                print 'Created class implementation file {0}.'.format(class_implementation_file_name)
-    return 0
+                                                                  base_class,
+                                                                  author,
+                                                                  full_header,
+                                                                  abstract_class,
+                                                                  date_time,
+                                                                  profile,
+                                                                  parse_index,
+                                                                  project_class_name_set,
+                                                                  minimal_includes,
+                                                                  precompiled_header_name)
+            return CreatedClass(generated_class,
+                                write_generated_class(generated_class,
+                                                      output_directory,
+                                                      output_file_writer,
+                                                      profile,
+                                                      message_list))
+        finally:
+            # The generated class text can refer to the mapped input file.
+            file_buffer.close()
+    finally:
+        profile.finish()
+
+def print_message(message_text, message_list=None):
+    """ Print the message, or add it to the message list if a message
+        list is passed.
+    """
+    if message_list is None:
+        print message_text
+    else:
+        message_list.append(message_text)
+
+def write_generated_class(generated_class, output_directory, output_file_writer, profile, message_list=None):
+    """ Write the class files for the generated class and return the
+        list of the class file names.  The warnings and the names of the
+        written files are printed, or added to the message list if a
+        message list is passed.
+    """
+    output_file_name_list = []
+    for diagnostic in generated_class.get_diagnostic_list():
+        if diagnostic.severity == ERROR_SEVERITY:
+            raise ValueError('{0}\nError parsing input file at line {1}.'.format(diagnostic.message, diagnostic.line_number))
+        print_message('Warning: {0}'.format(diagnostic.message), message_list)
+    # Write the class definition file.
+    profile.start_phase('write')
+    class_definition_file_name = generated_class.get_header_file_name()
+    class_definition_file_path = os.path.join(output_directory, class_definition_file_name)
+    output_file_name_list.append(class_definition_file_path)
+    if write_class_file(output_file_writer, class_definition_file_path, generated_class.get_header_chunk_list(), profile):
+        print_message('Created class definition file {0}.'.format(class_definition_file_name), message_list)
+    else:
+        print_message('Class definition file {0} is unchanged.'.format(class_definition_file_name), message_list)
+    # Write the class implementation file.  If all methods are inline
+    # methods then there is no implementation file.
+    if generated_class.has_implementation():
+        class_implementation_file_name = generated_class.get_implementation_file_name()
+        class_implementation_file_path = os.path.join(output_directory, class_implementation_file_name)
+        output_file_name_list.append(class_implementation_file_path)
+        if write_class_file(output_file_writer, class_implementation_file_path, generated_class.get_implementation_chunk_list(), profile):
+            print_message('Created class implementation file {0}.'.format(class_implementation_file_name), message_list)
+        else:
+            print_message('Class implementation file {0} is unchanged.'.format(class_implementation_file_name), message_list)
+    profile.stop_phase()
+    return output_file_name_list
 
+def write_class_file(output_file_writer, file_name, chunk_list, profile):
+    """ Write a class file from the list of text chunks if the text
+        changed and count the bytes written.  Return True if the file
+        was written.
+    """
+    if output_file_writer.write_chunks(file_name, chunk_list):
+        profile.add_count('files_written')
+        profile.add_count('bytes_written', sum([len(chunk) for chunk in chunk_list]))
+        return True
+    profile.add_count('files_unchanged')
+    return False
@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+This program measures how fast the class generator parses input files
+and renders class files.  The input files are synthesized, so their
+size and shape can be controlled.  The time of each phase is measured
+separately.
+
+    lex                 - Splitting the input text into tokens.
+    parse               - Parsing the tokens, not including the include
+                          resolution.
+    include_resolution  - Deciding which header files to include and which
+                          classes to forward declare.
+    render              - Rendering the class definition file and the
+                          class implementation file text.
+
+Each phase is timed with cold caches, where the include decisions and
+the parsed template types that are kept for the whole process are
+cleared before each run, and with warm caches, where the same input file
+was just generated.  The cold times show the cost of a class that is
+generated once, and the warm times show the cost of a class that is
+generated again in the same process, such as in a batch or a server.
+
+The results are written as JSON so that they can be compared between
+releases.
+
+Usage:
+
+    python benchmark.py [-o output_file_name] [-r repeat_count] [-x scale] [-s shape_name]
+                        [-w spec_folder] [--data_members count] [--methods count]
+                        [--body_lines count] [--template_depth depth] [--properties count] [--copy]
+
+    The program accepts the following switches:
+
+        -o output_file_name, --output output_file_name    - Write the JSON results to the named file
+                                                            and print a summary.  The default is to
+                                                            write the JSON results to standard output.
+        -r repeat_count, --repeat repeat_count            - Time each input file this many times with
+                                                            cold caches and this many times with warm
+                                                            caches.  The default is 5.
+        -x scale, --scale scale                           - Multiply the number of data members, methods,
+                                                            and properties of every shape.  The default
+                                                            is 1.0.
+        -s shape_name, --shape shape_name                 - Only time the named shape.  This switch can
+                                                            be used more than once.  The shapes are small,
+                                                            data_members, methods, long_bodies,
+                                                            deep_templates, and properties.
+        -w spec_folder, --write_specs spec_folder         - Also write each synthesized input file into
+                                                            the named folder.
+        --data_members count                              - Time a custom shape with this many data members.
+        --methods count                                   - Time a custom shape with this many methods.
+        --body_lines count                                - The number of lines in each custom method body.
+        --template_depth depth                            - The template nesting depth of the custom types.
+        --properties count                                - Time a custom shape with this many properties.
+        --copy                                            - Put the 'copy:' keyword in the custom shape.
+        -h, --help                                        - Show help and exit
+
+    If any of the custom shape switches are used, then only the custom
+    shape is timed.  The custom shape values that are not given are the
+    same as the small shape.
+"""
+import sys
+import os
+import time
+import json
+import platform
+import timeit
+from collections import namedtuple
+from cStringIO import StringIO
+from argparse import ArgumentParser
+from bparse import Bparse
+from class_generator import get_date_and_year, render_class_definition, render_class_implementation
+from include_file_manager import include_decision_cache
+from template_type import clear_template_type_cache
+from output_cache import get_generator_version
+
+BENCHMARK_FORMAT_VERSION = 2
+
+# The shape of a synthesized input file.  Only one 'copy:' keyword is
+# allowed in an input file, so copy_keyword is either True or False.
+BenchmarkShape = namedtuple('BenchmarkShape', ['name',
+                                               'data_member_count',
+                                               'method_count',
+                                               'body_line_count',
+                                               'template_depth',
+                                               'property_count',
+                                               'copy_keyword'])
+
+benchmark_shape_list = [BenchmarkShape('small', 8, 10, 5, 1, 2, True),
+                        BenchmarkShape('data_members', 2000, 4, 2, 1, 0, False),
+                        BenchmarkShape('methods', 20, 1000, 5, 1, 0, True),
+                        BenchmarkShape('long_bodies', 10, 50, 200, 1, 0, True),
+                        BenchmarkShape('deep_templates', 200, 50, 3, 6, 0, False),
+                        BenchmarkShape('properties', 10, 10, 3, 1, 1000, True)]
+
+# The containers used to build template types.
+container_name_list = ['std::vector', 'std::list', 'std::deque', 'std::set']
+
+# The number of different class names used in the synthesized types.
+class_name_count = 50
+
+phase_name_list = ['lex', 'parse', 'include_resolution', 'render', 'total']
+
+def create_type_text(index, template_depth):
+    """ Return a class type name that is nested in template_depth containers. """
+    type_text = 'Type{0}'.format(index % class_name_count)
+    for depth in xrange(0, template_depth):
+        container_name = container_name_list[(index + depth) % len(container_name_list)]
+        type_text = '{0}<{1} >'.format(container_name, type_text)
+    return type_text
+
+def create_data_member_text(index, template_depth):
+    kind = index % 4
+    if kind == 0:
+        return 'int m_member_{0} = {0};'.format(index)
+    elif kind == 1:
+        return '{0} * m_member_{1};'.format(create_type_text(index, 0), index)
+    elif kind == 2:
+        return '{0} m_member_{1};'.format(create_type_text(index, 0), index)
+    return '{0} m_member_{1};'.format(create_type_text(index, template_depth), index)
+
+def create_method_text(index, body_line_count, template_depth):
+    kind = index % 3
+    if kind == 0:
+        signature_text = 'int method{0}(int value, const {1} & other)'.format(index, create_type_text(index, 0))
+    elif kind == 1:
+        signature_text = 'virtual void method{0}({1} * item) const'.format(index, create_type_text(index + 1, 0))
+    else:
+        signature_text = 'double method{0}(const {1} & items, double scale = 1.0)'.format(index,
+                                                                                       create_type_text(index + 2, template_depth))
+    line_list = [signature_text, '{']
+    for line_index in xrange(0, body_line_count):
+        if line_index % 5 == 4:
+            # Brackets in strings and character constants must not end the body.
+            line_list.append('    if (m_count > {0}) {{ log("}} {{"); m_last = \'}}\'; }}'.format(line_index))
+        else:
+            line_list.append('    m_count += {0}; // Update the count.'.format(line_index))
+    line_list.append('}')
+    return '\n'.join(line_list)
+
+def create_spec_text(data_member_count=8,
+                     method_count=10,
+                     body_line_count=5,
+                     template_depth=1,
+                     property_count=2,
+                     copy_keyword=True):
+    """ Return the text of an input file that has the requested shape. """
+    section_list = []
+    for index in xrange(0, data_member_count):
+        section_list.append(create_data_member_text(index, template_depth))
+    section_list.append('')
+    section_list.append('@()\n{\n}\n')
+    if copy_keyword:
+        section_list.append('copy:\n')
+    section_list.append('virtual ~@()\n{\n}\n')
+    for index in xrange(0, property_count):
+        section_list.append('property: int m_property_{0} Property{0}\n'.format(index))
+    for index in xrange(0, method_count):
+        section_list.append('{0}\n'.format(create_method_text(index, body_line_count, template_depth)))
+    return '\n'.join(section_list)
+
+def scale_shape(shape, scale):
+    return shape._replace(data_member_count=int(shape.data_member_count * scale),
+                          method_count=int(shape.method_count * scale),
+                          property_count=int(shape.property_count * scale))
+
+def create_shape_spec_text(shape):
+    return create_spec_text(shape.data_member_count,
+                            shape.method_count,
+                            shape.body_line_count,
+                            shape.template_depth,
+                            shape.property_count,
+                            shape.copy_keyword)
+
+def clear_process_caches():
+    """ Clear the caches that are kept for every class generated in this
+        process.
+    """
+    include_decision_cache.clear()
+    clear_template_type_cache()
+
+def time_class_generation(spec_text, class_name='Benchmark', cold_caches=True):
+    """ Generate a class once and return a dictionary with the elapsed
+        time of each phase in seconds, and the size of the output.  If
+        cold caches is True, then the process caches are cleared first.
+    """
+    if cold_caches:
+        clear_process_caches()
+    timer = timeit.default_timer
+    # The parser lexes the tokens while parsing.  Time the lexing and
+    # the include resolution separately by wrapping the lexer methods
+    # and the parser method that resolves each type name.
+    lex_time_list = [0.0]
+    include_time_list = [0.0]
+    def create_timed_method(method, time_list):
+        def timed_method(*argument_list):
+            method_start_time = timer()
+            result = method(*argument_list)
+            time_list[0] += timer() - method_start_time
+            return result
+        return timed_method
+    start_time = timer()
+    # Creating the parser lexes the first token.
+    parser = Bparse(StringIO(spec_text))
+    create_time = timer() - start_time
+    parser.lexer.next_token = create_timed_method(parser.lexer.next_token, lex_time_list)
+    parser.lexer.skip_block = create_timed_method(parser.lexer.skip_block, lex_time_list)
+    parser._save_include_name = create_timed_method(parser._save_include_name, include_time_list)
+    data_member_type_and_name_info_list = []
+    definition_class_name_set = set()
+    implementation_class_name_set = set()
+    function_info_list = []
+    start_time = timer()
+    parser.parse(data_member_type_and_name_info_list,
+                 definition_class_name_set,
+                 implementation_class_name_set,
+                 function_info_list,
+                 class_name)
+    include_resolution_time = include_time_list[0]
+    parse_time = timer() - start_time - lex_time_list[0] - include_resolution_time
+    lex_time = create_time + lex_time_list[0]
+    # Render both class files with a fixed date.
+    start_time = timer()
+    date_text, year_text = get_date_and_year(time.gmtime(0))
+    definition_include_name_list = sorted(definition_class_name_set)
+    implementation_include_name_list = sorted(implementation_class_name_set)
+    header_text = ''.join(render_class_definition(class_name,
+                                                  '',
+                                                  'Benchmark',
+                                                  date_text,
+                                                  year_text,
+                                                  False,
+                                                  definition_include_name_list,
+                                                  implementation_include_name_list,
+                                                  data_member_type_and_name_info_list,
+                                                  function_info_list))
+    implementation_text = ''.join(render_class_implementation(class_name,
+                                                              'Benchmark',
+                                                              date_text,
+                                                              year_text,
+                                                              True,
+                                                              implementation_include_name_list,
+                                                              data_member_type_and_name_info_list,
+                                                              function_info_list))
+    render_time = timer() - start_time
+    return {'lex': lex_time,
+            'parse': parse_time,
+            'include_resolution': include_resolution_time,
+            'render': render_time,
+            'total': lex_time + parse_time + include_resolution_time + render_time,
+            'token_count': len(parser.token_list),
+            'output_size': len(header_text) + len(implementation_text)}
+
+def get_statistics(value_list):
+    sorted_value_list = sorted(value_list)
+    count = len(sorted_value_list)
+    if count % 2 == 1:
+        median = sorted_value_list[count // 2]
+    else:
+        median = (sorted_value_list[count // 2 - 1] + sorted_value_list[count // 2]) / 2.0
+    return {'min': sorted_value_list[0],
+            'median': median,
+            'mean': sum(sorted_value_list) / count}
+
+def run_benchmark(shape, repeat_count, spec_folder=''):
+    """ Time one shape and return the result dictionary. """
+    spec_text = create_shape_spec_text(shape)
+    if spec_folder:
+        with open(os.path.join(spec_folder, '{0}.txt'.format(shape.name)), 'w') as spec_file:
+            spec_file.write(spec_text)
+    # The first run is not timed so that every module is loaded.
+    time_class_generation(spec_text)
+    timing_list = []
+    warm_timing_list = []
+    for index in xrange(0, repeat_count):
+        timing_list.append(time_class_generation(spec_text, cold_caches=True))
+        warm_timing_list.append(time_class_generation(spec_text, cold_caches=False))
+    phase_dict = {}
+    warm_phase_dict = {}
+    for phase_name in phase_name_list:
+        phase_dict[phase_name] = get_statistics([timing[phase_name] for timing in timing_list])
+        warm_phase_dict[phase_name] = get_statistics([timing[phase_name] for timing in warm_timing_list])
+    return {'name': shape.name,
+            'shape': shape._asdict(),
+            'spec_size': len(spec_text),
+            'spec_line_count': spec_text.count('\n') + 1,
+            'token_count': timing_list[0]['token_count'],
+            'output_size': timing_list[0]['output_size'],
+            'repeat_count': repeat_count,
+            'phases': phase_dict,
+            'warm_phases': warm_phase_dict}
+
+def print_summary(result_list):
+    print '{0:<16} {1:>10} {2:>10} {3:>10} {4:>10} {5:>10} {6:>10} {7:>12} {8:>10}'.format('Shape', 'Lines', 'Lex ms',
+                                                                                       'Parse ms', 'Include ms',
+                                                                                       'Render ms', 'Total ms',
+                                                                                       'Warm incl ms', 'Warm ms')
+    for result in result_list:
+        phase_dict = result['phases']
+        warm_phase_dict = result['warm_phases']
+        print '{0:<16} {1:>10} {2:>10.1f} {3:>10.1f} {4:>10.1f} {5:>10.1f} {6:>10.1f} {7:>12.1f} {8:>10.1f}'.format(result['name'],
+                                                                                         result['spec_line_count'],
+                                                                                         phase_dict['lex']['median'] * 1000.0,
+                                                                                         phase_dict['parse']['median'] * 1000.0,
+                                                                                         phase_dict['include_resolution']['median'] * 1000.0,
+                                                                                         phase_dict['render']['median'] * 1000.0,
+                                                                                         phase_dict['total']['median'] * 1000.0,
+                                                                                         warm_phase_dict['include_resolution']['median'] * 1000.0,
+                                                                                         warm_phase_dict['total']['median'] * 1000.0)
+
+# Start of main program.
+def main(argv=None):
+    # Initialize the command line parser.
+    parser = ArgumentParser(description='This program measures the speed of the class generator.',
+                            epilog='Copyright (c) 2013 William Hallahan.',
+                            add_help=True,
+                            argument_default=None, # Global argument default
+                            usage=__doc__)
+    shape_name_list = [shape.name for shape in benchmark_shape_list]
+    parser.add_argument('-o', '--output', action='store', dest='output_file_name', default='', help='The JSON results file name.')
+    parser.add_argument('-r', '--repeat', action='store', type=int, dest='repeat_count', default=5, help='The number of times each input file is timed.')
+    parser.add_argument('-x', '--scale', action='store', type=float, dest='scale', default=1.0, help='Multiply the size of every shape.')
+    parser.add_argument('-s', '--shape', action='append', dest='shape_name_list', default=[], choices=shape_name_list, help='Only time the named shape.')
+    parser.add_argument('-w', '--write_specs', action='store', dest='spec_folder', default='', help='Write the input files into this folder.')
+    parser.add_argument('--data_members', action='store', type=int, dest='data_member_count', default=None, help='The number of data members.')
+    parser.add_argument('--methods', action='store', type=int, dest='method_count', default=None, help='The number of methods.')
+    parser.add_argument('--body_lines', action='store', type=int, dest='body_line_count', default=None, help='The number of lines in each method body.')
+    parser.add_argument('--template_depth', action='store', type=int, dest='template_depth', default=None, help='The template nesting depth.')
+    parser.add_argument('--properties', action='store', type=int, dest='property_count', default=None, help='The number of properties.')
+    parser.add_argument('--copy', action='store_true', dest='copy_keyword', default=False, help="Put the 'copy:' keyword in the input file.")
+    # Parse the command line.
+    arguments = parser.parse_args(args=argv)
+    if arguments.repeat_count < 1:
+        parser.error('The repeat count must be at least 1.')
+    # Get the list of shapes to time.
+    shape_list = benchmark_shape_list
+    if arguments.shape_name_list:
+        shape_list = [shape for shape in benchmark_shape_list if shape.name in arguments.shape_name_list]
+    custom_value_dict = {}
+    for field_name in ['data_member_count', 'method_count', 'body_line_count', 'template_depth', 'property_count']:
+        value = getattr(arguments, field_name)
+        if value is not None:
+            custom_value_dict[field_name] = value
+    if custom_value_dict or arguments.copy_keyword:
+        custom_value_dict['copy_keyword'] = arguments.copy_keyword
+        shape_list = [benchmark_shape_list[0]._replace(name='custom', **custom_value_dict)]
+    shape_list = [scale_shape(shape, arguments.scale) for shape in shape_list]
+    status = 0
+    try:
+        if arguments.spec_folder and not os.path.exists(arguments.spec_folder):
+            os.makedirs(arguments.spec_folder)
+        result_list = [run_benchmark(shape, arguments.repeat_count, arguments.spec_folder) for shape in shape_list]
+        benchmark_dict = {'format_version': BENCHMARK_FORMAT_VERSION,
+                          'generator_version': get_generator_version(),
+                          'python_version': platform.python_version(),
+                          'platform': platform.platform(),
+                          'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                          'results': result_list}
+        results_text = json.dumps(benchmark_dict, indent=1, sort_keys=True)
+        if arguments.output_file_name:
+            with open(arguments.output_file_name, 'w') as output_file:
+                output_file.write('{0}\n'.format(results_text))
+            print_summary(result_list)
+        else:
+            print results_text
+    except ValueError as value_error:
+        print value_error
+        status = -1
+    except EnvironmentError as environment_error:
+        print environment_error
+        status = -1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The lexer turns the input file text into tokens, one token at a time,
+  as the parser asks for them.  Whitespace and comments are not returned
+  as tokens.  Every token records its start and end offset in the text,
+  so the parser can tell whether two tokens are adjacent and can copy
+  text, such as a method body, directly out of the input file text.
+  A method body is skipped without creating any tokens.
+
+  The text can be a string or a read-only memory map.
+"""
+import re
+from collections import namedtuple
+
+# The largest piece of a memory map that is copied into a string to count
+# the lines in a range of the text.
+count_piece_size = 1048576
+
+def count_newlines(text, start, end):
+    """ Return the number of newline characters in text[start:end]. """
+    if isinstance(text, str):
+        return text.count('\n', start, end)
+    newline_count = 0
+    while start < end:
+        piece_end = min(end, start + count_piece_size)
+        newline_count += text[start:piece_end].count('\n')
+        start = piece_end
+    return newline_count
+
+Token = namedtuple('Token', ['kind', 'text', 'start', 'end', 'line_number'])
+
+class Blexer:
+
+    # Token kinds.
+    IDENTIFIER_TOKEN = 0
+    LABEL_TOKEN = 1
+    SCOPE_TOKEN = 2
+    STRING_TOKEN = 3
+    CHARACTER_TOKEN = 4
+    PUNCTUATION_TOKEN = 5
+    END_OF_FILE_TOKEN = 6
+
+    # Any character that is not matched by this pattern is whitespace,
+    # which re.search() skips.  Keywords such as 'copy:' are label tokens.
+    token_pattern = re.compile(r'''
+        (?P<comment>//[^\n]*|/\*.*?\*/)
+      | (?P<label>[A-Za-z0-9_]+:(?!:))
+      | (?P<identifier>[A-Za-z0-9_]+)
+      | (?P<scope>::)
+      | (?P<string>"(?:\\.|[^"\\\n])*")
+      | (?P<character>'(?:\\.|[^'\\\n])*')
+      | (?P<punctuation>\S)
+      ''', re.VERBOSE | re.DOTALL)
+
+    kind_dict = {'label' : LABEL_TOKEN,
+                 'identifier' : IDENTIFIER_TOKEN,
+                 'scope' : SCOPE_TOKEN,
+                 'string' : STRING_TOKEN,
+                 'character' : CHARACTER_TOKEN,
+                 'punctuation' : PUNCTUATION_TOKEN}
+
+    # Brackets inside of comments, quoted strings and character literals
+    # do not start or end a block.
+    block_pattern = re.compile(r'''
+        //[^\n]*|/\*.*?\*/
+      | "(?:\\.|[^"\\\n])*"
+      | '(?:\\.|[^'\\\n])*'
+      | (?P<open>\{)
+      | (?P<close>\})
+      ''', re.VERBOSE | re.DOTALL)
+
+    def __init__(self, text, position=0, line_number=1):
+        self.text = text
+        self.position = position
+        self.line_number = line_number
+
+    def set_position(self, position, line_number):
+        """ Continue lexing at the offset, which is on the passed line
+            number.  The offset must not be inside of a token.
+        """
+        self.position = position
+        self.line_number = line_number
+
+    def next_token(self):
+        """ Return the next token.  At the end of the text, an end-of-file
+            token is returned.
+        """
+        text = self.text
+        while True:
+            match = Blexer.token_pattern.search(text, self.position)
+            if match is None:
+                text_length = len(text)
+                self.line_number += count_newlines(text, self.position, text_length)
+                self.position = text_length
+                return Token(Blexer.END_OF_FILE_TOKEN, '', text_length, text_length, self.line_number)
+            start = match.start()
+            end = match.end()
+            self.line_number += count_newlines(text, self.position, start)
+            self.position = end
+            group_name = match.lastgroup
+            if group_name != 'comment':
+                return Token(Blexer.kind_dict[group_name], match.group(), start, end, self.line_number)
+            # A block comment can span lines.
+            self.line_number += count_newlines(text, start, end)
+
+    def skip_block(self, start, line_number):
+        """ Skip the block that starts with the open bracket at the start
+            offset, which is on the passed line number.  Return the offset
+            after the bracket that closes the block, or the length of the
+            text if the block is not closed.  The next token is the first
+            token after the block.
+        """
+        text = self.text
+        end = len(text)
+        bracket_count = 0
+        for match in Blexer.block_pattern.finditer(text, start):
+            group_name = match.lastgroup
+            if group_name == 'open':
+                bracket_count += 1
+            elif group_name == 'close':
+                bracket_count -= 1
+                if bracket_count == 0:
+                    end = match.end()
+                    break
+        self.line_number = line_number + count_newlines(text, start, end)
+        self.position = end
+        return end
+
+    def tokenize(self):
+        """ Return the list of tokens for the rest of the text.  The last
+            token in the list is always an end-of-file token.
+        """
+        token_list = []
+        while True:
+            token = self.next_token()
+            token_list.append(token)
+            if token.kind == Blexer.END_OF_FILE_TOKEN:
+                return token_list
@@ -24,10 +24,12 @@
 #=======================================================================
 
 from file_buffer import FileBuffer
-from type_info import TypeInfo
+from blexer import Blexer
+from type_info import TypeInfo, TypeInfoTable, is_intrinsic_type
 from type_and_name_info import TypeAndNameInfo
 from function_info import FunctionInfo
-from include_file_manager import IncludeFileManager
+from include_file_manager import include_decision_cache
+from parse_index import DeclarationRecord, get_text_hash, dump_declaration_data, load_declaration_data
 
 class Bparse:
 
@@ -35,9 +37,8 @@ class Bparse:
     FUNCTION_SIGNATURE_STATE = 1
     FUNCTION_BODY_STATE = 2
 
-    def __init__(self, input_file):
+    def __init__(self, input_file, file_buffer=None):
         self.parser_state = Bparse.DATA_STATE
-        self.file_position = 0
         self.line_number = 1
         self.has_inline_keyword = False
         self.has_copy_constructor = False
@@ -45,38 +46,119 @@ class Bparse:
         self.class_name = ''
         self.destructor_name = ''
         self.input_file = input_file
-        self.file_buffer = FileBuffer(self.input_file)
-        self.file_name_manager = IncludeFileManager()
-        self.variable_characters = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_'
-        self.intrinsic_type_checker = TypeInfo()
+        if file_buffer is None:
+            file_buffer = FileBuffer(self.input_file)
+        self.file_buffer = file_buffer
+        self.text = self.file_buffer.get_text()
+        # The tokens are lexed as the parser needs them.  Method bodies
+        # are skipped without being lexed.
+        self.lexer = Blexer(self.text)
+        self.token_list = [self.lexer.next_token()]
+        self.token_index = 0
+        self.token = self.token_list[0]
+        # Equal types share one TypeInfo instance.  Each type is parsed into
+        # the parsed type, which is then found in the type table.
+        self.type_info_table = TypeInfoTable()
+        self.parsed_type_info = TypeInfo()
+        # The types that were passed to the _save_include_name method, and
+        # the state of the declaration that is being parsed, which are used
+        # to save the declarations in a parse index.
+        self.include_type_info_list = []
+        self.declaration_start = None
+        self.declaration_line_number = 1
+        self.body_range_dict = None
+        self.parsed_declaration_count = 0
+        self.reused_declaration_count = 0
 
     def parse(self,
               data_member_type_and_name_info_list,
               definition_class_name_set,
               implementation_class_name_set,
               function_info_list,
-              class_name):
-        # Parse the entire input file.
+              class_name,
+              parse_index=None):
+        # Parse the entire input file.  If a parse index is passed, then
+        # the declarations that did not change since the index was saved
+        # are taken from the index instead of being parsed again, and the
+        # index is updated.
         # Save the class name and the destructor name.
         self.class_name = class_name
         self.destructor_name = '~{0}'.format(self.class_name)
-        # Point to the first byte of the file.
-        self.file_position = 0
         # Initialize parse variables.
-        copy_keyword_found_in_input_file = False
-        nocopy_keyword_found_in_input_file = False
+        self.copy_keyword_found_in_input_file = False
+        self.nocopy_keyword_found_in_input_file = False
+        if parse_index is None:
+            # Point to the first token of the file.
+            self._set_token_index(0)
+            self._parse_declarations(data_member_type_and_name_info_list,
+                                     definition_class_name_set,
+                                     implementation_class_name_set,
+                                     function_info_list,
+                                     0)
+        else:
+            self._parse_with_index(data_member_type_and_name_info_list,
+                                   definition_class_name_set,
+                                   implementation_class_name_set,
+                                   function_info_list,
+                                   parse_index)
+        # Don't allow two copy constructors and operator=() methods.
+        if self.copy_keyword_found_in_input_file and self.nocopy_keyword_found_in_input_file:
+            raise ValueError('Cannot use both the copy: and nocopy: keywords.  Line {0}'.format(self.line_number))
+        # If the the 'copy:' keyword was used, then fill in the Copy
+        # method body now that all the data members have been parsed.
+        if self.copy_keyword_found_in_input_file:
+            # Find the Copy method that was produced by the copy keyword.
+            for the_function_info in function_info_list:
+                # Is this function the 'Copy' function produced by the 'copy:' keyword?
+                if the_function_info.get_method_type() == FunctionInfo.METHOD_COPY:
+                    self._set_copy_method_body(the_function_info, data_member_type_and_name_info_list)
+        # Sort the function names.  The order is constructors, copy constructor, destructor,
+        # operator equals, and then other methods.
+        function_info_list.sort(key=lambda finfo: finfo.get_method_type())
+
+    def _parse_declarations(self,
+                            data_member_type_and_name_info_list,
+                            definition_class_name_set,
+                            implementation_class_name_set,
+                            function_info_list,
+                            declaration_start,
+                            declaration_record_list=None,
+                            end_declaration_dict=None):
+        # Parse the declarations from the current token up to the end of
+        # the file.  If a declaration record list is passed, then a record
+        # of each declaration is added to the list.  Parsing stops at the
+        # start of a declaration in the end declaration dictionary, and the
+        # index of the declaration record is returned.
         the_type_and_name_info = TypeAndNameInfo()
-        last_parse_position = -1
-        # Loop and parse all characters in the input file.
-        while not self.file_buffer.past_end_of_file():
+        last_token_index = -1
+        # Loop and parse all tokens in the input file.
+        while self.token.kind != Blexer.END_OF_FILE_TOKEN:
             # Check to see if the parser is unable to consume
-            # the current character at 'self.file_position'.
-            if last_parse_position == self.file_position:
+            # the current token at 'self.token_index'.
+            if last_token_index == self.token_index:
                 raise ValueError('Illegal character on line {0}'.format(self.line_number))
             # Save the current parse position.
-            last_parse_position = self.file_position
+            last_token_index = self.token_index
             # Parse from the current file position.
             if self.parser_state == Bparse.DATA_STATE:
+                # A declaration starts here.
+                if declaration_record_list is not None:
+                    if self.declaration_start is not None:
+                        declaration_start = self.token.start
+                        self._end_declaration(declaration_start,
+                                              data_member_type_and_name_info_list,
+                                              function_info_list,
+                                              declaration_record_list)
+                        self.declaration_line_number = self.token.line_number
+                    # Stop at an unchanged declaration, unless the rest of
+                    # the file has a copy keyword that must be parsed again
+                    # to report the error.
+                    end_declaration = end_declaration_dict.get(declaration_start)
+                    if end_declaration is not None and not (end_declaration[1] and self.has_copy_constructor):
+                        return end_declaration[0]
+                    self._start_declaration(declaration_start,
+                                            data_member_type_and_name_info_list,
+                                            function_info_list)
                 found_copy_keyword = False
                 found_nocopy_keyword = False
                 found_property_keyword = False
@@ -94,18 +176,18 @@ class Bparse:
                     found_copy_keyword = self._parse_copy(function_info_list)
                     if found_copy_keyword:
                         # A second 'copy:' keyword is not allowed.
-                        if copy_keyword_found_in_input_file:
+                        if self.copy_keyword_found_in_input_file:
                             raise ValueError('A second copy: keyword is not allowed. line {0}'.format(self.line_number))
-                        copy_keyword_found_in_input_file = True
+                        self.copy_keyword_found_in_input_file = True
                     # Check for the 'nocopy:' keyword.
                     # The 'copy:' keyword can only be found once, otherwise
                     # the _parse_copy( method throws an exception.
                     found_nocopy_keyword = self._parse_no_copy(function_info_list)
                     if found_nocopy_keyword:
                         # A second 'nocopy:' keyword is not allowed.
-                        if nocopy_keyword_found_in_input_file:
+                        if self.nocopy_keyword_found_in_input_file:
                             raise ValueError('A second nocopy: keyword is not allowed. line {0}'.format(self.line_number))
-                        nocopy_keyword_found_in_input_file = True
+                        self.nocopy_keyword_found_in_input_file = True
                     # Test for the 'property:' keyword, which results in creating
                     # property get-set methods.
                     found_property_keyword = self._parse_property(data_member_type_and_name_info_list, function_info_list)
@@ -137,26 +219,165 @@ class Bparse:
             else:
                 # Should never arrive here unless there is bug.
                 raise ValueError('Illegal parser state.  Line {0}'.format(self.line_number))
-        # Don't allow two copy constructors and operator=() methods.
-        if copy_keyword_found_in_input_file and nocopy_keyword_found_in_input_file:
-            raise ValueError('Cannot use both the copy: and nocopy: keywords.  Line {0}'.format(self.line_number))
-        # If the the 'copy:' keyword was used, then fill in the Copy
-        # method body now that all the data members have been parsed.
-        if copy_keyword_found_in_input_file:
-            # Find the Copy method that was produced by the copy keyword.
-            for the_function_info in function_info_list:
-                # Is this function the 'Copy' function produced by the 'copy:' keyword?
-                if the_function_info.get_method_type() == FunctionInfo.METHOD_COPY:
-                    self._set_copy_method_body(the_function_info, data_member_type_and_name_info_list)
-        # Sort the function names.  The order is constructors, copy constructor, destructor,
-        # operator equals, and then other methods.
-        function_info_list.sort(key=lambda finfo: finfo.get_method_type())
+        if declaration_record_list is not None and self.declaration_start is not None:
+            self._end_declaration(len(self.text),
+                                  data_member_type_and_name_info_list,
+                                  function_info_list,
+                                  declaration_record_list)
+        return None
+
+    def _parse_with_index(self,
+                          data_member_type_and_name_info_list,
+                          definition_class_name_set,
+                          implementation_class_name_set,
+                          function_info_list,
+                          parse_index):
+        declaration_record_list = parse_index.get_declaration_records()
+        start_count, end_index = parse_index.find_unchanged_declarations(self.file_buffer, self.class_name)
+        offset_delta = self.file_buffer.get_file_size() - parse_index.get_text_size()
+        new_declaration_record_list = []
+        # Reuse the unchanged declarations at the start of the file.
+        for declaration_record in declaration_record_list[:start_count]:
+            self._reuse_declaration(declaration_record,
+                                    data_member_type_and_name_info_list,
+                                    definition_class_name_set,
+                                    implementation_class_name_set,
+                                    function_info_list)
+            new_declaration_record_list.append(declaration_record)
+        # Parse from the start of the first changed declaration.
+        declaration_start = 0
+        self.declaration_line_number = 1
+        if start_count > 0:
+            declaration_start = declaration_record_list[start_count - 1].end
+            if start_count < len(declaration_record_list):
+                self.declaration_line_number = declaration_record_list[start_count].line_number
+            else:
+                self.declaration_line_number = declaration_record_list[start_count - 1].line_number
+        # The unchanged declarations at the end of the file have moved by the
+        # difference of the text sizes.  Save whether each of them, or any
+        # declaration after it, has a copy keyword.
+        end_declaration_dict = {}
+        has_copy_keyword = False
+        for record_index in xrange(len(declaration_record_list) - 1, end_index - 1, -1):
+            declaration_record = declaration_record_list[record_index]
+            has_copy_keyword = (has_copy_keyword
+                                or declaration_record.has_copy_keyword
+                                or declaration_record.has_nocopy_keyword)
+            end_declaration_dict[declaration_record.start + offset_delta] = (record_index, has_copy_keyword)
+        self.lexer.set_position(declaration_start, self.declaration_line_number)
+        self.token_list = [self.lexer.next_token()]
+        self._set_token_index(0)
+        end_index = self._parse_declarations(data_member_type_and_name_info_list,
+                                             definition_class_name_set,
+                                             implementation_class_name_set,
+                                             function_info_list,
+                                             declaration_start,
+                                             new_declaration_record_list,
+                                             end_declaration_dict)
+        self.parsed_declaration_count = len(new_declaration_record_list) - start_count
+        self.reused_declaration_count = start_count
+        # Reuse the unchanged declarations at the end of the file.
+        if end_index is not None:
+            line_number_delta = self.declaration_line_number - declaration_record_list[end_index].line_number
+            for declaration_record in declaration_record_list[end_index:]:
+                declaration_record = declaration_record._replace(start=declaration_record.start + offset_delta,
+                                                                 end=declaration_record.end + offset_delta,
+                                                                 hash_end=declaration_record.hash_end + offset_delta,
+                                                                 line_number=declaration_record.line_number + line_number_delta)
+                self._reuse_declaration(declaration_record,
+                                        data_member_type_and_name_info_list,
+                                        definition_class_name_set,
+                                        implementation_class_name_set,
+                                        function_info_list)
+                new_declaration_record_list.append(declaration_record)
+            self.reused_declaration_count += len(declaration_record_list) - end_index
+        parse_index.set_declaration_records(self.class_name,
+                                            self.file_buffer.get_file_size(),
+                                            new_declaration_record_list)
+
+    def _start_declaration(self,
+                           declaration_start,
+                           data_member_type_and_name_info_list,
+                           function_info_list):
+        self.declaration_start = declaration_start
+        self.declaration_data_member_count = len(data_member_type_and_name_info_list)
+        self.declaration_function_count = len(function_info_list)
+        self.declaration_include_count = len(self.include_type_info_list)
+        self.declaration_copy_keyword_found = self.copy_keyword_found_in_input_file
+        self.declaration_nocopy_keyword_found = self.nocopy_keyword_found_in_input_file
+        self.body_range_dict = {}
+
+    def _end_declaration(self,
+                         declaration_end,
+                         data_member_type_and_name_info_list,
+                         function_info_list,
+                         declaration_record_list):
+        # The declaration depends on all of the text that was lexed to
+        # parse the declaration, up to the end of the last line.
+        hash_end = self.text.find('\n', self.lexer.position) + 1
+        if hash_end == 0:
+            hash_end = len(self.text)
+        # A block comment that is not closed in the declaration text is
+        # closed by the next '*/' in the rest of the file, which changes how
+        # the declaration is lexed, so the declaration depends on all of the
+        # text up to the end of the file.
+        comment_start = self.text.rfind('/*', self.declaration_start, hash_end)
+        if comment_start >= 0 and self.text.find('*/', comment_start + 2, hash_end) < 0:
+            hash_end = len(self.text)
+        declaration_data = dump_declaration_data(self.declaration_start,
+                                                 data_member_type_and_name_info_list[self.declaration_data_member_count:],
+                                                 function_info_list[self.declaration_function_count:],
+                                                 self.include_type_info_list[self.declaration_include_count:],
+                                                 self.body_range_dict)
+        declaration_record_list.append(DeclarationRecord(self.declaration_start,
+                                                         declaration_end,
+                                                         hash_end,
+                                                         self.declaration_line_number,
+                                                         get_text_hash(self.file_buffer, self.declaration_start, hash_end),
+                                                         self.copy_keyword_found_in_input_file and not self.declaration_copy_keyword_found,
+                                                         self.nocopy_keyword_found_in_input_file and not self.declaration_nocopy_keyword_found,
+                                                         declaration_data))
+        self.declaration_start = None
+        self.body_range_dict = None
+
+    def _reuse_declaration(self,
+                           declaration_record,
+                           data_member_type_and_name_info_list,
+                           definition_class_name_set,
+                           implementation_class_name_set,
+                           function_info_list):
+        # Add new copies of the data members and methods of an unchanged
+        # declaration.  Save the include names again, so that the include
+        # names are saved in the same order as when the file is parsed.
+        (data_member_list,
+         declaration_function_info_list,
+         include_type_info_list) = load_declaration_data(declaration_record, self.file_buffer)
+        data_member_type_and_name_info_list.extend(data_member_list)
+        function_info_list.extend(declaration_function_info_list)
+        for the_type_info in include_type_info_list:
+            self._save_include_name(definition_class_name_set,
+                                    implementation_class_name_set,
+                                    the_type_info)
+        if declaration_record.has_copy_keyword:
+            self.copy_keyword_found_in_input_file = True
+            self.has_copy_constructor = True
+        if declaration_record.has_nocopy_keyword:
+            self.nocopy_keyword_found_in_input_file = True
+            self.has_copy_constructor = True
+
+    def get_parsed_declaration_count(self):
+        return self.parsed_declaration_count
+
+    def get_reused_declaration_count(self):
+        return self.reused_declaration_count
+
+    def get_type_info_table(self):
+        return self.type_info_table
 
     def get_line_number(self):
         return self.line_number
 
     def _parse_copy(self, function_info_list):
-        self._skip_white_space()
         # Test for the 'copy:' keyword.
         has_copy = self._test_for_token('copy:')
         if has_copy:
@@ -229,7 +450,6 @@ class Bparse:
         return has_copy
 
     def _parse_no_copy(self, function_info_list):
-        self._skip_white_space()
         # Test for the 'nocopy:' keyword.
         has_nocopy = self._test_for_token('nocopy:')
         if has_nocopy:
@@ -257,7 +477,7 @@ class Bparse:
                 # Do not call the FunctionInfo.add_body_text method.  Don't implement the method.
                 # Setting to 'not write' the implementation will also result in the
                 # 'private: keyword being written.
-                copy_constructor_function_info.write_the_implementation(False)
+                copy_constructor_function_info.set_write_the_implementation(False)
                 # Set the method type.
                 copy_constructor_function_info.set_method_type(FunctionInfo.METHOD_NO_COPY_CONSTRUCTOR)
                 # Add the copy constructor to the function pointer list.
@@ -273,7 +493,7 @@ class Bparse:
                 # Add the argument to 'operator equal'.
                 operator_equal_function_info.add_argument(copy_argument_type_and_name_info)
                 # Do not call the FunctionInfo.add_body_text method.  Don't implement the method.
-                operator_equal_function_info.write_the_implementation(False)
+                operator_equal_function_info.set_write_the_implementation(False)
                 # Set the method type.
                 operator_equal_function_info.set_method_type(FunctionInfo.METHOD_NO_COPY_OPERATOR_EQUAL)
                 # Add the 'operator =' method to the function pointer list.
@@ -285,7 +505,6 @@ class Bparse:
     def _parse_property(self, 
                         data_member_type_and_name_info_list,
                         function_info_list):
-        self._skip_white_space()
         # Test for the 'property:' keyword.
         has_property = self._test_for_token('property:')
         if has_property:
@@ -330,8 +549,10 @@ class Bparse:
             set_method_name_text = 'set{0}'.format(function_name_text)
             set_function_the_type_and_name_info.set_name(set_method_name_text)
             set_function_info = FunctionInfo(set_function_the_type_and_name_info)
-            # Create the function argument list.
-            argument_type_info = property_the_type_and_name_info.get_type_info()
+            # Create the function argument list.  The argument type is a copy
+            # of the property type, because the property type is shared.  The
+            # changed copy is then found in the type table.
+            argument_type_info = property_the_type_and_name_info.get_type_info().copy()
             type_name = argument_type_info.get_name()
             type_modifiers = argument_type_info.get_type_modifier()
             # If there is a type modifier, the propertie's set method has a
@@ -345,7 +566,7 @@ class Bparse:
                 if not type_modifiers:
                     argument_type_info.set_type_modifier('&')
             argument_type_and_name_info = TypeAndNameInfo()
-            argument_type_and_name_info.set_type_info(argument_type_info)
+            argument_type_and_name_info.set_type_info(self.type_info_table.intern_type_info(argument_type_info))
             set_argument_variable_name = 'the_value'
             argument_type_and_name_info.set_name(set_argument_variable_name)
             set_function_info.add_argument(argument_type_and_name_info)
@@ -357,47 +578,42 @@ class Bparse:
             set_function_info.add_body_text('\n}')
             # Add the 'set' property method to the function pointer list.
             function_info_list.append(set_function_info)
-            self._skip_white_space()
             # Skip any optional terminating semicolon character.
-            if self.file_buffer[self.file_position] == ';':
-                self.file_position += 1
+            if self.token.text == ';':
+                self._next_token()
         return has_property
 
     def __parse_type_and_name(self, the_type_and_name_info):
         #the_type_and_name_info.Clear()
         # Get the type.
-        the_type_info = TypeInfo()
-        self._parse_type(the_type_info)
+        self._parse_type(self.parsed_type_info)
+        the_type_info = self.type_info_table.intern_type_info(self.parsed_type_info)
         the_type_and_name_info.set_type_info(the_type_info)
-        self._skip_white_space()
         # The type has been found.  Next get the variable name or a function name.
         # If the type name is the empty string then look for either
         # '@()' and '~@()' for a constructor and destructor respectively'
         name = the_type_info.get_name()
         if not name:
-            if self.file_buffer[self.file_position] == '@':
-                self.file_position += 1
-                self._skip_white_space()
-                if self.file_buffer[self.file_position] == '(':
+            if self.token.text == '@':
+                self._next_token()
+                if self.token.text == '(':
                     # A constructor was found.
-                    self.file_position += 1
+                    self._next_token()
                     the_type_and_name_info.set_name(self.class_name)
-                    self._skip_white_space()
                     self._set_parser_state(Bparse.FUNCTION_SIGNATURE_STATE)
                 else:
                     # If here, then the variable name is '@'.  The symbol
                     # @ represents the class name and is not a valid variable
                     # name.  Throw an exception.
                     raise ValueError('The classname-symbol @ may not be used as a variable name.  Line {0}.'.format(self.line_number))
-            elif self.file_buffer[self.file_position] == '~' and self.file_buffer[self.file_position + 1] == '@':
-                self.file_position += 2
-                self._skip_white_space()
-                if self.file_buffer[self.file_position] == '(':
+            elif self.token.text == '~' and self._peek_token().text == '@':
+                self._next_token()
+                self._next_token()
+                if self.token.text == '(':
                     # The destructor was found.
-                    self.file_position += 1
+                    self._next_token()
                     destructor_name_text = '~{0}'.format(self.class_name)
                     the_type_and_name_info.set_name(destructor_name_text)
-                    self._skip_white_space()
                     self._set_parser_state(Bparse.FUNCTION_SIGNATURE_STATE)
                 else:
                     raise ValueError('Malformed destructor.  Line {0}.'.format(self.line_number))
@@ -405,32 +621,25 @@ class Bparse:
             # Get the variable name.
             variable_name = self._get_variable_name()
             the_type_and_name_info.set_name(variable_name)
-            self._skip_white_space()
-            c = self.file_buffer[self.file_position]
+            token_text = self.token.text
             # Test to see if this is the start of a function.
-            if c == '(':
+            if token_text == '(':
                 # This is a function.  A function always starts with a type and name.
                 # Skip the opening parenthesis and the Function parser will start parsing.
                 # the argument list.
-                self.file_position += 1
-                self._skip_white_space()
+                self._next_token()
                 self._set_parser_state(Bparse.FUNCTION_SIGNATURE_STATE)
             # Check for a default value.
-            elif c == '=':
-                self.file_position += 1
-                value_text = ''
+            elif token_text == '=':
+                self._next_token()
                 value_text = self._get_value_text()
                 the_type_and_name_info.set_value(value_text)
-                # Get the next character for below.
-                c = self.file_buffer[self.file_position]
                 # Test for the line termination character.
-                if c == ';':
+                if self.token.text == ';':
                     # Skip the terminating semicolon.  The rendering code will add it back.
-                    self.file_position += 1
-                    self._skip_white_space()
-            elif c == ';':
-                self.file_position += 1
-        self._skip_white_space()
+                    self._next_token()
+            elif token_text == ';':
+                self._next_token()
 
     def _parse_type(self, the_type_info):
         # Test for the 'virtual' and 'static' keywords.
@@ -446,7 +655,6 @@ class Bparse:
         self._get_type_modifier_tokens(the_type_info)
 
     def _parse_static_virtual_qualifier_type(self, the_type_info):
-        self._skip_white_space()
         # Check for the inline keyword.  The 'inline' keyword can only apply
         # to methods and is not stored as part of the 'type'.
         self.has_inline_keyword = self._test_for_token('inline')
@@ -459,7 +667,6 @@ class Bparse:
             the_type_info.set_static_virtual_qualifier_type(TypeInfo.NORMAL_QUALIFIER_TYPE)
 
     def _parse_const_volatile_qualifier_type(self, the_type_info):
-        self._skip_white_space()
         # The 'const' and 'volatile' keywords cannot both be used to declare a type.
         if self._test_for_token('const'):
             the_type_info.set_const_volatile_qualifier_type(TypeInfo.CONST_QUALIFIER_TYPE)
@@ -469,231 +676,136 @@ class Bparse:
             the_type_info.set_const_volatile_qualifier_type(TypeInfo.NORMAL_QUALIFIER_TYPE)
 
     def _test_for_token(self, token_text):
-        found_token_text = False
-        self._skip_white_space()
-        # Save the file position in case the search fails.
-        current_file_position = self.file_position
-        token_text_length = len(token_text)
-        index = 0
-        c = ''
-        while not self.file_buffer.past_end_of_file():
-            c = self.file_buffer[self.file_position]
-            if index < token_text_length:
-                if c == token_text[index]:
-                    index += 1
-                    self.file_position += 1
-                else:
-                    break
-            else:
-                # If c is a symbol character here and not a delimiter,
-                # the the token string is not considered to be found.
-                found_token_text = not c in self.variable_characters
-                break
-        if not found_token_text:
-            # If not found, restore the file position.
-            self.file_position = current_file_position
+        # Keywords that end with a colon, such as 'copy:', are a single
+        # label token, so one comparison tests for any keyword.
+        found_token_text = self.token.text == token_text
+        if found_token_text:
+            self._next_token()
         return found_token_text
 
     def _get_type_name(self, the_type_info):
-        self._skip_white_space()
         type_name_text = ''
-        saved_file_position = self.file_position
         # Do a special check for the class name substitution character.
-        if self.file_buffer[self.file_position] == '@':
-            self.file_position += 1
-            self._skip_white_space()
-            if self.file_buffer[self.file_position] == '(':
+        if self.token.text == '@':
+            if self._peek_token().text == '(':
                 # A constructor was found.  Set the type name to the empty
-                # string. Don't increment past the characters '@('.  The
-                # @ character will be converted to the class name later.
-                self.file_position = saved_file_position
+                # string. Don't move past the tokens '@('.  The @ token
+                # will be converted to the class name later.
                 type_name_text = ''
             else:
                 # Substitute the class name for the '@' character.
-                self.file_position += 1
+                self._next_token()
+                self._next_token()
                 type_name_text = self.class_name
-        elif self.file_buffer[self.file_position] == '~' and self.file_buffer[self.file_position + 1] == '@':
+        elif self.token.text == '~' and self._peek_token().text == '@':
             # A destructor was found.  Set the type name to the empty
-            # string. Don't increment past the characters.  The @
-            # character will be converted to the class name later.
-            self.file_position += 2
-            self._skip_white_space()
-            if self.file_buffer[self.file_position] == '(':
-                self.file_position = saved_file_position
-                type_name_text = ''
-            else:
+            # string. Don't move past the tokens.  The @ token will
+            # be converted to the class name later.
+            if self._peek_token(2).text != '(':
                 raise ValueError('Malformed destructor.  Line {0}.'.format(self.line_number))
         else:
-            type_stack_list = []
-            not_first_character = False
-            while not self.file_buffer.past_end_of_file():
-                c = self.file_buffer[self.file_position]
-                if self._test_for_token('unsigned'):
-                    type_name_text += 'unsigned '
-                    self._skip_white_space()
-                elif self._test_for_token('signed'):
-                    type_name_text += 'signed '
-                    self._skip_white_space()
-                elif c in self.variable_characters:
-                    self.file_position += 1
-                    type_name_text = '{0}{1}'.format(type_name_text, c)
-                elif c == ':' and self.file_buffer[self.file_position + 1] == ':':
-                    self.file_position += 2
-                    type_name_text = '{0}::'.format(type_name_text)
-                elif (c in self.variable_characters
-                      or (not_first_character and c.isdigit())
-                      or c == '_'):
-                    self.file_position += 1
-                    not_first_character = True
-                    type_name_text = '{0}{1}'.format(type_name_text, c)
-                elif c == '<':
-                    # Push the expected closing bracket on the type stack.
-                    type_stack_list.append('>')
-                    self.file_position += 1
-                    type_name_text = '{0}{1}'.format(type_name_text, c)
-                elif c == '>':
-                    self.file_position += 1
-                    # Make sure the top of the stack has a closing bracket.
-                    if type_stack_list[len(type_stack_list)-1] == '>':
-                        # Remove the closing bracket from the top of the stack.
-                        type_stack_list.pop()
-                        type_name_text = '{0}>'.format(type_name_text)
-                    else:
+            template_depth = 0
+            while self.token.kind != Blexer.END_OF_FILE_TOKEN:
+                token = self.token
+                if token.text == 'unsigned' or token.text == 'signed':
+                    type_name_text = '{0}{1} '.format(type_name_text, token.text)
+                    self._next_token()
+                    continue
+                elif token.kind == Blexer.IDENTIFIER_TOKEN or token.kind == Blexer.SCOPE_TOKEN:
+                    type_name_text = '{0}{1}'.format(type_name_text, token.text)
+                elif token.text == '<':
+                    # Count the expected closing bracket.
+                    template_depth += 1
+                    type_name_text = '{0}<'.format(type_name_text)
+                elif token.text == '>':
+                    # Make sure there is an open bracket to close.
+                    if template_depth == 0:
                         raise ValueError('Missing bracket.  Line {0}.'.format(self.line_number))
-                elif c == '\n':
-                    self.file_position += 1
-                    self.line_number += 1
-                    break
-                # If inside of a template declaration ignore spaces.
-                elif c.isspace() and len(type_stack_list) != 0:
-                    # Should this be just _skip_white_space()?
-                    self._skip_white_space()
-                    if self.file_buffer[self.file_position] == '>':
-                        self.file_position += 1
-                        # Make sure the top of the stack has a closing bracket.
-                        if type_stack_list[len(type_stack_list)-1] == '>':
-                            # Remove the closing bracket from the top of the stack.
-                            type_stack_list.pop()
-                            type_name_text = '{0}>'.format(type_name_text)
-                        else:
-                            raise ValueError('Missing bracket.  Line {0}.'.format(self.line_number))
+                    template_depth -= 1
+                    # Nested closing brackets are separated by a space,
+                    # because '>>' is the shift operator in C++03.
+                    if type_name_text[-1] == '>':
+                        type_name_text = '{0} >'.format(type_name_text)
                     else:
-                        # Do not increment self.file_position here so that the current
-                        # character can be processed later.
-                        break
-                elif c == '\n':
-                    self.file_position += 1
-                    self.line_number += 1
+                        type_name_text = '{0}>'.format(type_name_text)
+                elif token.text == ',' and template_depth > 0:
+                    # A comma separates the template arguments.
+                    type_name_text = '{0}, '.format(type_name_text)
+                elif (token.text == '*' or token.text == '&') and template_depth > 0:
+                    # A template argument can be a pointer or a reference.
+                    type_name_text = '{0}{1}'.format(type_name_text, token.text)
                 else:
-                    self._skip_white_space()
-                    # Do not increment self.file_position here so that the current character
-                    # can be processed later.  Skip any terminating semi-colon character.
-                    if self.file_buffer[self.file_position] == ';':
-                        self.file_position += 1
+                    # Skip any terminating semi-colon character.
+                    if token.text == ';':
+                        self._next_token()
                     break
+                self._next_token()
+                # Whitespace ends the type name.  Inside of a template
+                # declaration whitespace separates the words of a template
+                # argument, such as "const Foo".
+                if not self._follows_previous_token():
+                    if template_depth == 0:
+                        if self.token.text == ';':
+                            self._next_token()
+                        break
+                    elif (self.token.kind == Blexer.IDENTIFIER_TOKEN
+                          and type_name_text[-1] not in ' <'):
+                        type_name_text = '{0} '.format(type_name_text)
             # Make sure that all brackets are closed.
-            if len(type_stack_list) != 0:
+            if template_depth != 0:
                 raise ValueError('Error on line {0}.'.format(self.line_number))
         the_type_info.set_name(type_name_text)
 
     def _get_type_modifier_tokens(self, the_type_info):
         # Get any type modifiers.
         type_modifier_text = ''
-        test_for_more_type_modifiers = True
-        while True:
-            self._skip_white_space()
-            while not self.file_buffer.past_end_of_file():
-                c = self.file_buffer[self.file_position]
-                if c == '*':
-                    self.file_position += 1
-                    type_modifier_text = '{0}{1}'.format(type_modifier_text, c)
-                elif c == '&':
-                    self.file_position += 1
-                    type_modifier_text = '{0}{1}'.format(type_modifier_text, c)
-                elif c == '\r' and self.file_buffer[self.file_position + 1] == '\n':
-                    self.file_position += 2
-                    self.line_number += 1
-                elif c == '\n':
-                    self.file_position += 1
-                    self.line_number += 1
-                else:
-                    # Do not increment self.file_position here so that the current
-                    # character can be processed later.
-                    test_for_more_type_modifiers = False
-                    break
-            if not (test_for_more_type_modifiers and not self.file_buffer.past_end_of_file()):
-                break
+        while self.token.text == '*' or self.token.text == '&':
+            type_modifier_text = '{0}{1}'.format(type_modifier_text, self.token.text)
+            self._next_token()
         the_type_info.set_type_modifier(type_modifier_text)
 
     def _get_variable_name(self):
-        self._skip_white_space()
         variable_name = ''
-        not_first_character = False
-        c = '\0'
-        while not self.file_buffer.past_end_of_file():
-            c = self.file_buffer[self.file_position]
-            if c in self.variable_characters or (not_first_character and c.isdigit()):
-                self.file_position += 1
-                not_first_character = True
-                variable_name = '{0}{1}'.format(variable_name, c)
-            elif c == '\n':
-                self.file_position += 1
-                self.line_number += 1
-                break
-            else:
-                # Do not increment self.file_position here so that the current
-                # character can be processed later.
-                break
-        self._skip_white_space()
-        # Check for an array variable.
-        if c == '[':
-            # Add everything to the variable until the closing bracket.
-            variable_name = '{0}{1}'.format(variable_name, c)
-            self.file_position += 1
-            while not self.file_buffer.past_end_of_file():
-                c = self.file_buffer[self.file_position]
-                self.file_position += 1
-                variable_name = '{0}{1}'.format(variable_name, c)
-                if c == ']':
-                    break
-                elif c == '\n':
-                    self.line_number += 1
+        if self.token.kind == Blexer.IDENTIFIER_TOKEN:
+            variable_name = self.token.text
+            self._next_token()
+            # Check for an array variable.
+            if self.token.text == '[' and self._follows_previous_token():
+                # Add everything to the variable until the closing bracket.
+                start_of_array_text = self.token.start
+                while self.token.kind != Blexer.END_OF_FILE_TOKEN and self.token.text != ']':
+                    self._next_token()
+                end_of_array_text = self.token.end
+                self._next_token()
+                variable_name = '{0}{1}'.format(variable_name, self.text[start_of_array_text:end_of_array_text])
         return variable_name
 
     def _get_value_text(self):
         value_text = ''
-        self._skip_white_space()
-        if self.file_buffer[self.file_position] == ';':
-            self.file_position += 1
+        if self.token.text == ';':
+            self._next_token()
         else:
-            inside_quoted_text = False
-            while not self.file_buffer.past_end_of_file():
-                c = self.file_buffer[self.file_position]
-                if (c in self.variable_characters
-                    or c == '.'
-                    or c == '+'
-                    or c == '-'):
-                    self.file_position += 1
-                    value_text = '{0}{1}'.format(value_text, c)
-                elif c == '"':
-                    self.file_position += 1
-                    value_text = '{0}{1}'.format(value_text, c)
-                    if inside_quoted_text:
-                        break
-                    else:
-                        inside_quoted_text = True
-                elif inside_quoted_text:
-                    if c == '\\' and self.file_buffer[self.file_position + 1] == '"':
-                        self.file_position += 2
-                        value_text = '{0}{1}"'.format(value_text, c)
-                    elif c == '\n':
-                        raise ValueError('Quoted string not terminated.  Line {0}.'.format(self.line_number))
-                    else:
-                        self.file_position += 1
-                        value_text = '{0}{1}'.format(value_text, c)
+            while self.token.kind != Blexer.END_OF_FILE_TOKEN:
+                token = self.token
+                if token.kind == Blexer.STRING_TOKEN:
+                    # A quoted string ends the value text.
+                    self._next_token()
+                    value_text = '{0}{1}'.format(value_text, token.text)
+                    break
+                elif token.text == '"':
+                    raise ValueError('Quoted string not terminated.  Line {0}.'.format(self.line_number))
+                elif (token.kind == Blexer.IDENTIFIER_TOKEN
+                      or token.text == '.'
+                      or token.text == '+'
+                      or token.text == '-'):
+                    self._next_token()
+                    value_text = '{0}{1}'.format(value_text, token.text)
                 else:
-                    # Do not increment self.file_position here so that the current
-                    # character can be processed later.
+                    # Do not move past the current token so that the
+                    # token can be processed later.
+                    break
+                # Whitespace ends the value text.
+                if not self._follows_previous_token():
                     break
         return value_text
 
@@ -713,39 +825,21 @@ class Bparse:
         elif function_name_text == destructor_name_text:
             method_type = FunctionInfo.METHOD_DESTRUCTOR
         function_info.set_method_type(method_type)
-        self._skip_white_space()
-        # Save the file position in case the search fails.
-        current_file_position = self.file_position
-        c = '\0'
         # Check for a function that takes no parameters.
-        while not self.file_buffer.past_end_of_file():
-            c = self.file_buffer[self.file_position]
-            # Check for the end of the function declaration.
-            if c == ')':
-                # The function takes no parameters.
-                self.file_position += 1
-                self._skip_white_space()
-                self._set_parser_state(Bparse.FUNCTION_BODY_STATE)
-                break
-            # Check for a function that takes no parameters that has 'void' as a parameter.
-            elif self._test_for_token('void'):
-                self._skip_white_space()
-                if self.file_buffer[self.file_position] == ')':
-                    self.file_position += 1
-                    self._skip_white_space()
-                    self._set_parser_state(FunctionBodyState)
-                break
-            else:
-                # Do not increment self.file_position here so that the current
-                # character can be processed later.
-                break
+        if self.token.text == ')':
+            self._next_token()
+            self._set_parser_state(Bparse.FUNCTION_BODY_STATE)
+        # Check for a function that takes no parameters that has 'void' as a parameter.
+        elif self.token.text == 'void' and self._peek_token().text == ')':
+            self._next_token()
+            self._next_token()
+            self._set_parser_state(Bparse.FUNCTION_BODY_STATE)
         # If the function took parameters then the code above did not set
-        # the parse-state to 'FunctionBodyState'.
+        # the parse-state to FUNCTION_BODY_STATE.
         if self._current_parser_state() == Bparse.FUNCTION_SIGNATURE_STATE:
-            # Put the file position back to what it was before the loop above ran.
-            self.file_position = current_file_position
             # The function takes parameters. Parse the parameters.
-            while not self.file_buffer.past_end_of_file():
+            while self.token.kind != Blexer.END_OF_FILE_TOKEN:
+                argument_token_index = self.token_index
                 argument_type_and_name_info = TypeAndNameInfo()
                 self.__parse_type_and_name(argument_type_and_name_info)
                 function_info.add_argument(argument_type_and_name_info)
@@ -754,25 +848,23 @@ class Bparse:
                 self._save_include_name(definition_class_name_set,
                                         implementation_class_name_set,
                                         the_argument_type_info)
-                self._skip_white_space()
-                c = self.file_buffer[self.file_position]
-                if c == ')':
-                    self.file_position += 1
-                    self._skip_white_space()
+                if self.token.text == ')':
+                    self._next_token()
                     break
-                elif c == ',':
+                elif self.token.text == ',':
                     # Skip the comma argument delimiter.  Commas will be
                     # added back in the code that renders the C++ code.
-                    self.file_position += 1
-                self._skip_white_space()
+                    self._next_token()
+                elif self.token_index == argument_token_index:
+                    raise ValueError('Illegal character in argument list.  Line {0}.'.format(self.line_number))
         # Get the function qualifier.  The function qualifier is all the text.
-        # up to either the newline character or the opening bracket '{' of the
-        # function. This will be either 'const', '=0', '= 0' or just whitespace.
+        # up to the opening bracket '{' of the function. This will be either
+        # 'const', '=0', '= 0' or nothing.
         function_qualifier_text = ''
         # A constructor or the destructor must have an open bracket that starts
         # the function body at this point.
         if method_type != FunctionInfo.METHOD_FUNCTION:
-            if self.file_buffer[self.file_position] != '{':
+            if self.token.text != '{':
                 if method_type == FunctionInfo.METHOD_CONSTRUCTOR:
                     raise ValueError('Error following constructor definition.  Line {0}.'.format(self.line_number))
                 else:
@@ -780,90 +872,38 @@ class Bparse:
         else:
             if self._test_for_token('const'):
                 function_qualifier_text = 'const'
-            self._skip_white_space()
-            if self.file_buffer[self.file_position] == '=':
-                self.file_position += 1
-                self._skip_white_space()
-                if self.file_buffer[self.file_position] == '0':
+            if self.token.text == '=':
+                self._next_token()
+                if self.token.text == '0':
+                    self._next_token()
                     function_qualifier_text = '{0}= 0'.format(function_qualifier_text)
                 else:
                     raise ValueError('Illegal pure virtual function definition.  Line {0}.'.format(self.line_number))
-            function_qualifier_text.strip()
-            self._skip_white_space()
         function_info.set_qualifier(function_qualifier_text)
         function_info.set_inline(self.has_inline_keyword)
         # Add the function to the function pointer list.
         function_info_list.append(function_info)
-        self._skip_white_space()
-        if self.file_buffer[self.file_position] != '{':
+        if self.token.text != '{':
             raise ValueError('Illegal character.  Line {0}.'.format(self.line_number))
         self._set_parser_state(Bparse.FUNCTION_BODY_STATE)
 
     def _parse_function_body(self, function_info_list):
-        self._skip_white_space()
         function_info = function_info_list[len(function_info_list)-1]
-        inside_comment = False
-        inside_double_quotes = False
-        inside_single_quotes = False
-        bracket_count = 0
-        while not self.file_buffer.past_end_of_file():
-            c = self.file_buffer[self.file_position]
-            c1 = self.file_buffer[self.file_position + 1]
-            function_info.add_body_text(c)
-            if c == '/' and c1 == '/':
-                inside_comment = True
-                function_info.add_body_text(c)
-                self.file_position += 2
-            if c == '\\' and c1 == '"':
-                function_info.add_body_text(c1)
-                self.file_position += 2
-            elif c == '\\' and c1 == "'":
-                function_info.add_body_text(c1)
-                self.file_position += 2
-            elif c == '"':
-                self.file_position += 1
-                if not inside_single_quotes:
-                    inside_double_quotes = not inside_double_quotes
-            elif c == '\\':
-                self.file_position += 1
-                if not inside_double_quotes:
-                    inside_single_quotes = not inside_single_quotes
-            elif c == "'" and c1 == '{':
-                self.file_position += 2
-            elif c == "'" and c1 == '}':
-                function_info.add_body_text(c1)
-                self.file_position += 2
-            elif c == '{':
-                self.file_position += 1
-                if not inside_single_quotes and not inside_double_quotes:
-                    bracket_count += 1
-            elif c == '}':
-                self.file_position += 1
-                if not inside_single_quotes and not inside_double_quotes:
-                    bracket_count -= 1
-            elif c == '\n':
-                inside_comment = False
-                self.file_position += 1
-                self.line_number += 1
-            else:
-                self.file_position += 1
-            if bracket_count == 0:
-                self._set_parser_state(Bparse.DATA_STATE)
-                break
-
-    def _skip_white_space(self):
-        while not self.file_buffer.past_end_of_file():
-            c = self.file_buffer[self.file_position]
-            if c == '\r' and self.file_buffer[self.file_position + 1] == '\n':
-                self.file_position += 2
-                self.line_number += 1
-            elif c == '\n':
-                self.file_position += 1
-                self.line_number += 1
-            elif c.isspace():
-                self.file_position += 1
-            else:
-                break
+        # Skip ahead to the bracket that closes the function body without
+        # lexing the body.  Brackets inside of comments, quoted strings and
+        # character literals are not counted.
+        start_of_body = self.token.start
+        end_of_body = self.lexer.skip_block(start_of_body, self.token.line_number)
+        # Throw away any tokens inside of the body that were lexed to look ahead.
+        del self.token_list[self.token_index + 1:]
+        # The body is copied to the generated code as a single range of the input text.
+        body_text = self.file_buffer.get_text_range(start_of_body, end_of_body)
+        function_info.add_body_text(body_text)
+        if self.body_range_dict is not None:
+            self.body_range_dict[id(body_text)] = (start_of_body, end_of_body)
+        self._set_parser_state(Bparse.DATA_STATE)
+        # Continue parsing at the first token after the function body.
+        self._set_token_index(self.token_index + 1)
 
     def _set_copy_method_body(self,
                              copy_function_info,
@@ -882,6 +922,14 @@ class Bparse:
                 copy_function_info.add_body_text(assignment_line)
         copy_function_info.add_body_text('}')
 
+    def save_include_name(self,
+                          definition_class_name_set,
+                          implementation_class_name_set,
+                          the_type_info):
+        self._save_include_name(definition_class_name_set,
+                                implementation_class_name_set,
+                                the_type_info)
+
     def _save_include_name(self,
                            definition_class_name_set,
                            implementation_class_name_set,
@@ -889,88 +937,79 @@ class Bparse:
         """ Save the type name in either the definition class name set or the
             implementation class name set.
         """
+        self.include_type_info_list.append(the_type_info)
         include_name = the_type_info.get_name()
         if include_name and include_name != self.class_name and include_name != self.destructor_name:
-            type_modifier = the_type_info.get_type_modifier()
-            # A type such as "std::vector<ClassName>" can be broken into two types,
-            # both "std::vector" and "ClassName". Call the __save_include_name() method
-            # for each type.
-            if '<' in include_name:
-                include_name_list = include_name.split('<')
-                include_name = include_name_list[0]
-                include_name = self.file_name_manager.get_include_file_name(include_name)
-                self._add_include_name(definition_class_name_set,
-                                       implementation_class_name_set,
-                                       type_modifier,
-                                       include_name)
-                if len(include_name_list) > 1:
-                    include_name = include_name_list[1]
-                    if include_name.endswith('>'):
-                        include_name = include_name[:-1]
-                    self._add_include_name(definition_class_name_set,
-                                           implementation_class_name_set,
-                                           type_modifier,
-                                           include_name)
-            else:
-                self._add_include_name(definition_class_name_set,
-                                       implementation_class_name_set,
-                                       type_modifier,
-                                       include_name)
-
-    def _add_include_name(self,
-                          definition_class_name_set,
-                          implementation_class_name_set,
-                          type_modifier,
-                          include_name):
-        #  If the string is not an intrinsic type then it is assumed
-        #  to be a class name.
-        if include_name and not self._is_intrinsic_type(include_name):
-            # Save the definition class name set.
-            if (type_modifier in ['&', '&*', '*', '**'] and include_name[0] != '<'):
-                implementation_class_name_set.add(include_name)
-            else:
-                definition_class_name_set.add(include_name)
-                # Because the type is explicitly needed in the class definition file,
-                # The type can be removed from the 'implementation_class_name_set' container.
-                if include_name in implementation_class_name_set:
-                    implementation_class_name_set.remove(include_name)
+            # The include names for the type are found in the cache that is
+            # shared by every parse.
+            include_decision = include_decision_cache.get_include_decision(include_name,
+                                                                           the_type_info.get_type_modifier())
+            for include_name, is_definition_include, type_name in include_decision:
+                # A template argument can be the class itself.
+                if include_name == self.class_name:
+                    continue
+                if is_definition_include:
+                    definition_class_name_set.add(include_name)
+                    # Because the type is explicitly needed in the class definition file,
+                    # The type can be removed from the 'implementation_class_name_set' container.
+                    # The forward declaration of the type uses the type name, which is not
+                    # the include name when the type is in the type registry.
+                    implementation_class_name_set.discard(type_name)
+                elif include_decision_cache.get_forward_declaration_include_name(type_name) not in definition_class_name_set:
+                    # The type is not forward declared if the class definition file
+                    # already includes the definition of the type.
+                    implementation_class_name_set.add(include_name)
 
     def get_input_file_line(self, line_number):
-        input_line_number = 1
-        start_of_line = 0
-        end_of_line = 0
-        file_position = 0
-        while not self.file_buffer.past_end_of_file():
-            c = self.file_buffer[file_position]
-            if c == '\r' and self.file_buffer[file_position + 1] == '\n':
-                file_position += 2
-                input_line_number += 1
-            elif c == '\n':
-                file_position += 1
-                input_line_number += 1
-            else:
-                file_position += 1
-            # Has the line been found?
-            if input_line_number == line_number - 1:
-                start_of_line = file_position
-            elif input_line_number == line_number + 1:
-                end_of_line = file_position
-                break
-        if end_of_line == 0:
-            end_of_line = file_position
+        # Find the line without splitting the whole text into lines,
+        # because the text can be a memory map.
         line_text = ''
-        if end_of_line > start_of_line:
-            for file_position in xrange(start_of_line, end_of_line + 1):
-                cc = self.file_buffer[file_position]
-                if cc != '\0':
-                    line_text += cc
+        if line_number > 0:
+            line_start = 0
+            for index in xrange(1, line_number):
+                line_start = self.text.find('\n', line_start) + 1
+                if line_start == 0:
+                    return line_text
+            line_end = self.text.find('\n', line_start) + 1
+            if line_end == 0:
+                line_end = len(self.text)
+            line_text = self.text[line_start:line_end]
         return line_text
 
     def _is_intrinsic_type(self, name):
-        return self.intrinsic_type_checker.is_intrinsic_type(name)
+        return is_intrinsic_type(name)
 
     def _current_parser_state(self):
         return self.parser_state
  
     def _set_parser_state(self, parser_state):
         self.parser_state = parser_state
+
+    def _get_token(self, token_index):
+        # Lex tokens until the token at the index exists.  There are no
+        # tokens after the end-of-file token.
+        token_list = self.token_list
+        while token_index >= len(token_list):
+            if token_list[-1].kind == Blexer.END_OF_FILE_TOKEN:
+                return token_list[-1]
+            token_list.append(self.lexer.next_token())
+        return token_list[token_index]
+
+    def _set_token_index(self, token_index):
+        self.token_index = token_index
+        self.token = self._get_token(token_index)
+        self.line_number = self.token.line_number
+
+    def _next_token(self):
+        # Never move past the end-of-file token.
+        if self.token.kind != Blexer.END_OF_FILE_TOKEN:
+            self._set_token_index(self.token_index + 1)
+
+    def _peek_token(self, offset=1):
+        return self._get_token(self.token_index + offset)
+
+    def _follows_previous_token(self):
+        # Return True if there is no whitespace between the current
+        # token and the previous token.
+        return (self.token_index > 0
+                and self.token_list[self.token_index - 1].end == self.token.start)
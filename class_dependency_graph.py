@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The class dependency graph records which project classes the class
+  definition file of each class includes.  The graph finds an order of
+  the classes in which every class comes after the classes whose class
+  definition files it includes, and finds the include cycles.  An include
+  cycle cannot be compiled, because each class in the cycle needs the
+  definition of the next class before its own definition.
+"""
+
+class ClassDependencyGraph:
+
+    def __init__(self):
+        self.class_name_list = []
+        self.dependency_dict = {}
+
+    def add_class(self, class_name, dependency_name_list):
+        """ Add a class and the names of the project classes that the class
+            definition file includes.  Names that are not added as classes
+            are not part of the graph.
+        """
+        if class_name not in self.dependency_dict:
+            self.class_name_list.append(class_name)
+        self.dependency_dict[class_name] = list(dependency_name_list)
+
+    def get_class_name_list(self):
+        return self.class_name_list
+
+    def get_dependency_list(self, class_name):
+        return [dependency_name for dependency_name in self.dependency_dict.get(class_name, [])
+                if dependency_name in self.dependency_dict]
+
+    def find_strongly_connected_components(self):
+        """ Return the strongly connected components of the graph as lists
+            of class names.  A component comes after every component that
+            its classes depend on.  This is Tarjan's algorithm without
+            recursion, so a long chain of classes cannot overflow the stack.
+        """
+        index_dict = {}
+        low_link_dict = {}
+        component_stack = []
+        on_stack_set = set()
+        component_list = []
+        for root_class_name in self.class_name_list:
+            if root_class_name in index_dict:
+                continue
+            # Each item of the work stack is a class name and an iterator
+            # over the dependencies of the class that are not visited yet.
+            work_stack = [(root_class_name, iter(self.get_dependency_list(root_class_name)))]
+            index_dict[root_class_name] = low_link_dict[root_class_name] = len(index_dict)
+            component_stack.append(root_class_name)
+            on_stack_set.add(root_class_name)
+            while work_stack:
+                class_name, dependency_iterator = work_stack[-1]
+                dependency_name = next(dependency_iterator, None)
+                if dependency_name is not None:
+                    if dependency_name not in index_dict:
+                        index_dict[dependency_name] = low_link_dict[dependency_name] = len(index_dict)
+                        component_stack.append(dependency_name)
+                        on_stack_set.add(dependency_name)
+                        work_stack.append((dependency_name, iter(self.get_dependency_list(dependency_name))))
+                    elif dependency_name in on_stack_set:
+                        low_link_dict[class_name] = min(low_link_dict[class_name], index_dict[dependency_name])
+                    continue
+                work_stack.pop()
+                if work_stack:
+                    parent_class_name = work_stack[-1][0]
+                    low_link_dict[parent_class_name] = min(low_link_dict[parent_class_name], low_link_dict[class_name])
+                if low_link_dict[class_name] == index_dict[class_name]:
+                    component = []
+                    while True:
+                        component_class_name = component_stack.pop()
+                        on_stack_set.remove(component_class_name)
+                        component.append(component_class_name)
+                        if component_class_name == class_name:
+                            break
+                    component.reverse()
+                    component_list.append(component)
+        return component_list
+
+    def get_topological_order(self):
+        """ Return the class names in an order where every class comes after
+            the classes that it depends on.  The classes in an include cycle
+            are kept together.
+        """
+        return [class_name
+                for component in self.find_strongly_connected_components()
+                for class_name in component]
+
+    def find_cycles(self):
+        """ Return a list of include cycles.  Each cycle is a list of class
+            names that starts and ends with the same class, where each class
+            includes the next class.
+        """
+        cycle_list = []
+        for component in self.find_strongly_connected_components():
+            start_class_name = component[0]
+            if len(component) > 1 or start_class_name in self.get_dependency_list(start_class_name):
+                cycle_list.append(self._find_cycle_path(start_class_name, set(component)))
+        return cycle_list
+
+    def _find_cycle_path(self, start_class_name, component_set):
+        # Search breadth first for the shortest path from the start class
+        # back to the start class inside of the component.
+        previous_class_dict = {}
+        class_name_list = [start_class_name]
+        while class_name_list:
+            next_class_name_list = []
+            for class_name in class_name_list:
+                for dependency_name in self.get_dependency_list(class_name):
+                    if dependency_name not in component_set:
+                        continue
+                    if dependency_name == start_class_name:
+                        cycle_path = [start_class_name, class_name]
+                        while class_name != start_class_name:
+                            class_name = previous_class_dict[class_name]
+                            cycle_path.append(class_name)
+                        cycle_path.reverse()
+                        return cycle_path
+                    if dependency_name not in previous_class_dict:
+                        previous_class_dict[dependency_name] = class_name
+                        next_class_name_list.append(dependency_name)
+            class_name_list = next_class_name_list
+        return [start_class_name, start_class_name]
@@ -0,0 +1,669 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  Generate the C++ class files for a class in memory.  The
+  generate_cpp_class function takes the text of an input file and the
+  class options, and returns a GeneratedClass instance that holds the
+  class definition text, the class implementation text, the include
+  names, and any diagnostics.  No files are read or written, so the
+  class generator can be used as a library.
+"""
+import time
+from collections import namedtuple
+from cStringIO import StringIO
+from type_info import TypeInfo
+from type_and_name_info import TypeAndNameInfo
+from function_info import FunctionInfo
+from bparse import Bparse
+from include_file_manager import include_decision_cache
+from file_buffer import FileBuffer
+from class_options import get_header_date_time
+from generation_profile import null_profile
+
+# The separator lines for the file headers and the method headers.
+stars_text = '//**********************************************************************'
+function_header_separator_text = '//======================================================================'
+
+# The estimated size of the text of a class implementation file that is
+# not in a method, and of an implemented method that is not in the method
+# body, such as the method header comment and the signature.
+implementation_file_size_estimate = 1024
+method_size_estimate = 256
+
+def get_date_and_year(date_time=None):
+    """ Return the date text and the year text for the file headers.
+        See get_header_date_time for the date that is used if no date
+        and time is passed.
+    """
+    now = time.asctime(get_header_date_time(date_time))
+    now_list = now.split()
+    time_list = now_list[3].split(':')
+    day_of_week = now_list[0]
+    month = now_list[1]
+    day_number = now_list[2]
+    year = now_list[4]
+    date = '{0} {1}, {2}'.format(month, day_number, year)
+    return date, year
+
+def render_class_definition(class_name,
+                            base_class,
+                            author,
+                            date_text,
+                            year_text,
+                            abstract_class,
+                            definition_include_name_list,
+                            implementation_include_name_list,
+                            data_member_type_and_name_info_list,
+                            function_info_list):
+    """ Generate the text chunks for the class definition file. """
+    class_definition_file_name = '{0}.h'.format(class_name)
+    conditional_include_name_text = '{0}_H'.format(class_name)
+    conditional_include_name_text = conditional_include_name_text.upper()
+    # Write the class definition file header.
+    yield '{0}\n'.format(stars_text)
+    yield '// Class Definition File: {0}\n'.format(class_definition_file_name)
+    yield '// Author: {0}\n'.format(author)
+    yield '// Date: {0}\n'.format(date_text)
+    yield '//\n'
+    yield '// Abstract:\n'
+    yield '//\n'
+    yield '//   This file contains the class definition for class {0}.\n'.format(class_name)
+    yield '//\n'
+    yield '// Copyright (c) {0}, {1}.\n'.format(year_text, author)
+    yield '//\n'
+    yield '{0}\n'.format(stars_text)
+    yield '\n'
+    yield '#ifndef {0}\n'.format(conditional_include_name_text)
+    yield '#define {0}\n'.format(conditional_include_name_text)
+    # Write the class definition include statements.
+    # Write the bracketed include statements first.
+    include_name = ''
+    if len(definition_include_name_list) > 0:
+        yield '\n'
+        # Write the include files lines for file names that are bracketed, such as '#include <vector>'.
+        for include_name in definition_include_name_list:
+            if include_name[0] == '<':
+                yield '#include {0};\n'.format(include_name)
+        # Write the include files lines for ordinary file names, such as '#include 'Foo.h''.
+        for include_name in definition_include_name_list:
+            if include_name[0] != '<':
+                if '.h' not in include_name:
+                    include_name = '{0}.h'.format(include_name)
+                yield '#include "{0}";\n'.format(include_name)
+    # Write forward declarations.
+    if len(implementation_include_name_list) > 0:
+        yield '\n'
+        for implementation_class_name in implementation_include_name_list:
+            yield 'class {0};\n'.format(implementation_class_name)
+    # Write the class definition header.
+    yield '\n{0}\n'.format(function_header_separator_text)
+    if abstract_class:
+        yield '// Abstract class Definition'
+    else:
+        yield '// Class Definition\n'
+    yield '{0}\n\n'.format(function_header_separator_text)
+    # Start the class definition.
+    if base_class:
+        yield 'class {0} : public {1}\n{2}\n'.format(class_name, base_class, '{')
+    else:
+        yield 'class {0}\n{1}\n'.format(class_name, '{')
+    # Write the class definition data member declarations.
+    # Skip the static data members in this loop and write
+    # the static declarations afterward.
+    if not abstract_class:
+        yield 'protected:\n\n'
+        for data_member_type_and_name in data_member_type_and_name_info_list:
+            the_type_info = data_member_type_and_name.get_type_info()
+            if the_type_info.get_static_virtual_qualifier_type() != TypeInfo.STATIC_QUALIFIER_TYPE:
+                render_text = data_member_type_and_name.get_type_and_name_text(TypeInfo.RENDER_DEFINITION_DATA_TYPE,
+                                                                               TypeAndNameInfo.RENDER_NO_VALUE)
+                yield '    {0};\n'.format(render_text)
+        yield '\n'
+        # Write the static data members.
+        for data_member_type_and_name in data_member_type_and_name_info_list:
+            the_type_info = data_member_type_and_name.get_type_info()
+            if the_type_info.get_static_virtual_qualifier_type() == TypeInfo.STATIC_QUALIFIER_TYPE:
+                render_text = data_member_type_and_name.get_type_and_name_text(TypeInfo.RENDER_DEFINITION_DATA_TYPE,
+                                                                               TypeAndNameInfo.RENDER_NO_VALUE)
+                yield '    {0};\n'.format(render_text)
+    # Write the class definition functions declarations
+    # For the 'no copy' copy constructor and operator=().
+    # Only write the 'private:' keyword if a nocopy method exists
+    # and this is not an abstract class.
+    wrote_private = False
+    if not abstract_class:
+        for function_info in function_info_list:
+            if not function_info.write_the_implementation():
+                if not wrote_private:
+                    wrote_private = True
+                    yield '\n'
+                    yield 'private:\n'
+                    in_class_header_separator_text = '    //------------------------------------------------------------------'
+                    yield '{0}\n'.format(in_class_header_separator_text)
+                    yield "    // Don't allow copying instances of this class.\n"
+                    yield '{0}\n'.format(in_class_header_separator_text)
+                yield '\n'
+                for text in function_info.render_definition():
+                    yield text
+        yield '\n'
+    # Write the class definition functions declarations.
+    yield 'public:\n'
+    for function_info in function_info_list:
+        if function_info.write_the_implementation():
+            yield '\n'
+            for text in function_info.render_definition():
+                yield text
+    # End the class definition.
+    yield '};\n\n'
+    # Close the conditional include statement
+    yield '#endif\n'
+
+def find_definition_type_name_set(base_class,
+                                  data_member_type_and_name_info_list,
+                                  function_info_list):
+    """ Return the include names of the types that the class definition
+        file needs the definition of, because the base class, a data
+        member, or an inline method uses the type by value.  A method
+        that is not inline only needs a forward declaration of the types
+        in the method declaration.
+    """
+    type_info_list = [data_member_type_and_name_info.get_type_info()
+                      for data_member_type_and_name_info in data_member_type_and_name_info_list]
+    for function_info in function_info_list:
+        if function_info.is_inline():
+            type_info_list.append(function_info.get_method_type_and_name_info().get_type_info())
+            type_info_list.extend([argument_type_and_name_info.get_type_info()
+                                   for argument_type_and_name_info in function_info.get_argument_list()])
+    type_key_set = set([(the_type_info.get_name(), the_type_info.get_type_modifier()) for the_type_info in type_info_list])
+    if base_class:
+        type_key_set.add((base_class, ''))
+    definition_type_name_set = set()
+    for type_name, type_modifier in type_key_set:
+        for include_name, is_definition_include, _ in include_decision_cache.get_include_decision(type_name, type_modifier):
+            if is_definition_include:
+                definition_type_name_set.add(include_name)
+    return definition_type_name_set
+
+def find_forward_declarable_name_set(class_name,
+                                     base_class,
+                                     definition_class_name_set,
+                                     data_member_type_and_name_info_list,
+                                     function_info_list):
+    """ Return the include names in the definition class name set that
+        could be forward declarations, because the class definition file
+        does not need the definition of the type.  Bracketed include names
+        and file names are not class names, so they cannot be forward
+        declared.
+    """
+    forward_declarable_name_set = set([include_name for include_name in definition_class_name_set
+                                       if (include_name[0] != '<'
+                                           and '.' not in include_name
+                                           and '/' not in include_name
+                                           and include_decision_cache.is_forward_declarable(include_name))])
+    forward_declarable_name_set.discard(class_name)
+    if forward_declarable_name_set:
+        forward_declarable_name_set -= find_definition_type_name_set(base_class,
+                                                                     data_member_type_and_name_info_list,
+                                                                     function_info_list)
+    return forward_declarable_name_set
+
+def forward_declare_classes(definition_class_name_set,
+                            implementation_class_name_set,
+                            forward_declaration_name_set):
+    """ Move the classes from the definition class name set to the
+        implementation class name set, so the class definition file
+        forward declares them and the class implementation file includes
+        them.  Fewer includes in the class definition file make every
+        file that includes the class definition file compile faster.
+    """
+    for forward_declaration_name in forward_declaration_name_set:
+        definition_class_name_set.remove(forward_declaration_name)
+        implementation_class_name_set.add(forward_declaration_name)
+
+def estimate_implementation_size(function_info_list):
+    """ Return the estimated size of the code in the class implementation
+        file, which is mostly the size of the body and signature of every
+        method that is implemented in the file.
+    """
+    implementation_size = implementation_file_size_estimate
+    for function_info in function_info_list:
+        if not function_info.is_inline() and function_info.write_the_implementation():
+            implementation_size += method_size_estimate + function_info.get_body_size()
+    return implementation_size
+
+def render_class_implementation(class_name,
+                                author,
+                                date_text,
+                                year_text,
+                                full_header,
+                                implementation_include_name_list,
+                                data_member_type_and_name_info_list,
+                                function_info_list,
+                                precompiled_header_name=''):
+    """ Generate the text chunks for the class implementation file.  If a
+        precompiled header name is passed, then the precompiled header is
+        included before any other file.
+    """
+    class_implementation_file_name = '{0}.cpp'.format(class_name)
+    # Write the class implementation file header.
+    yield '{0}\n'.format(stars_text)
+    yield '// Class Implementation File: {0}\n'.format(class_implementation_file_name)
+    yield '// Author: {0}\n'.format(author)
+    yield '// Date: {0}\n'.format(date_text)
+    yield '//\n'
+    yield '// Abstract:\n'
+    yield '//\n'
+    yield '//   This file contains the class implementation for class {0}.\n'.format(class_name)
+    yield '//\n'
+    yield '// Copyright (c) {0}, {1}.\n'.format(year_text, author)
+    yield '//\n'
+    yield '{0}\n\n'.format(stars_text)
+    # Write the class implementation include statements.
+    # Write the bracketed include statements first.
+    # A precompiled header must be included first.
+    if precompiled_header_name:
+        yield '#include "{0}"\n'.format(precompiled_header_name)
+    # Write the line to include the class header file.
+    yield '#include "{0}.h\"\n'.format(class_name)
+    # Write the include files lines for file names that are bracketed, such as '#include <vector>'.
+    for include_name in implementation_include_name_list:
+        if include_name[0] == '<':
+            yield '#include {0}\n'.format(include_name)
+    # Write the include files lines for ordinary file names, such as '#include "Foo.h"'.
+    for include_name in implementation_include_name_list:
+        if include_name[0] != '<':
+            if '.h' not in include_name:
+                include_name = '{0}.h'.format(include_name)
+            yield '#include "{0}"\n'.format(include_name)
+    # Determine if there are any static data member declarations.
+    has_static_data_member = False
+    # Determine if there are any static data members.
+    for data_member_type_and_name_info in data_member_type_and_name_info_list:
+        type_info = data_member_type_and_name_info.get_type_info()
+        if type_info.get_static_virtual_qualifier_type() == type_info.STATIC_QUALIFIER_TYPE:
+            has_static_data_member = True
+    # Are there any static data members?
+    if has_static_data_member:
+        # Write the implementation static data member
+        # declarations.  First write the section header.
+        yield '\n'
+        yield '{0}\n'.format(function_header_separator_text)
+        yield '// Static data member declarations\n'
+        yield '{0}\n\n'.format(function_header_separator_text)
+        # Write the declaration for each static data member.
+        for data_member_type_and_name_info in data_member_type_and_name_info_list:
+            type_info = data_member_type_and_name_info.get_type_info()
+            if type_info.get_static_virtual_qualifier_type() == type_info.STATIC_QUALIFIER_TYPE:
+                # Put the '<classname>::' in front of the variable name.
+                static_variable_name = '{0}::{1}'.format(class_name, data_member_type_and_name_info.get_name())
+                static_data_type_and_name_info = TypeAndNameInfo()
+                static_data_type_and_name_info.set_name(static_variable_name)
+                # If no value is specified for the type and the type is a pointer type, then set the value to 'NULL'.
+                # If the type is a pointer type then set the data member to NULL.
+                static_data_member_value = data_member_type_and_name_info.get_value()
+                if static_data_member_value:
+                    static_data_type_info = data_member_type_and_name_info.get_type_info()
+                    type_modifier_text = static_data_type_info.get_type_modifier()
+                    if  type_modifier_text == '*' or type_modifier_text == '**':
+                        static_data_type_and_name_info.set_value('NULL')
+                static_declaration_text = data_member_type_and_name_info.get_type_and_name_text(TypeInfo.RENDER_IMPLEMENTATION_OR_ARGUMENT_TYPE,
+                                                                                                TypeAndNameInfo.RENDER_VALUE)
+                yield '{0};\n'.format(static_declaration_text)
+    # Write the class implementation function
+    # declarations.
+    for function_info in function_info_list:
+        if function_info.write_the_implementation():
+            for text in function_info.render_implementation_header(class_name,
+                                                                   function_header_separator_text,
+                                                                   full_header):
+                yield text
+            for text in function_info.render_implementation(data_member_type_and_name_info_list,
+                                                            class_name):
+                yield text
+
+# The severity of a diagnostic.
+ERROR_SEVERITY = 'error'
+WARNING_SEVERITY = 'warning'
+
+def join_chunks(chunk_list):
+    """ Join text chunks that can be strings or buffers into a string. """
+    return ''.join([chunk if isinstance(chunk, str) else str(chunk) for chunk in chunk_list])
+
+# A message about the spec text.  The line number is zero if the
+# message is not about a single line.
+Diagnostic = namedtuple('Diagnostic', ['severity', 'line_number', 'message'])
+
+class GeneratedClass:
+
+    def __init__(self, class_name):
+        self.class_name = class_name
+        self.header_chunk_list = []
+        self.implementation_chunk_list = []
+        self.definition_include_name_list = []
+        self.implementation_include_name_list = []
+        # The definition include names that could be forward declarations.
+        self.forward_declarable_include_name_list = []
+        # The estimated size of the code in the class implementation file,
+        # which is zero if there is no class implementation file.
+        self.implementation_size = 0
+        self.diagnostic_list = []
+
+    def get_class_name(self):
+        return self.class_name
+
+    def get_header_file_name(self):
+        return '{0}.h'.format(self.class_name)
+
+    def get_header_text(self):
+        return join_chunks(self.header_chunk_list)
+
+    def get_header_chunk_list(self):
+        return self.header_chunk_list
+
+    def set_header_chunk_list(self, header_chunk_list):
+        self.header_chunk_list = header_chunk_list
+
+    def get_implementation_file_name(self):
+        return '{0}.cpp'.format(self.class_name)
+
+    def get_implementation_text(self):
+        return join_chunks(self.implementation_chunk_list)
+
+    def get_implementation_chunk_list(self):
+        return self.implementation_chunk_list
+
+    def set_implementation_chunk_list(self, implementation_chunk_list):
+        self.implementation_chunk_list = implementation_chunk_list
+
+    def has_implementation(self):
+        # There is no implementation file if all methods are inline.
+        return len(self.implementation_chunk_list) > 0
+
+    def get_definition_include_name_list(self):
+        return self.definition_include_name_list
+
+    def set_definition_include_name_list(self, definition_include_name_list):
+        self.definition_include_name_list = definition_include_name_list
+
+    def get_implementation_include_name_list(self):
+        return self.implementation_include_name_list
+
+    def set_implementation_include_name_list(self, implementation_include_name_list):
+        self.implementation_include_name_list = implementation_include_name_list
+
+    def get_forward_declarable_include_name_list(self):
+        return self.forward_declarable_include_name_list
+
+    def set_forward_declarable_include_name_list(self, forward_declarable_include_name_list):
+        self.forward_declarable_include_name_list = forward_declarable_include_name_list
+
+    def get_implementation_size(self):
+        return self.implementation_size
+
+    def set_implementation_size(self, implementation_size):
+        self.implementation_size = implementation_size
+
+    def get_diagnostic_list(self):
+        return self.diagnostic_list
+
+    def add_diagnostic(self, severity, line_number, message):
+        self.diagnostic_list.append(Diagnostic(severity, line_number, message))
+
+    def has_errors(self):
+        for diagnostic in self.diagnostic_list:
+            if diagnostic.severity == ERROR_SEVERITY:
+                return True
+        return False
+
+def generate_cpp_class(spec_text,
+                       class_name,
+                       base_class='',
+                       author='',
+                       full_header=False,
+                       abstract_class=False,
+                       date_time=None,
+                       profile=None,
+                       parse_index=None,
+                       project_class_name_set=None,
+                       minimal_includes=False,
+                       precompiled_header_name=''):
+    """ Generate the C++ class for the spec text and return a
+        GeneratedClass instance.  No files are read or written.  An
+        error in the spec text is returned as an error diagnostic and
+        then the class has no header text or implementation text.  If
+        a GenerationProfile is passed, then the time of each phase and
+        the counters are added to the profile.  If a ParseIndex is
+        passed, then only the declarations that changed since the last
+        time the index was updated are parsed, and the index is updated.
+        If a set of project class names is passed, then the project
+        classes that the class definition does not need by value are
+        forward declared instead of being included.  If minimal includes
+        is True, then every class that the class definition does not need
+        by value is forward declared.  If a precompiled header name is
+        passed, then the class implementation file includes it first.
+    """
+    # Read the spec text from memory.
+    return generate_cpp_class_from_file_buffer(FileBuffer(StringIO(spec_text)),
+                                               class_name,
+                                               base_class,
+                                               author,
+                                               full_header,
+                                               abstract_class,
+                                               date_time,
+                                               profile,
+                                               parse_index,
+                                               project_class_name_set,
+                                               minimal_includes,
+                                               precompiled_header_name)
+
+def generate_cpp_class_from_file_buffer(file_buffer,
+                                        class_name,
+                                        base_class='',
+                                        author='',
+                                        full_header=False,
+                                        abstract_class=False,
+                                        date_time=None,
+                                        profile=None,
+                                        parse_index=None,
+                                        project_class_name_set=None,
+                                        minimal_includes=False,
+                                        precompiled_header_name=''):
+    """ Generate the C++ class for the text of a file buffer, the same as
+        generate_cpp_class does.  The chunks of the generated class can be
+        buffers that refer to the file buffer text, so the file buffer must
+        not be closed until the generated class is no longer used.
+    """
+    if profile is None:
+        profile = null_profile
+    if not author:
+        author = 'William Hallahan'
+    generated_class = GeneratedClass(class_name)
+    # Parse the spec text.  The tokens are lexed while parsing.
+    data_member_type_and_name_info_list = []
+    definition_class_name_set = set()
+    implementation_class_name_set = set()
+    function_info_list = []
+    include_cache_hit_count = include_decision_cache.get_hit_count()
+    include_cache_miss_count = include_decision_cache.get_miss_count()
+    with profile.time_phase('parse'):
+        parser = Bparse(None, file_buffer)
+        # The tokens are lexed while parsing, so the lexing time is taken
+        # out of the parse time.
+        parser.lexer.next_token = profile.time_method('lex', parser.lexer.next_token)
+        parser.lexer.skip_block = profile.time_method('lex', parser.lexer.skip_block)
+        try:
+            parser.parse(data_member_type_and_name_info_list,
+                         definition_class_name_set,
+                         implementation_class_name_set,
+                         function_info_list,
+                         class_name,
+                         parse_index)
+        except ValueError as value_error:
+            # The spec text is not correct.
+            generated_class.add_diagnostic(ERROR_SEVERITY, parser.get_line_number(), value_error.args[0])
+            return generated_class
+        except Exception as err:
+            # Something bad happened in the parser.  Attach the input file line number to
+            # The exception information.
+            err.args = ['{0}\nError parsing input file at line {1}.'.format(err.args[0], parser.get_line_number())]
+            raise
+    profile.add_count('characters_scanned', file_buffer.get_file_size())
+    profile.add_count('tokens', len(parser.token_list))
+    if parse_index is not None:
+        profile.add_count('declarations_parsed', parser.get_parsed_declaration_count())
+        profile.add_count('declarations_reused', parser.get_reused_declaration_count())
+    profile.add_count('distinct_types', parser.get_type_info_table().get_type_info_count())
+    profile.add_count('include_cache_hits', include_decision_cache.get_hit_count() - include_cache_hit_count)
+    profile.add_count('include_cache_misses', include_decision_cache.get_miss_count() - include_cache_miss_count)
+    profile.add_count('data_members', len(data_member_type_and_name_info_list))
+    profile.add_count('functions', len(function_info_list))
+    profile.start_phase('post_process')
+    # If the class is derived from a base class, then include
+    # the header file for the base class.
+    if base_class:
+        base_class_type_info = TypeInfo()
+        base_class_type_info.set_name(base_class)
+        parser.save_include_name(definition_class_name_set,
+                                 implementation_class_name_set,
+                                 base_class_type_info)
+    # If a pure abstract class then ensure that all virtual method
+    # declarations end with '= 0'
+    if abstract_class:
+        for function_info in function_info_list:
+            # Only make 'virtual' methods be abstract.
+            method_type_and_name_info = function_info.get_method_type_and_name_info()
+            method_type_info = method_type_and_name_info.get_type_info()
+            # Test for a virtual method.  Do not make a virtual destructor be abstract
+            # unless the user already specified '= 0' at the end in the input file.
+            if (method_type_info.get_static_virtual_qualifier_type() == TypeInfo.VIRTUAL_QUALIFIER_TYPE
+                and function_info.get_method_type() != FunctionInfo.METHOD_DESTRUCTOR):
+                qualifier_text = function_info.get_qualifier()
+                if not '=' in qualifier_text:
+                    qualifier_text = '{0} = 0'.format(qualifier_text)
+                    function_info.set_qualifier(qualifier_text)
+                # Do not implement abstract functions.
+                function_info.set_write_the_implementation(False)
+    # If there is a single virtual method then set the destructor to be virtual.
+    # Check for any virtual method.  Treat the destructor as a regular method.
+    has_virtual_method = False
+    for function_info in function_info_list:
+        method_type_and_name_info = function_info.get_method_type_and_name_info()
+        method_type_info = method_type_and_name_info.get_type_info()
+        if method_type_info.get_static_virtual_qualifier_type() == TypeInfo.VIRTUAL_QUALIFIER_TYPE:
+            has_virtual_method = True
+            break
+    if has_virtual_method:
+        for function_info in function_info_list:
+            if function_info.get_method_type() == FunctionInfo.METHOD_DESTRUCTOR:
+                # The method type can be shared, so set a changed copy of the type.
+                method_type_and_name_info = function_info.get_method_type_and_name_info()
+                method_type_info = method_type_and_name_info.get_type_info().copy()
+                method_type_info.set_static_virtual_qualifier_type(TypeInfo.VIRTUAL_QUALIFIER_TYPE)
+                method_type_and_name_info.set_type_info(method_type_info)
+    # Warn about mistakes that still produce class files.
+    if abstract_class and not has_virtual_method:
+        generated_class.add_diagnostic(WARNING_SEVERITY, 0, 'The class is abstract, but no method is virtual.')
+    data_member_name_set = set()
+    for data_member_type_and_name_info in data_member_type_and_name_info_list:
+        data_member_name = data_member_type_and_name_info.get_name()
+        if data_member_name in data_member_name_set:
+            generated_class.add_diagnostic(WARNING_SEVERITY,
+                                           0,
+                                           'The data member {0} is declared more than once.'.format(data_member_name))
+        data_member_name_set.add(data_member_name)
+    # Forward declare the project classes, or every class if the class
+    # definition file must have the fewest includes, that the class
+    # definition does not need by value.
+    forward_declarable_name_set = find_forward_declarable_name_set(class_name,
+                                                                   base_class,
+                                                                   definition_class_name_set,
+                                                                   data_member_type_and_name_info_list,
+                                                                   function_info_list)
+    forward_declaration_name_set = set()
+    if minimal_includes:
+        forward_declaration_name_set = forward_declarable_name_set
+    elif project_class_name_set:
+        forward_declaration_name_set = forward_declarable_name_set.intersection(project_class_name_set)
+    forward_declare_classes(definition_class_name_set,
+                            implementation_class_name_set,
+                            forward_declaration_name_set)
+    generated_class.set_forward_declarable_include_name_list(sorted(forward_declarable_name_set - forward_declaration_name_set))
+    profile.add_count('forward_declared_includes', len(forward_declaration_name_set))
+    date_text, year_text = get_date_and_year(date_time)
+    # Sort the include names and the forward declarations so that
+    # the same input file always produces exactly the same output.
+    definition_include_name_list = sorted(definition_class_name_set)
+    implementation_include_name_list = sorted(implementation_class_name_set)
+    generated_class.set_definition_include_name_list(definition_include_name_list)
+    generated_class.set_implementation_include_name_list(implementation_include_name_list)
+    profile.stop_phase()
+    profile.add_count('definition_includes', len(definition_include_name_list))
+    profile.add_count('forward_declarations', len(implementation_include_name_list))
+    profile.add_count('forward_declarable_includes', len(generated_class.get_forward_declarable_include_name_list()))
+    # Render the class definition.
+    profile.start_phase('render_definition')
+    generated_class.set_header_chunk_list(list(render_class_definition(class_name,
+                                                                    base_class,
+                                                                    author,
+                                                                    date_text,
+                                                                    year_text,
+                                                                    abstract_class,
+                                                                    definition_include_name_list,
+                                                                    implementation_include_name_list,
+                                                                    data_member_type_and_name_info_list,
+                                                                    function_info_list)))
+    profile.stop_phase()
+    # Determine if there are any non-inline methods.
+    has_non_inline_methods = False
+    for function_info in function_info_list:
+        if not function_info.is_inline():
+            has_non_inline_methods = True
+    # If all methods are inline methods or this a pure abstract class
+    # then there is no implementation file.
+    if has_non_inline_methods:
+        profile.start_phase('render_implementation')
+        # The type registry can name the include file of a type that is
+        # forward declared in the class definition file.
+        implementation_file_include_name_list = sorted(set([include_decision_cache.get_forward_declaration_include_name(include_name)
+                                                            for include_name in implementation_include_name_list]))
+        generated_class.set_implementation_chunk_list(list(render_class_implementation(class_name,
+                                                                                    author,
+                                                                                    date_text,
+                                                                                    year_text,
+                                                                                    full_header,
+                                                                                    implementation_file_include_name_list,
+                                                                                    data_member_type_and_name_info_list,
+                                                                                    function_info_list,
+                                                                                    precompiled_header_name)))
+        generated_class.set_implementation_size(estimate_implementation_size(function_info_list))
+        profile.stop_phase()
+        # The class header file is also included.
+        implementation_include_count = len(implementation_file_include_name_list) + 1
+        if precompiled_header_name:
+            implementation_include_count += 1
+        profile.add_count('implementation_includes', implementation_include_count)
+    for chunk_list in [generated_class.get_header_chunk_list(), generated_class.get_implementation_chunk_list()]:
+        profile.add_count('bytes_rendered', sum([len(chunk) for chunk in chunk_list]))
+    return generated_class
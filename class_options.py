@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The command line switches and helper functions that are shared by the
+  programs that create C++ class files.  This module only imports
+  standard library modules, so a program that imports it starts quickly.
+"""
+import os
+import time
+from argparse import ArgumentTypeError
+
+def create_folder(parent_directory, folder_name):
+    new_path = os.path.join(parent_directory, folder_name)
+    if not os.path.exists(new_path):
+        os.makedirs(new_path)
+    return new_path
+
+def create_folder_under_current_directory(folder_name):
+    return create_folder(os.getcwd(), folder_name)
+
+def parse_date(date_text):
+    """ Return a time.struct_time for a date in the form YYYY-MM-DD. """
+    try:
+        return time.strptime(date_text, '%Y-%m-%d')
+    except ValueError:
+        raise ArgumentTypeError('Invalid date {0}, the date must be in the form YYYY-MM-DD.'.format(date_text))
+
+def get_header_date_time(date_time=None):
+    """ Return the date and time for the class file headers.  If no date
+        and time is passed, then the SOURCE_DATE_EPOCH environment
+        variable is used if it is set, so that the class files can be
+        reproduced.  Otherwise the current time is used.
+    """
+    if date_time is None:
+        source_date_epoch = os.environ.get('SOURCE_DATE_EPOCH', '')
+        if source_date_epoch:
+            date_time = time.gmtime(int(source_date_epoch))
+        else:
+            date_time = time.localtime()
+    return date_time
+
+def add_class_option_arguments(parser):
+    """ Add the switches that control how a class is generated. """
+    parser.add_argument('-b', '--base_class', action='store', dest='base_class', default='', help='Inherit from the named base class.')
+    parser.add_argument('-a', '--author', action='store', dest='author', default='', help='The author name.')
+    parser.add_argument('-f', '--full', action='store_true', dest='full_header', default=False, help='Write full detailed header information.')
+    parser.add_argument('-t', '--abstract', action='store_true', dest='abstract_class', default=False, help='Create only abstract class header file.')
+    parser.add_argument('-d', '--date', action='store', type=parse_date, dest='date_time', default=None, help='The date written in the file headers.')
@@ -23,24 +23,55 @@
 # OTHER DEALINGS IN THE SOFTWARE.
 #=======================================================================
 
+import os
+import mmap
+
 class FileBuffer:
 
     def __init__(self, input_file):
         self.file_buffer_text = input_file.read()
         self.input_file = input_file
-        self.end_of_file = False
-
-    def past_end_of_file(self):
-        return self.end_of_file
 
     def get_file_size(self):
         return len(self.file_buffer_text)
 
-    def __getitem__(self, index):
-        self.end_of_file = False
-        c = chr(0)
-        if 0 <= index < len(self.file_buffer_text):
-            c = self.file_buffer_text[index]
+    def get_text(self):
+        return self.file_buffer_text
+
+    def get_text_range(self, start, end):
+        return self.file_buffer_text[start:end]
+
+    def close(self):
+        pass
+
+class MappedFileBuffer:
+    """ A file buffer that memory maps the input file instead of reading
+        the file into a string.  The text is a read-only memory map.  A
+        range of the text is a buffer that refers to the memory map, so
+        the text is not copied.  The buffers cannot be used after the file
+        buffer is closed.
+    """
+
+    def __init__(self, input_file):
+        self.input_file = input_file
+        self.file_size = os.fstat(input_file.fileno()).st_size
+        if self.file_size > 0:
+            self.file_buffer_text = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
         else:
-            self.end_of_file = True
-        return c
+            # An empty file cannot be memory mapped.
+            self.file_buffer_text = ''
+
+    def get_file_size(self):
+        return self.file_size
+
+    def get_text(self):
+        return self.file_buffer_text
+
+    def get_text_range(self, start, end):
+        if not self.file_size:
+            return ''
+        return buffer(self.file_buffer_text, start, end - start)
+
+    def close(self):
+        if self.file_size:
+            self.file_buffer_text.close()
@@ -26,7 +26,7 @@
 from type_info import TypeInfo
 from type_and_name_info import TypeAndNameInfo
 
-class FunctionInfo:
+class FunctionInfo(object):
 
     METHOD_NO_COPY_CONSTRUCTOR = 0
     METHOD_NO_COPY_OPERATOR_EQUAL = 1
@@ -39,6 +39,14 @@ class FunctionInfo:
     
     comment_spacing = 24
 
+    __slots__ = ['argument_type_and_name_list',
+                 'body_list',
+                 'method_type_and_name_info',
+                 'qualifier_text',
+                 'method_type',
+                 'is_inline_method',
+                 'write_implementation_flag']
+
     def __init__(self, method_type_and_name_info):
         self.argument_type_and_name_list = []
         self.body_list = []
@@ -79,7 +87,13 @@ class FunctionInfo:
     def add_argument(self, argument_type_and_name_info):
         self.argument_type_and_name_list.append(argument_type_and_name_info)
 
-    def write_definition(self, output_file):
+    def get_argument_list(self):
+        return self.argument_type_and_name_list
+
+    def render_definition(self):
+        """ Generate the text chunks for the method declaration in the
+            class definition.
+        """
         #  Write the return type and the function name.
         function_line_text = ''
         the_type_info = self.method_type_and_name_info.get_type_info()
@@ -103,14 +117,12 @@ class FunctionInfo:
         #--------------------------------------------------------------
         #  Write the function signature.
         #--------------------------------------------------------------
-        output_file.write(function_line_text);
+        yield function_line_text
         if self.argument_type_and_name_list:
             #  Write out the argument list.
             first_flag = True
             # Get the leading spaces text for the arguments.
-            spaces_text = ''
-            for i in xrange(0, function_line_length):
-                spaces_text = '{0} '.format(spaces_text)
+            spaces_text = ' ' * function_line_length
             # Write each method argument.
             for argument_type_and_name_info in self.argument_type_and_name_list:
                 arg_line_text = argument_type_and_name_info.get_type_and_name_text(TypeInfo.RENDER_DEFINITION_DATA_TYPE,
@@ -119,23 +131,26 @@ class FunctionInfo:
                     first_flag = False
                 else:
                     arg_line_text = ',\n{0}{1}'.format(spaces_text, arg_line_text)
-                output_file.write(arg_line_text)
-        output_file.write(')')
+                yield arg_line_text
+        yield ')'
         #  Write any function qualifiers.
 
         if self.qualifier_text and not ':' in self.qualifier_text:
-            output_file.write(' {0}'.format(self.qualifier_text))
+            yield ' {0}'.format(self.qualifier_text)
         #  If this is an inline function then write the function body inline.
         if self.is_inline():
-            self.write_body(output_file)
+            for body_text in self.body_list:
+                yield body_text
         else:
-            output_file.write(';\n')
+            yield ';\n'
 
-    def write_implementation_header(self,
-                                    output_file,
-                                    class_name_text,
-                                    header_separator_text,
-                                    write_full_header_info):
+    def render_implementation_header(self,
+                                     class_name_text,
+                                     header_separator_text,
+                                     write_full_header_info):
+        """ Generate the text chunks for the method header comment in the
+            class implementation file.
+        """
         #  Only write the function header if this is NOT an inline function.
         if not self.is_inline():
             #  Set up header strings.self.method_type_and_name_info.get_name()
@@ -157,30 +172,30 @@ class FunctionInfo:
                 else:
                     declare_name_text = '//  Static Member Function: {0}'.format(function_name_text)
             #  Write the class implementation function header.
-            output_file.write('\n')
-            output_file.write('{0}\n'.format(header_separator_text))
-            output_file.write('{0}\n'.format(declare_name_text))
+            yield '\n'
+            yield '{0}\n'.format(header_separator_text)
+            yield '{0}\n'.format(declare_name_text)
             if self.method_type == FunctionInfo.METHOD_FUNCTION:
-                output_file.write('//\n')
-                output_file.write('//  Abstract:\n')
-                output_file.write('//\n')
-                output_file.write('//      This method xxxxxx\n')
+                yield '//\n'
+                yield '//  Abstract:\n'
+                yield '//\n'
+                yield '//      This method xxxxxx\n'
             elif self.method_type == FunctionInfo.METHOD_COPY_CONSTRUCTOR:
-                output_file.write('//\n')
-                output_file.write('//  Abstract:\n')
-                output_file.write('//\n')
-                output_file.write('//      This copy constructor copies the passed class instance to this class instance.\n')
+                yield '//\n'
+                yield '//  Abstract:\n'
+                yield '//\n'
+                yield '//      This copy constructor copies the passed class instance to this class instance.\n'
             elif self.method_type == FunctionInfo.METHOD_OPERATOR_EQUAL:
-                output_file.write('//\n')
-                output_file.write('//  Abstract:\n')
-                output_file.write('//\n')
-                output_file.write('//      This equals operator copies the passed class instance to this class instance\n')
-                output_file.write('//      and returns this class instance.\n')
+                yield '//\n'
+                yield '//  Abstract:\n'
+                yield '//\n'
+                yield '//      This equals operator copies the passed class instance to this class instance\n'
+                yield '//      and returns this class instance.\n'
             elif self.method_type == FunctionInfo.METHOD_COPY:
-                output_file.write('//\n')
-                output_file.write('//  Abstract:\n')
-                output_file.write('//\n')
-                output_file.write('//      This method copies the passed class instance.\n')
+                yield '//\n'
+                yield '//  Abstract:\n'
+                yield '//\n'
+                yield '//      This method copies the passed class instance.\n'
             if write_full_header_info:
                 the_return_type_info = self.method_type_and_name_info.get_type_info()
                 implementation_return_type_text = the_return_type_info.get_type_text(TypeInfo.RENDER_IMPLEMENTATION_OR_ARGUMENT_TYPE)
@@ -188,69 +203,68 @@ class FunctionInfo:
                 if self.method_type != FunctionInfo.METHOD_DESTRUCTOR:
                     if not self.argument_type_and_name_list:
                         if self.method_type != FunctionInfo.METHOD_CONSTRUCTOR:
-                            output_file.write('//\n')
-                            output_file.write('//\n')
-                            output_file.write('//  Input:\n')
-                            output_file.write('//\n')
-                            output_file.write('//    None.\n')
-                            output_file.write('//\n')
+                            yield '//\n'
+                            yield '//\n'
+                            yield '//  Input:\n'
+                            yield '//\n'
+                            yield '//    None.\n'
+                            yield '//\n'
                     else:
-                        output_file.write('//\n')
-                        output_file.write('//\n')
-                        output_file.write('//  Input:\n')
-                        output_file.write('//\n')
+                        yield '//\n'
+                        yield '//\n'
+                        yield '//  Input:\n'
+                        yield '//\n'
                         for arg_type_and_name_info in self.argument_type_and_name_list:
                             arg_line_text = '//    {0}  '.format(arg_type_and_name_info.get_name())
-                            if len(arg_line_text) < FunctionInfo.comment_spacing:
-                                spaces_to_add_count = FunctionInfo.comment_spacing - len(arg_line_text)
-                                for i in xrange(0, spaces_to_add_count):
-                                   arg_line_text = '{0} '.format(arg_line_text)
+                            arg_line_text = arg_line_text.ljust(FunctionInfo.comment_spacing)
                             # Get the argument type.
                             arg_type_info = arg_type_and_name_info.get_type_info()
                             if arg_type_info.get_type_modifier() == '&':
-                                output_file.write('{0}A reference to a value of type {1}'.format(arg_line_text, arg_type_info.get_name()))
+                                yield '{0}A reference to a value of type {1}'.format(arg_line_text, arg_type_info.get_name())
                             elif arg_type_info.get_type_modifier() == '*':
-                                output_file.write('{0}A pointer to a value of type {1}'.format(arg_line_text, arg_type_info.get_name()))
+                                yield '{0}A pointer to a value of type {1}'.format(arg_line_text, arg_type_info.get_name())
                             elif arg_type_info.get_type_modifier() == '**' or arg_type_info.get_type_modifier() == '* *':
-                                output_file.write('{0}A pointer to a pointer to a value of type {1}'.format(arg_line_text, arg_type_info.get_name()))
+                                yield '{0}A pointer to a pointer to a value of type {1}'.format(arg_line_text, arg_type_info.get_name())
                             elif arg_type_info.get_type_modifier() == '&*' or arg_type_info.get_type_modifier() == '& *':
-                                output_file.write('{0}A reference to a pointer to a value of type {1}'.format(arg_line_text, arg_type_info.get_name()))
+                                yield '{0}A reference to a pointer to a value of type {1}'.format(arg_line_text, arg_type_info.get_name())
                             else:
-                                output_file.write('{0}A value of type {1}'.format(arg_line_text, arg_type_info.get_name()))
+                                yield '{0}A value of type {1}'.format(arg_line_text, arg_type_info.get_name())
                             if (self.method_type != FunctionInfo.METHOD_COPY_CONSTRUCTOR
                                 and self.method_type != FunctionInfo.METHOD_OPERATOR_EQUAL
                                 and self.method_type != FunctionInfo.METHOD_COPY):
-                                output_file.write(' that xxxxxx\n')
+                                yield ' that xxxxxx\n'
                             else:
-                                output_file.write('.\n')
-                            output_file.write('//\n')
-                        output_file.write('//\n')
+                                yield '.\n'
+                            yield '//\n'
+                        yield '//\n'
                     #  Write the output return specification.
                     if (self.method_type == FunctionInfo.METHOD_FUNCTION
                         and implementation_return_type_text
                         and the_return_type_info.get_name() != 'void'
                         and the_return_type_info.get_name() != 'VOID'
                         and not the_return_type_info.get_type_modifier()):
-                        output_file.write('//  Return value:\n')
-                        output_file.write('//\n')
+                        yield '//  Return value:\n'
+                        yield '//\n'
                         if the_return_type_info.get_type_modifier() == '&':
-                            output_file.write('//    This method returns a reference to a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name()))
+                            yield '//    This method returns a reference to a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name())
                         elif the_return_type_info.get_type_modifier() == '*':
-                            output_file.write('//    This method returns a pointer to a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name()))
+                            yield '//    This method returns a pointer to a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name())
                         elif the_return_type_info.get_type_modifier() == '**':
-                            output_file.write('//    This method returns a pointer to a pointer to a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name()))
+                            yield '//    This method returns a pointer to a pointer to a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name())
                         elif the_return_type_info.get_type_modifier() == '&*':
-                            output_file.write('//    This method returns a reference to a pointer to a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name()))
+                            yield '//    This method returns a reference to a pointer to a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name())
                         else:
-                            output_file.write('//    This method returns a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name()))
-                        output_file.write('//\n')
-            output_file.write('{0}\n'.format(header_separator_text))
-            output_file.write('\n')
+                            yield '//    This method returns a value of type {0} that xxxxxx\n'.format(the_return_type_info.get_name())
+                        yield '//\n'
+            yield '{0}\n'.format(header_separator_text)
+            yield '\n'
 
-    def write_implementation(self, 
-                             output_file,
-                             data_member_type_and_name_info_list,
-                             class_name_text):
+    def render_implementation(self,
+                              data_member_type_and_name_info_list,
+                              class_name_text):
+        """ Generate the text chunks for the method in the class
+            implementation file.
+        """
         #  Only write the function body if this is NOT an inline function.
         if not self.is_inline():
             method_type_info = self.method_type_and_name_info.get_type_info()
@@ -265,14 +279,12 @@ class FunctionInfo:
             #  Get the length of the function declaration.
             function_line_length = len(function_line_text)
             #  Write the function line.
-            output_file.write(function_line_text)
+            yield function_line_text
             # Are there any function arguments?
             if len(self.argument_type_and_name_list) > 0:
                 #  Write out the argument list.
                 first_flag = True
-                spaces_text = ''
-                for i in xrange(0, function_line_length):
-                    spaces_text = '{0} '.format(spaces_text)
+                spaces_text = ' ' * function_line_length
                 for arg_type_and_name in self.argument_type_and_name_list:
                     arg_line_text = arg_type_and_name.get_type_and_name_text(TypeInfo.RENDER_IMPLEMENTATION_OR_ARGUMENT_TYPE,
                                                                              TypeAndNameInfo.RENDER_NO_VALUE)
@@ -280,14 +292,14 @@ class FunctionInfo:
                         first_flag = False
                     else:
                         arg_line_text = ',\n{0}{1}'.format(spaces_text, arg_line_text)
-                    output_file.write(arg_line_text)
-                output_file.write(')')
+                    yield arg_line_text
+                yield ')'
             else:
-                output_file.write(')')
+                yield ')'
             #  Write any function qualifiers.
             if self.qualifier_text:
-                output_file.write(' {0}'.format(self.qualifier_text))
-            output_file.write('\n')
+                yield ' {0}'.format(self.qualifier_text)
+            yield '\n'
             #  If this function is a constructor then write the
             #  data member initialization list.
             if self.method_type == FunctionInfo.METHOD_CONSTRUCTOR:
@@ -308,21 +320,30 @@ class FunctionInfo:
                         if default_value_text:
                             if first_data_member:
                                 first_data_member = False
-                                output_file.write('  : ')
+                                yield '  : '
                             else:
-                                output_file.write('  , ')
-                            output_file.write('{0}({1})\n'.format(data_mem_type_and_name_info.get_name(), default_value_text))
+                                yield '  , '
+                            yield '{0}({1})\n'.format(data_mem_type_and_name_info.get_name(), default_value_text)
             #  Write the function body.
-            self.write_body(output_file)
-            output_file.write('\n')
+            for body_text in self.body_list:
+                yield body_text
+            yield '\n'
 
     def add_body_text(self, text):
+        # The text is either a string or a buffer that refers to the
+        # input file text.
         self.body_list.append(text)
 
+    def get_body_text(self):
+        return ''.join([str(body_text) for body_text in self.body_list])
+
+    def get_body_size(self):
+        # The body text is not joined, so a buffer is not copied.
+        return sum([len(body_text) for body_text in self.body_list])
+
     def write_body(self, output_file):
-        # Write the function body.
-        for text in self.body_list:
-            output_file.write(text)
+        for body_text in self.body_list:
+            output_file.write(body_text)
 
     def has_body(self):
         return len(self.body_list) > 0
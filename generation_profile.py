@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  A generation profile records the time of each phase of creating a class
+  and counts what was processed, such as the characters scanned, the
+  tokens, and the bytes written.  When the class is created, the report
+  is passed to the callback function, if there is one.  The report can
+  also be written as JSON.
+
+  Profiling is optional.  The functions that create classes use the null
+  profile if no profile is passed, and the null profile does nothing.
+"""
+import json
+import timeit
+
+class GenerationProfile:
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.phase_name_list = []
+        self.phase_time_dict = {}
+        self.counter_dict = {}
+        self.phase_name = ''
+        self.phase_start_time = 0.0
+
+    def start_phase(self, phase_name):
+        self.phase_name = phase_name
+        self.phase_start_time = timeit.default_timer()
+
+    def stop_phase(self):
+        if self.phase_name:
+            self.add_phase_time(self.phase_name, timeit.default_timer() - self.phase_start_time)
+            self.phase_name = ''
+
+    def time_phase(self, phase_name):
+        """ Return a context manager that times a phase. """
+        return PhaseTimer(self, phase_name)
+
+    def time_method(self, phase_name, method):
+        """ Return a function that calls the method and adds the time of
+            each call to the phase.  The time is taken out of the phase that
+            is running when the method is called, so the time of a phase
+            that runs inside of another phase, such as lexing while parsing,
+            is not counted twice.
+        """
+        def timed_method(*argument_list):
+            start_time = timeit.default_timer()
+            try:
+                return method(*argument_list)
+            finally:
+                elapsed_time = timeit.default_timer() - start_time
+                self.add_phase_time(phase_name, elapsed_time)
+                self.phase_start_time += elapsed_time
+        return timed_method
+
+    def add_phase_time(self, phase_name, elapsed_time):
+        # A phase that runs more than once accumulates the time.
+        if phase_name not in self.phase_time_dict:
+            self.phase_name_list.append(phase_name)
+            self.phase_time_dict[phase_name] = 0.0
+        self.phase_time_dict[phase_name] += elapsed_time
+
+    def get_phase_time(self, phase_name):
+        return self.phase_time_dict.get(phase_name, 0.0)
+
+    def add_count(self, counter_name, count=1):
+        self.counter_dict[counter_name] = self.counter_dict.get(counter_name, 0) + count
+
+    def get_count(self, counter_name):
+        return self.counter_dict.get(counter_name, 0)
+
+    def get_report(self):
+        """ Return a dictionary with the phase times in seconds, the
+            order the phases ran in, and the counters.
+        """
+        return {'phases': dict(self.phase_time_dict),
+                'phase_order': list(self.phase_name_list),
+                'total_time': sum(self.phase_time_dict.values()),
+                'counters': dict(self.counter_dict)}
+
+    def get_json_report(self):
+        return json.dumps(self.get_report(), indent=1, sort_keys=True)
+
+    def finish(self):
+        """ Pass the report to the callback function. """
+        self.stop_phase()
+        if self.callback is not None:
+            self.callback(self.get_report())
+
+class PhaseTimer:
+
+    def __init__(self, profile, phase_name):
+        self.profile = profile
+        self.phase_name = phase_name
+
+    def __enter__(self):
+        self.profile.start_phase(self.phase_name)
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.profile.stop_phase()
+        return False
+
+class NullGenerationProfile:
+    """ A profile that records nothing. """
+
+    def start_phase(self, phase_name):
+        pass
+
+    def stop_phase(self):
+        pass
+
+    def time_phase(self, phase_name):
+        return null_phase_timer
+
+    def time_method(self, phase_name, method):
+        return method
+
+    def add_phase_time(self, phase_name, elapsed_time):
+        pass
+
+    def get_phase_time(self, phase_name):
+        return 0.0
+
+    def add_count(self, counter_name, count=1):
+        pass
+
+    def get_count(self, counter_name):
+        return 0
+
+    def get_report(self):
+        return {'phases': {},
+                'phase_order': [],
+                'total_time': 0.0,
+                'counters': {}}
+
+    def get_json_report(self):
+        return json.dumps(self.get_report(), indent=1, sort_keys=True)
+
+    def finish(self):
+        pass
+
+class NullPhaseTimer:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        return False
+
+null_phase_timer = NullPhaseTimer()
+null_profile = NullGenerationProfile()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The protocol between the class generator server and its clients.  A
+  client connects to the server's Unix domain socket and sends one
+  request on each line.  The server sends one response line for each
+  request.  Both requests and responses are JSON objects.
+
+  A request has these members.  Only "class_name" and "spec_text" are
+  required.
+
+    {"class_name": "Foo",
+     "spec_text": "<the text of the input file>",
+     "base_class": "",
+     "author": "",
+     "full_header": false,
+     "abstract_class": false,
+     "date": "YYYY-MM-DD"}
+
+  A response has these members.  The status is "ok" if the class was
+  generated, otherwise the status is "error" and the error text, or an
+  error diagnostic, describes the problem.
+
+    {"status": "ok",
+     "error_text": "",
+     "header_file_name": "Foo.h",
+     "header_text": "<the class definition file text>",
+     "implementation_file_name": "Foo.cpp",
+     "implementation_text": "<the class implementation file text>",
+     "definition_include_names": ["<vector>", "Bar"],
+     "implementation_include_names": ["Baz"],
+     "diagnostics": [{"severity": "warning", "line_number": 0, "message": "..."}]}
+
+  The implementation text is empty if the class has no implementation file.
+
+  The input file can have any bytes, such as Latin-1 comments, and the
+  class files have the same bytes, so every string in a message is the
+  bytes of the text decoded as Latin-1.  Each byte is one character, so
+  the bytes are the same after the string is encoded as Latin-1 again.
+  The boolean members must be JSON booleans.
+"""
+import os
+import stat
+import json
+import tempfile
+
+OK_STATUS = 'ok'
+ERROR_STATUS = 'error'
+
+def get_default_socket_name():
+    """ Return the socket file name that the server and the clients use
+        if no socket file name is given.  Each user has a separate server.
+        The socket is in a folder that only the user can use, which is the
+        XDG runtime folder if it is set, otherwise a folder in the
+        temporary folder that has the user id in its name.
+    """
+    runtime_directory = os.environ.get('XDG_RUNTIME_DIR', '')
+    if runtime_directory:
+        return os.path.join(runtime_directory, 'make_cpp_class.sock')
+    return os.path.join(tempfile.gettempdir(), 'make_cpp_class-{0}'.format(os.getuid()), 'make_cpp_class.sock')
+
+def check_private_directory(directory):
+    """ Raises an EnvironmentError if the folder belongs to another user,
+        or if other users can use it.
+    """
+    directory_stat = os.lstat(directory)
+    if (not stat.S_ISDIR(directory_stat.st_mode)
+        or directory_stat.st_uid != os.getuid()
+        or directory_stat.st_mode & 0o077):
+        raise EnvironmentError('The socket folder {0} must be a folder that only the current user can use.'.format(directory))
+
+def create_default_socket_directory():
+    """ Create the folder of the default socket file, which only the
+        user can use, if it does not exist.  Raises an EnvironmentError if
+        the folder belongs to another user, or if other users can use it.
+    """
+    socket_directory = os.path.dirname(get_default_socket_name())
+    if not os.path.lexists(socket_directory):
+        os.mkdir(socket_directory, 0o700)
+    check_private_directory(socket_directory)
+
+def check_socket_owner(socket_name):
+    """ Raises an EnvironmentError if the socket file belongs to another
+        user, who could send back any class files.
+    """
+    if os.stat(socket_name).st_uid != os.getuid():
+        raise EnvironmentError('The socket {0} belongs to another user.'.format(socket_name))
+
+def decode_message_value(value):
+    """ Return the value with every byte string decoded as Latin-1. """
+    if isinstance(value, str):
+        return value.decode('latin-1')
+    if isinstance(value, dict):
+        return dict((decode_message_value(key), decode_message_value(item)) for key, item in value.iteritems())
+    if isinstance(value, (list, tuple)):
+        return [decode_message_value(item) for item in value]
+    return value
+
+def encode_message_value(value):
+    """ Return the value with every string encoded as Latin-1.  Raises
+        a ValueError if a string has a character that is not a byte.
+    """
+    if isinstance(value, unicode):
+        return value.encode('latin-1')
+    if isinstance(value, dict):
+        return dict((encode_message_value(key), encode_message_value(item)) for key, item in value.iteritems())
+    if isinstance(value, list):
+        return [encode_message_value(item) for item in value]
+    return value
+
+def write_message(output_file, message_dict):
+    """ Write a request or a response as a single line.  Raises a
+        TypeError if a value cannot be written as JSON.
+    """
+    output_file.write('{0}\n'.format(json.dumps(decode_message_value(message_dict), sort_keys=True)))
+    output_file.flush()
+
+def read_message(input_file):
+    """ Read a request or a response.  Return None at the end of the
+        input.  Raises a ValueError if the line is not a JSON object, or
+        if a string has a character that is not a byte.
+    """
+    line = input_file.readline()
+    if not line:
+        return None
+    message_dict = json.loads(line)
+    if not isinstance(message_dict, dict):
+        raise ValueError('A message must be a JSON object.')
+    return encode_message_value(message_dict)
+
+def create_error_response(error_text):
+    return {'status': ERROR_STATUS, 'error_text': error_text}
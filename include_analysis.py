@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The include cost analyzer estimates what each include statement in the
+  generated class definition files costs the build.  An include statement
+  in a class definition file is compiled once for every translation unit
+  that includes the class definition file, directly or through another
+  class definition file.  Each class implementation file is one
+  translation unit, which includes its own class definition file and the
+  class definition files of the project classes in its include list.
+
+  The fan-out score of an include name is the number of times the include
+  file is read by all of the translation units of the batch, which is the
+  sum of the translation unit counts of the class definition files that
+  include it.
+"""
+from collections import namedtuple
+from class_dependency_graph import ClassDependencyGraph
+
+ClassIncludes = namedtuple('ClassIncludes', ['class_name',
+                                             'definition_include_name_list',
+                                             'forward_declarable_name_list',
+                                             'dependency_list',
+                                             'implementation_dependency_list',
+                                             'has_implementation'])
+
+class IncludeCostAnalyzer:
+
+    def __init__(self):
+        self.class_includes_list = []
+        self.translation_unit_count_dict = None
+
+    def add_class(self, class_includes):
+        self.class_includes_list.append(class_includes)
+        self.translation_unit_count_dict = None
+
+    def get_class_includes_list(self):
+        return self.class_includes_list
+
+    def get_translation_unit_count(self, class_name):
+        """ Return the number of translation units of the batch that
+            include the class definition file of the class.
+        """
+        if self.translation_unit_count_dict is None:
+            self.translation_unit_count_dict = self._count_translation_units()
+        return self.translation_unit_count_dict.get(class_name, 0)
+
+    def _count_translation_units(self):
+        dependency_graph = ClassDependencyGraph()
+        for class_includes in self.class_includes_list:
+            dependency_graph.add_class(class_includes.class_name, class_includes.dependency_list)
+        translation_unit_count_dict = dict([(class_includes.class_name, 0) for class_includes in self.class_includes_list])
+        for class_includes in self.class_includes_list:
+            if not class_includes.has_implementation:
+                continue
+            # The class implementation file includes its own class definition
+            # file, the class definition files in its include list, and every
+            # class definition file that they include.
+            included_class_name_set = set([class_includes.class_name])
+            included_class_name_set.update(class_includes.implementation_dependency_list)
+            class_name_list = list(included_class_name_set)
+            while class_name_list:
+                class_name = class_name_list.pop()
+                for dependency_name in dependency_graph.get_dependency_list(class_name):
+                    if dependency_name not in included_class_name_set:
+                        included_class_name_set.add(dependency_name)
+                        class_name_list.append(dependency_name)
+            for class_name in included_class_name_set:
+                translation_unit_count_dict[class_name] += 1
+        return translation_unit_count_dict
+
+    def get_header_count_dict(self):
+        """ Return the number of class definition files that include each
+            include name.
+        """
+        header_count_dict = {}
+        for class_includes in self.class_includes_list:
+            for include_name in class_includes.definition_include_name_list:
+                header_count_dict[include_name] = header_count_dict.get(include_name, 0) + 1
+        return header_count_dict
+
+    def get_fan_out_score_dict(self):
+        """ Return the fan-out score of each include name. """
+        fan_out_score_dict = {}
+        for class_includes in self.class_includes_list:
+            translation_unit_count = self.get_translation_unit_count(class_includes.class_name)
+            for include_name in class_includes.definition_include_name_list:
+                fan_out_score_dict[include_name] = fan_out_score_dict.get(include_name, 0) + translation_unit_count
+        return fan_out_score_dict
+
+    def get_total_fan_out_score(self):
+        return sum(self.get_fan_out_score_dict().values())
+
+    def get_forward_declarable_fan_out_score(self):
+        """ Return the part of the total fan-out score that is for include
+            names that could be forward declarations.
+        """
+        fan_out_score = 0
+        for class_includes in self.class_includes_list:
+            fan_out_score += (self.get_translation_unit_count(class_includes.class_name)
+                              * len(class_includes.forward_declarable_name_list))
+        return fan_out_score
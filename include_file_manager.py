@@ -72,53 +72,218 @@
     boost::int64_t
     boost::uint64_t
 """
+import type_info
+from template_type import get_template_type
 
 class IncludeFileManager:
 
-    def __init__(self):
-        self.file_name_dict = {'std::cout' : '<iostream>',
-                               'std::cin' : '<iostream>',
-                               'std::ifstream' : '<fstream>',
-                               'std::ofstream' : '<fstream>',
-                               'std::string' : '<string>',
-                               'std::basic_string' : '<string>',
-                               'std::list' : '<list>',
-                               'std::vector' : '<vector>',
-                               'std::deque' : '<deque>',
-                               'std::set' : '<set>',
-                               'std::multiset' : '<multiset>',
-                               'std::map' : '<map>',
-                               'std::multimap' : '<multimap>',
-                               'std::queue' : '<queue>',
-                               'std::stack' : '<stack>',
-                               'std::exception' : '<exception>',
-                               'boost::shared_ptr' : '<boost/shared_ptr->hpp>',
-                               'boost::shared_array' : '<boost/shared_array.hpp>',
-                               'boost::intrusive_ptr' : '<boost/intrusive_ptr->hpp>',
-                               'boost::scoped_ptr' : '<boost/scoped_ptr->hpp>',
-                               'boost::weak_ptr' : '<boost/weak_ptr->hpp>',
-                               'boost::mutex' : '<boost/thread/mutex.hpp>',
-                               'boost::try_mutex' : '<boost/thread/mutex.hpp>',
-                               'boost::shared_mutex' : '<boost/thread/shared_mutex.hpp>',
-                               'boost::recursive_mutex' : '<boost/thread/recursive_mutex.hpp>',
-                               'boost::thread' : '<boost/thread/thread.hpp>',
-                               'boost::condition' : '<boost/thread/condition.hpp>',
-                               'boost::bimaps::bimap' : '<boost/bimap/bimap.hpp>',
-                               'boost::bimaps::set_of' : '<boost/bimap/set_of.hpp>',
-                               'boost::circular_buffer' : '<boost/circular_buffer.hpp>',
-                               'boost::date_time' : '<boost/date_time.hpp>',
-                               'boost::timer' : '<boost/timer.hpp>',
-                               'boost::int8_t' : '<boost/cstdint.hpp>',
-                               'boost::uint8_t' : '<boost/cstdint.hpp>',
-                               'boost::int16_t' : '<boost/cstdint.hpp>',
-                               'boost::uint16_t' : '<boost/cstdint.hpp>',
-                               'boost::int32_t' : '<boost/cstdint.hpp>',
-                               'boost::uint32_t' : '<boost/cstdint.hpp>',
-                               'boost::int64_t' : '<boost/cstdint.hpp>',
-                               'boost::uint64_t' : '<boost/cstdint.hpp>'}
+    # The table is built once, when the module is imported, and is
+    # shared by every IncludeFileManager instance.
+    file_name_dict = {'std::cout' : '<iostream>',
+                      'std::cin' : '<iostream>',
+                      'std::ifstream' : '<fstream>',
+                      'std::ofstream' : '<fstream>',
+                      'std::string' : '<string>',
+                      'std::basic_string' : '<string>',
+                      'std::list' : '<list>',
+                      'std::vector' : '<vector>',
+                      'std::deque' : '<deque>',
+                      'std::set' : '<set>',
+                      'std::multiset' : '<multiset>',
+                      'std::map' : '<map>',
+                      'std::multimap' : '<multimap>',
+                      'std::queue' : '<queue>',
+                      'std::stack' : '<stack>',
+                      'std::exception' : '<exception>',
+                      'boost::shared_ptr' : '<boost/shared_ptr->hpp>',
+                      'boost::shared_array' : '<boost/shared_array.hpp>',
+                      'boost::intrusive_ptr' : '<boost/intrusive_ptr->hpp>',
+                      'boost::scoped_ptr' : '<boost/scoped_ptr->hpp>',
+                      'boost::weak_ptr' : '<boost/weak_ptr->hpp>',
+                      'boost::mutex' : '<boost/thread/mutex.hpp>',
+                      'boost::try_mutex' : '<boost/thread/mutex.hpp>',
+                      'boost::shared_mutex' : '<boost/thread/shared_mutex.hpp>',
+                      'boost::recursive_mutex' : '<boost/thread/recursive_mutex.hpp>',
+                      'boost::thread' : '<boost/thread/thread.hpp>',
+                      'boost::condition' : '<boost/thread/condition.hpp>',
+                      'boost::bimaps::bimap' : '<boost/bimap/bimap.hpp>',
+                      'boost::bimaps::set_of' : '<boost/bimap/set_of.hpp>',
+                      'boost::circular_buffer' : '<boost/circular_buffer.hpp>',
+                      'boost::date_time' : '<boost/date_time.hpp>',
+                      'boost::timer' : '<boost/timer.hpp>',
+                      'boost::int8_t' : '<boost/cstdint.hpp>',
+                      'boost::uint8_t' : '<boost/cstdint.hpp>',
+                      'boost::int16_t' : '<boost/cstdint.hpp>',
+                      'boost::uint16_t' : '<boost/cstdint.hpp>',
+                      'boost::int32_t' : '<boost/cstdint.hpp>',
+                      'boost::uint32_t' : '<boost/cstdint.hpp>',
+                      'boost::int64_t' : '<boost/cstdint.hpp>',
+                      'boost::uint64_t' : '<boost/cstdint.hpp>'}
 
     def get_include_file_name(self, type_name):
         file_name = type_name
         if type_name in self.file_name_dict:
             file_name = self.file_name_dict[type_name]
         return file_name
+
+class IncludeDecisionCache:
+    """ A cache of the include names for each type name and type modifier.
+
+        The include names for a type only depend on the type name, the
+        type modifier, the intrinsic types, and the type registry, if
+        there is one, and the same types are
+        used in many classes, so the cache is shared by every parse in
+        the process.  The include names for a type are a tuple of
+        triples.  The first item of each triple is the include name, the
+        second item is True if the include name is needed in the class
+        definition file, or False if a forward declaration is enough in
+        the class definition file, and the third item is the type name
+        that the include name is for.  Types that do not need any include
+        name, such as intrinsic types, have an empty tuple.
+    """
+
+    # The type modifiers that only need a forward declaration of the type.
+    forward_declaration_type_modifier_set = frozenset(['&', '&*', '*', '**'])
+
+    def __init__(self):
+        self.file_name_manager = IncludeFileManager()
+        self.include_decision_dict = {}
+        self.intrinsic_type_set = type_info.intrinsic_type_set
+        self.type_registry = None
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def get_include_decision(self, type_name, type_modifier):
+        # The include names change if more intrinsic types are added.
+        if self.intrinsic_type_set is not type_info.intrinsic_type_set:
+            self.clear()
+        decision_key = (type_name, type_modifier)
+        include_decision = self.include_decision_dict.get(decision_key)
+        if include_decision is None:
+            self.miss_count += 1
+            include_decision = self._find_include_decision(type_name, type_modifier)
+            self.include_decision_dict[decision_key] = include_decision
+        else:
+            self.hit_count += 1
+        return include_decision
+
+    def _find_include_decision(self, type_name, type_modifier):
+        # The include names of a template type, such as "std::vector<ClassName>",
+        # are the include names of the template, "std::vector", and the include
+        # names of every template argument type, "ClassName".
+        type_name_list = []
+        is_definition_include_list = []
+        is_template_type = '<' in type_name
+        if is_template_type:
+            template_type = get_template_type(type_name)
+            self._add_template_type_names(type_name_list,
+                                          is_definition_include_list,
+                                          template_type,
+                                          type_modifier not in self.forward_declaration_type_modifier_set)
+        elif type_name:
+            type_name_list.append(type_name)
+            is_definition_include_list.append(type_modifier not in self.forward_declaration_type_modifier_set)
+        include_decision_list = []
+        for type_name, is_definition_include in zip(type_name_list, is_definition_include_list):
+            # If the string is not an intrinsic type then it is assumed
+            # to be a class name.
+            if type_info.is_intrinsic_type(type_name):
+                continue
+            # Only the names of template types, and the names in the type
+            # registry, are changed to include file names.
+            type_entry = None
+            if self.type_registry is not None:
+                type_entry = self.type_registry.find_type_entry(type_name)
+            if type_entry is not None:
+                if type_entry.is_intrinsic:
+                    continue
+                include_name = type_entry.include_name
+                if not type_entry.is_forward_declarable:
+                    is_definition_include = True
+            elif is_template_type:
+                include_name = self.file_name_manager.get_include_file_name(type_name)
+            else:
+                include_name = type_name
+            if is_definition_include or include_name[0] == '<':
+                include_decision_list.append((include_name, True, type_name))
+            else:
+                # A forward declaration uses the type name.
+                include_decision_list.append((type_name, False, type_name))
+        return tuple(include_decision_list)
+
+    def _add_template_type_names(self,
+                                 type_name_list,
+                                 is_definition_include_list,
+                                 template_type,
+                                 is_definition_include):
+        # A template argument that is a pointer or a reference only needs
+        # a forward declaration.  A template argument that is a number,
+        # such as the size of an array, is not a type.
+        type_name = template_type.type_name
+        if type_name and not type_name[0].isdigit():
+            # A type that is used more than once needs the definition if
+            # any use needs the definition.
+            if type_name in type_name_list:
+                type_index = type_name_list.index(type_name)
+                is_definition_include_list[type_index] = is_definition_include_list[type_index] or is_definition_include
+            else:
+                type_name_list.append(type_name)
+                is_definition_include_list.append(is_definition_include)
+        for argument_template_type in template_type.argument_list:
+            self._add_template_type_names(type_name_list,
+                                          is_definition_include_list,
+                                          argument_template_type,
+                                          (is_definition_include and
+                                           argument_template_type.type_modifier not in self.forward_declaration_type_modifier_set))
+
+    def get_forward_declaration_include_name(self, type_name):
+        """ Return the include name for a type that is forward declared in
+            the class definition file, which is included in the class
+            implementation file.
+        """
+        if self.type_registry is not None:
+            type_entry = self.type_registry.find_type_entry(type_name)
+            if type_entry is not None and type_entry.include_name:
+                return type_entry.include_name
+        return type_name
+
+    def is_forward_declarable(self, type_name):
+        """ Return False if the type registry says that the type cannot be
+            forward declared.
+        """
+        if self.type_registry is not None:
+            type_entry = self.type_registry.find_type_entry(type_name)
+            if type_entry is not None:
+                return type_entry.is_forward_declarable
+        return True
+
+    def set_type_registry(self, type_registry):
+        """ Use the type registry to find the include names of the types
+            in the registry.  Pass None to stop using a type registry.
+        """
+        if type_registry is not self.type_registry:
+            self.type_registry = type_registry
+            self.clear()
+
+    def get_type_registry(self):
+        return self.type_registry
+
+    def clear(self):
+        self.include_decision_dict = {}
+        self.intrinsic_type_set = type_info.intrinsic_type_set
+
+    def get_hit_count(self):
+        return self.hit_count
+
+    def get_miss_count(self):
+        return self.miss_count
+
+    def get_hit_rate(self):
+        """ Return the fraction of the lookups that were found in the cache. """
+        lookup_count = self.hit_count + self.miss_count
+        if lookup_count == 0:
+            return 0.0
+        return float(self.hit_count) / lookup_count
+
+# The include decision cache that is shared by every parse in this process.
+include_decision_cache = IncludeDecisionCache()
@@ -52,7 +52,8 @@ another reason it's important to know C++ if you use this program.
 
 Usage:
 
-    python make_cpp_class.py <class_name> <input_file_name> [-b base_class_name] [-a author_name] [-f] [-t] 
+    python make_cpp_class.py <class_name> <input_file_name> [-b base_class_name] [-a author_name] [-f] [-t] [-d date] [-c cache_file_name]
+                              [-i index_file_name] [-r registry_file] [-m] [-p] [--profile_file report_file_name]
 
     The program accepts the following switches:
 
@@ -60,6 +61,34 @@ Usage:
         -a author_name, --author author_name              - The author name.
         -f, --full                                        - Write full detailed header information.
         -t, --abstract                                    - Make all virtual methods be abstract methods.
+        -d date, --date date                              - The date written in the file headers, in the
+                                                            form YYYY-MM-DD.  If this switch is not used,
+                                                            the SOURCE_DATE_EPOCH environment variable is
+                                                            used if it is set, otherwise the current date
+                                                            and time are used.
+        -c cache_file_name, --cache cache_file_name       - Skip creating the class files if the input file
+                                                            and switches have not changed since the class
+                                                            files were created.  The cache is saved in the
+                                                            named file.
+        -i index_file_name, --index index_file_name       - Save the parsed declarations of the input file
+                                                            in the named index file.  When the input file
+                                                            is changed, only the declarations that changed
+                                                            are parsed again.
+        -r registry_file, --registry registry_file        - Use the type registry file to find the include
+                                                            file of each type.  If this switch is not used,
+                                                            the MAKE_CPP_CLASS_TYPE_REGISTRY environment
+                                                            variable is used if it is set.  See the
+                                                            type_registry.py file for the file format.
+        -m, --minimal                                     - Forward declare every class that the class
+                                                            definition does not need by value, and only
+                                                            include it in the class implementation file.
+        -p, --profile                                     - Print a JSON report with the time of each
+                                                            phase of creating the class files, and the
+                                                            number of characters, tokens, data members,
+                                                            functions, include statements, and bytes
+                                                            that were processed.
+        --profile_file report_file_name                   - Write the JSON profile report to the named
+                                                            file instead of printing it.
         -h, --help                                        - Show help and exit
 
     The Input File format
@@ -83,6 +112,14 @@ int m_count = 7;
 Foo_t * m_foo;
 static const float m_height = 1.0;
 
+The type can be a template type, and the template arguments can also be
+template types, pointers, or references, for example:
+
+std::map<std::string, std::vector<Foo_t *> > m_foo_map;
+
+Include statements or forward declarations are written for the template
+and for every template argument type.
+
 If an initial value is supplied for a data member, then everything between
 the equal sign and the terminating semicolon is used as the initial value
 in the generated code.
@@ -252,6 +289,17 @@ won't be a valid header file name, and therefore it will often be necessary
 to either delete the include-statement or change the name of the header
 file in the include statement.
 
+A project can list the include file for each type in a type registry file,
+which is passed with the -r switch.  The registry can also name intrinsic
+types and types that cannot be forward declared.
+
+Intrinsic types never generate an include statement.  If a project uses
+typedefs for intrinsic types, then the typedef names can be added to the
+intrinsic types by setting the MAKE_CPP_CLASS_INTRINSIC_TYPES environment
+variable to a comma separated list of type names, for example:
+
+    MAKE_CPP_CLASS_INTRINSIC_TYPES="real_t, index_t"
+
 Also, any data types in the body of the code are not detected, and it might
 be necessary to include header files in the generated code for these types.
 
@@ -268,17 +316,15 @@ inline void dummy()
 }
 """
 import sys
-import os
 from bclass import create_cpp_class_files
+from class_options import add_class_option_arguments, create_folder_under_current_directory
+from generation_profile import GenerationProfile, null_profile
+from output_cache import OutputCache
+from parse_index import ParseIndex
+from type_registry import get_configured_type_registry_file_name, use_type_registry
+from output_file_writer import OutputFileWriter
 from argparse import ArgumentParser
 
-def create_folder_under_current_directory(folder_name):
-    current_path = os.getcwd()
-    new_path = os.path.join(current_path, folder_name)
-    if not os.path.exists(folder_name):
-        os.makedirs(folder_name)
-    return new_path
-
 # Start of main program.
 def main(argv=None):
     # Initialize the command line parser.
@@ -289,10 +335,13 @@ def main(argv=None):
                             usage=__doc__)
     parser.add_argument(action='store', dest='class_name', help='The class name.')
     parser.add_argument(action='store', dest='input_file_name', help='The input file name.')
-    parser.add_argument('-b', '--base_class', action='store', dest='base_class', default='', help='Inherit from the named base class.')
-    parser.add_argument('-a', '--author', action='store', dest='author', default='', help='The author name.')
-    parser.add_argument('-f', '--full', action='store_true', dest='full_header', default=False, help='Write full detailed header information.')
-    parser.add_argument('-t', '--abstract', action='store_true', dest='abstract_class', default=False, help='Create only abstract class header file.')
+    add_class_option_arguments(parser)
+    parser.add_argument('-c', '--cache', action='store', dest='cache_file_name', default='', help='The output cache file name.')
+    parser.add_argument('-i', '--index', action='store', dest='index_file_name', default='', help='The parse index file name.')
+    parser.add_argument('-r', '--registry', action='store', dest='registry_file_name', default=get_configured_type_registry_file_name(), help='The type registry file name.')
+    parser.add_argument('-m', '--minimal', action='store_true', dest='minimal_includes', default=False, help='Forward declare every class that is not needed by value.')
+    parser.add_argument('-p', '--profile', action='store_true', dest='profile', default=False, help='Print a JSON profile report.')
+    parser.add_argument('--profile_file', action='store', dest='profile_file_name', default='', help='The JSON profile report file name.')
     # Parse the command line.
     arguments = parser.parse_args(args=argv)
     class_name = arguments.class_name
@@ -301,27 +350,81 @@ def main(argv=None):
     author = arguments.author
     full_header = arguments.full_header
     abstract_class = arguments.abstract_class
+    date_time = arguments.date_time
+    profile = null_profile
+    if arguments.profile or arguments.profile_file_name:
+        profile = GenerationProfile()
     status = 0
-    # Fully qualify the input file name by adding the current path.
-    current_path = os.getcwd()
-    input_file_name = os.path.join(current_path, input_file_name)
-    # Create a 'class_name' folder.
+    # Create a 'class_name' folder.  The class files are written into
+    # the new folder without changing the current working directory.
     new_path = create_folder_under_current_directory(class_name)
-    # Change the current working directory to the new folder.
-    os.chdir(new_path)
     try:
-       create_cpp_class_files(input_file_name,
-                              class_name,
-                              base_class,
-                              author,
-                              full_header,
-                              abstract_class)
+        output_cache = None
+        cache_key = ''
+        is_up_to_date = False
+        if arguments.registry_file_name:
+            with profile.time_phase('registry_load'):
+                use_type_registry(arguments.registry_file_name)
+        if arguments.cache_file_name:
+            with profile.time_phase('cache_check'):
+                output_cache = OutputCache(arguments.cache_file_name)
+                cache_key = output_cache.get_key(input_file_name,
+                                                 class_name,
+                                                 base_class,
+                                                 author,
+                                                 full_header,
+                                                 abstract_class,
+                                                 new_path,
+                                                 date_time,
+                                                 None,
+                                                 arguments.minimal_includes)
+                is_up_to_date = output_cache.is_current(cache_key)
+        # Skip creating the class files if they are up to date.
+        if is_up_to_date:
+            print 'The class files for class {0} are up to date.'.format(class_name)
+        else:
+            parse_index = None
+            if arguments.index_file_name:
+                with profile.time_phase('index_load'):
+                    parse_index = ParseIndex(arguments.index_file_name)
+            output_file_writer = OutputFileWriter()
+            output_file_name_list = create_cpp_class_files(input_file_name,
+                                                           class_name,
+                                                           base_class,
+                                                           author,
+                                                           full_header,
+                                                           abstract_class,
+                                                           new_path,
+                                                           output_file_writer,
+                                                           date_time,
+                                                           profile,
+                                                           parse_index,
+                                                           None,
+                                                           arguments.minimal_includes)
+            print 'Wrote {0} class files, {1} class files unchanged.'.format(output_file_writer.get_written_file_count(),
+                                                                            output_file_writer.get_unchanged_file_count())
+            if parse_index:
+                with profile.time_phase('index_save'):
+                    parse_index.save()
+            if output_cache:
+                with profile.time_phase('cache_save'):
+                    output_cache.update(cache_key, output_file_name_list)
+                    output_cache.save()
     except ValueError as value_error:
         print value_error
         status = -1
     except EnvironmentError as environment_error:
         print environment_error
         status = -1
+    if arguments.profile_file_name:
+        try:
+            with open(arguments.profile_file_name, 'w') as report_file:
+                report_file.write('{0}\n'.format(profile.get_json_report()))
+        except EnvironmentError as environment_error:
+            print environment_error
+            status = -1
+    elif arguments.profile:
+        print profile.get_json_report()
     return status
 
 if __name__ == "__main__":
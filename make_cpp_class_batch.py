@@ -0,0 +1,905 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+This program creates the C++ class files for many classes in a single
+process.  Each class is written into a folder that has the class name,
+the same as make_cpp_class.py does, but the current working directory
+is never changed.
+
+Usage:
+
+    python make_cpp_class_batch.py [manifest_file_name] [-g glob_pattern] [-o output_directory]
+                                   [-c cache_file_name] [-j job_count] [-w] [--interval seconds]
+                                   [-r registry_file] [--order order_file] [-m] [--analyze]
+                                   [-u unity_file_count] [--pch class_count] [--use_pch]
+                                   [-b base_class_name] [-a author_name] [-f] [-t] [-d date]
+
+    The program accepts the following switches:
+
+        -g glob_pattern, --glob glob_pattern              - Create a class for every input file that
+                                                            matches the pattern.  The class name is the
+                                                            input file name without the extension.
+                                                            This switch can be used more than once.
+        -o output_directory, --output output_directory    - The folder where the class folders are
+                                                            created.  The default is the current folder.
+        -c cache_file_name, --cache cache_file_name       - Skip the classes whose input file and switches
+                                                            have not changed since the class files were
+                                                            created.  The cache is saved in the named file.
+        -j job_count, --jobs job_count                    - The number of processes that create classes
+                                                            in parallel.  Zero uses one process for each
+                                                            CPU.  The default is 1.
+        -w, --watch                                       - After creating the classes, keep watching the
+                                                            input files and the manifest file, and create
+                                                            the classes again when they change.  The classes
+                                                            are created in this process, and the parsed
+                                                            declarations of each input file are kept in
+                                                            memory, so only the changed declarations are
+                                                            parsed again.  Press Ctrl+C to stop watching.
+        --interval seconds                                - The time between checks for changed files when
+                                                            watching.  A changed input file is used once it
+                                                            has not changed for this time.  The default is
+                                                            0.5 seconds.
+        -r registry_file, --registry registry_file        - Use the type registry file to find the include
+                                                            file of each type.  The registry is loaded once
+                                                            for all of the classes.  If this switch is not
+                                                            used, the MAKE_CPP_CLASS_TYPE_REGISTRY
+                                                            environment variable is used if it is set.
+        --order order_file                                - Write the class names to the named file, one
+                                                            on each line, in an order where each class
+                                                            comes after the classes whose class definition
+                                                            files it includes.
+        -m, --minimal                                     - Forward declare every class that a class
+                                                            definition does not need by value, instead of
+                                                            only the classes in the batch.
+        --analyze                                         - Print the include cost of each class definition
+                                                            file without writing any files.  See below.
+        -u unity_file_count, --unity unity_file_count     - Also write the number of unity build files
+                                                            to the output folder.  See below.
+        --pch class_count                                 - Write a precompiled header named generated_pch.h
+                                                            to the output folder, which includes every
+                                                            system header that at least the number of
+                                                            class definition files include.
+        --use_pch                                         - Include generated_pch.h first in every class
+                                                            implementation file, and in every unity file.
+                                                            This switch is only used with the --pch switch.
+        -b base_class_name, --base_class base_class_name  - Inherit from the named base class.
+        -a author_name, --author author_name              - The author name.
+        -f, --full                                        - Write full detailed header information.
+        -t, --abstract                                    - Make all virtual methods be abstract methods.
+        -d date, --date date                              - The date written in the file headers, in the
+                                                            form YYYY-MM-DD.  If this switch is not used,
+                                                            the SOURCE_DATE_EPOCH environment variable is
+                                                            used if it is set, otherwise the current date
+                                                            and time are used.
+        -h, --help                                        - Show help and exit
+
+    The -b, -a, -f, -t, and -d switches only apply to the classes found with
+    the -g switch.  The -j switch is not used with the -w switch.
+
+    The classes in the batch are project classes.  A class definition file
+    only includes the class definition file of another project class if a
+    data member, the base class, or an inline method uses the class by value.
+    Otherwise the project class is forward declared, and the class
+    implementation file includes it.  The program prints every include cycle
+    between the class definition files, because the classes in an include
+    cycle cannot be compiled.
+
+    The --analyze switch prints, for each class, the number of includes in
+    the class definition file, the includes that could be forward
+    declarations, and the number of translation units that include the class
+    definition file.  Each class implementation file in the batch is a
+    translation unit.  Then, for each include, the program prints the number
+    of class definition files that include it and the fan-out score, which is
+    the number of times all of the translation units read the include file.
+    The -m switch forward declares all of the includes that could be forward
+    declarations.
+
+    The -u switch writes unity build files named unity_0.cpp, unity_1.cpp,
+    and so on, that each include some of the class implementation files.
+    Compile the unity files instead of the class implementation files, so
+    the headers that the classes share are parsed once for each unity file
+    instead of once for each class.  The classes are divided so that the
+    unity files have about the same size, which is estimated from the
+    method bodies of the classes.  A unity file is only written if its text
+    changed, and unity files that are left from a larger unity file count
+    are removed.  The classes in a unity file must not define the same
+    static functions, and must not have 'using' statements that change the
+    meaning of the code of another class.
+
+    The --pch switch counts the bracketed include names, such as <vector>,
+    in the class definition files of all of the classes, and writes the
+    most common ones to generated_pch.h.  With the --use_pch switch, the
+    output folder must be in the include path of the build, and the build
+    must precompile generated_pch.h.  The class definition files still
+    include their own system headers, so they can be used without the
+    precompiled header.  With both the -u switch and the --use_pch switch,
+    each unity file includes generated_pch.h once, before the class
+    implementation files, because a precompiled header is only used when
+    it is the first include of the translation unit.
+
+    The Manifest File format
+
+Each line of the manifest file has the same arguments that are passed to
+make_cpp_class.py for a single class.
+
+    <class_name> <input_file_name> [-b base_class_name] [-a author_name] [-f] [-t] [-d date]
+
+Blank lines and lines that start with the '#' character are ignored.  An
+input file name that is not an absolute path is relative to the folder
+that contains the manifest file.  Here is an example manifest file.
+
+    # Generated model classes.
+    Person person.txt -a "Jane Doe" -f
+    Employee employee.txt -b Person -a "Jane Doe" -f
+    Shape shapes/shape.txt -t
+"""
+import sys
+import os
+import glob
+import shlex
+import time
+import multiprocessing
+from collections import namedtuple
+from argparse import ArgumentParser, Namespace
+from bclass import create_cpp_class, open_file_buffer
+from class_generator import generate_cpp_class_from_file_buffer, ERROR_SEVERITY
+from class_options import add_class_option_arguments, create_folder
+from output_cache import OutputCache
+from output_file_writer import OutputFileWriter, write_file_atomically
+from class_dependency_graph import ClassDependencyGraph
+from include_analysis import ClassIncludes, IncludeCostAnalyzer
+from parse_index import ParseIndex
+from spec_watcher import SpecWatcher
+from unity_build import UnitySource, write_unity_files
+from precompiled_header import (precompiled_header_file_name, count_system_include_names,
+                                find_common_include_names, render_precompiled_header)
+from type_registry import get_configured_type_registry_file_name, get_type_registry_file_name, use_type_registry
+
+class ManifestArgumentParser(ArgumentParser):
+    """ An argument parser for a manifest file line.  Errors raise a
+        ValueError instead of exiting the program.
+    """
+
+    def error(self, message):
+        raise ValueError(message)
+
+def create_manifest_line_parser():
+    parser = ManifestArgumentParser(add_help=False)
+    parser.add_argument(action='store', dest='class_name')
+    parser.add_argument(action='store', dest='input_file_name')
+    add_class_option_arguments(parser)
+    return parser
+
+def read_manifest(manifest_file_name):
+    """ Return a list of class arguments, one for each class in the manifest file. """
+    manifest_directory = os.path.dirname(os.path.abspath(manifest_file_name))
+    manifest_line_parser = create_manifest_line_parser()
+    class_arguments_list = []
+    with open(manifest_file_name, 'r') as manifest_file:
+        for line_number, line in enumerate(manifest_file, 1):
+            line = line.strip()
+            # Skip blank lines and comment lines.
+            if not line or line.startswith('#'):
+                continue
+            try:
+                class_arguments = manifest_line_parser.parse_args(shlex.split(line))
+            except ValueError as value_error:
+                raise ValueError('{0}\nError in manifest file {1} at line {2}.'.format(value_error,
+                                                                                     manifest_file_name,
+                                                                                     line_number))
+            class_arguments.input_file_name = os.path.join(manifest_directory, class_arguments.input_file_name)
+            class_arguments_list.append(class_arguments)
+    return class_arguments_list
+
+def find_class_arguments(glob_pattern_list, option_arguments):
+    """ Return a list of class arguments, one for each input file that
+        matches a glob pattern.  The class name is the input file name
+        without the extension.
+    """
+    class_arguments_list = []
+    for glob_pattern in glob_pattern_list:
+        for input_file_name in sorted(glob.glob(glob_pattern)):
+            class_name = os.path.splitext(os.path.basename(input_file_name))[0]
+            class_arguments = Namespace(class_name=class_name,
+                                        input_file_name=os.path.abspath(input_file_name),
+                                        base_class=option_arguments.base_class,
+                                        author=option_arguments.author,
+                                        full_header=option_arguments.full_header,
+                                        abstract_class=option_arguments.abstract_class,
+                                        date_time=option_arguments.date_time)
+            class_arguments_list.append(class_arguments)
+    return class_arguments_list
+
+# The status of each class in the summary.
+CREATED_STATUS = 'ok'
+CACHED_STATUS = 'cached'
+FAILED_STATUS = 'FAILED'
+
+ClassResult = namedtuple('ClassResult', ['class_name',
+                                         'status',
+                                         'elapsed_time',
+                                         'error_text',
+                                         'written_file_count',
+                                         'unchanged_file_count',
+                                         'dependency_list',
+                                         'implementation_size',
+                                         'system_include_name_list',
+                                         'message_list'])
+
+def get_class_directory(class_arguments, output_directory):
+    return os.path.join(output_directory, class_arguments.class_name)
+
+def get_project_class_name_set(class_arguments_list):
+    """ Return the names of the classes in the batch. """
+    return frozenset([class_arguments.class_name for class_arguments in class_arguments_list])
+
+def get_project_include_name_list(include_name_list, project_class_name_set):
+    """ Return the include names that are project class names. """
+    if not project_class_name_set:
+        return []
+    return [include_name for include_name in include_name_list if include_name in project_class_name_set]
+
+def get_cache_key(output_cache,
+                  class_arguments,
+                  output_directory,
+                  project_class_name_set=None,
+                  minimal_includes=False,
+                  precompiled_header_name=''):
+    return output_cache.get_key(class_arguments.input_file_name,
+                                class_arguments.class_name,
+                                class_arguments.base_class,
+                                class_arguments.author,
+                                class_arguments.full_header,
+                                class_arguments.abstract_class,
+                                get_class_directory(class_arguments, output_directory),
+                                class_arguments.date_time,
+                                project_class_name_set,
+                                minimal_includes,
+                                precompiled_header_name)
+
+def find_all_class_arguments(arguments):
+    """ Return a list of class arguments for the classes in the manifest
+        file and the classes found with the glob patterns.
+    """
+    class_arguments_list = []
+    if arguments.manifest_file_name:
+        class_arguments_list.extend(read_manifest(arguments.manifest_file_name))
+    class_arguments_list.extend(find_class_arguments(arguments.glob_pattern_list, arguments))
+    return class_arguments_list
+
+def get_class_key(class_arguments):
+    return (class_arguments.class_name, class_arguments.input_file_name)
+
+def get_parse_index(parse_index_dict, class_arguments):
+    """ Return the parse index for a class, which is kept in memory. """
+    class_key = get_class_key(class_arguments)
+    parse_index = parse_index_dict.get(class_key)
+    if parse_index is None:
+        parse_index = ParseIndex()
+        parse_index_dict[class_key] = parse_index
+    return parse_index
+
+def generate_class(class_arguments,
+                   output_directory,
+                   parse_index=None,
+                   project_class_name_set=None,
+                   minimal_includes=False,
+                   precompiled_header_name=''):
+    """ Create the class files for one class in a folder that has the class
+        name.  Return the elapsed time, the error text, the output file
+        writer that wrote the class files, the list of the project classes
+        that the class definition file includes, the estimated size of the
+        class implementation file, which is zero if there is no class
+        implementation file, the bracketed include names of the class
+        definition file, and the messages about the class files, which are
+        returned instead of printed so that the classes that are created in
+        parallel do not mix their output.  The error text is
+        the empty string if the class files were created.  If a parse index
+        is passed, then only the changed declarations of the input file are
+        parsed.  If a set of project class names is passed, then project
+        classes that the class definition does not need by value are
+        forward declared, and if minimal includes is True, then every class
+        that the class definition does not need by value is forward declared.
+        If a precompiled header name is passed, then the class implementation
+        file includes it first.
+    """
+    start_time = time.time()
+    error_text = ''
+    output_file_writer = OutputFileWriter()
+    dependency_list = []
+    implementation_size = 0
+    system_include_name_list = []
+    message_list = []
+    try:
+        class_directory = create_folder(output_directory, class_arguments.class_name)
+        generated_class = create_cpp_class(class_arguments.input_file_name,
+                                           class_arguments.class_name,
+                                           class_arguments.base_class,
+                                           class_arguments.author,
+                                           class_arguments.full_header,
+                                           class_arguments.abstract_class,
+                                           class_directory,
+                                           output_file_writer,
+                                           class_arguments.date_time,
+                                           None,
+                                           parse_index,
+                                           project_class_name_set,
+                                           minimal_includes,
+                                           precompiled_header_name,
+                                           message_list).generated_class
+        definition_include_name_list = generated_class.get_definition_include_name_list()
+        dependency_list = get_project_include_name_list(definition_include_name_list, project_class_name_set)
+        implementation_size = generated_class.get_implementation_size()
+        system_include_name_list = [include_name for include_name in definition_include_name_list
+                                    if include_name[0] == '<']
+    except ValueError as value_error:
+        error_text = str(value_error)
+    except EnvironmentError as environment_error:
+        error_text = str(environment_error)
+    except Exception as error:
+        # Any other error is reported for this class so that
+        # the other classes in the batch are still created.
+        error_text = '{0}: {1}'.format(type(error).__name__, error)
+    return (time.time() - start_time,
+            error_text,
+            output_file_writer,
+            dependency_list,
+            implementation_size,
+            system_include_name_list,
+            message_list)
+
+# The project class names, the include mode and the precompiled header
+# name for the jobs that run in this process.  These are set once for
+# each process instead of being passed with every job.
+_job_project_class_name_set = frozenset()
+_job_minimal_includes = False
+_job_precompiled_header_name = ''
+
+def _initialize_job_process(registry_file_name, project_class_name_set, minimal_includes, precompiled_header_name):
+    global _job_project_class_name_set, _job_minimal_includes, _job_precompiled_header_name
+    # Each process uses the same type registry as the main process.
+    use_type_registry(registry_file_name)
+    _job_project_class_name_set = project_class_name_set
+    _job_minimal_includes = minimal_includes
+    _job_precompiled_header_name = precompiled_header_name
+
+def _generate_class_job(job):
+    # A process pool passes a single argument to the worker function.
+    class_arguments, output_directory = job
+    return generate_class(class_arguments,
+                          output_directory,
+                          None,
+                          _job_project_class_name_set,
+                          _job_minimal_includes,
+                          _job_precompiled_header_name)
+
+def generate_classes(class_arguments_list,
+                     output_directory,
+                     job_count=1,
+                     output_cache=None,
+                     parse_index_dict=None,
+                     project_class_name_set=None,
+                     minimal_includes=False,
+                     precompiled_header_name=''):
+    """ Create the class files for every class.  If the job count is
+        more than one, then the classes are created by a pool of processes.
+        If there is an output cache, then classes whose class files are up
+        to date are skipped.  If a parse index dictionary is passed, then
+        the classes are created in this process, and the parse index of
+        each class is kept in the dictionary.  The project classes are the
+        classes in the class arguments list, unless a set of project class
+        names is passed.  If minimal includes is True, then every class that
+        a class definition does not need by value is forward declared.  If a
+        precompiled header name is passed, then every class implementation
+        file includes it first.  Return a list of ClassResult tuples in the same order as the class
+        arguments.
+    """
+    if project_class_name_set is None:
+        project_class_name_set = get_project_class_name_set(class_arguments_list)
+    # Find the classes that have to be created.
+    result_list = [None] * len(class_arguments_list)
+    cache_key_list = [''] * len(class_arguments_list)
+    job_index_list = []
+    for index, class_arguments in enumerate(class_arguments_list):
+        if output_cache:
+            start_time = time.time()
+            try:
+                cache_key_list[index] = get_cache_key(output_cache,
+                                                      class_arguments,
+                                                      output_directory,
+                                                      project_class_name_set,
+                                                      minimal_includes,
+                                                      precompiled_header_name)
+            except EnvironmentError:
+                # Creating the class will report the error.
+                pass
+            if (cache_key_list[index] and output_cache.is_current(cache_key_list[index])
+                and output_cache.get_dependency_list(cache_key_list[index]) is not None
+                and output_cache.get_implementation_size(cache_key_list[index]) is not None
+                and output_cache.get_system_include_name_list(cache_key_list[index]) is not None):
+                result_list[index] = ClassResult(class_arguments.class_name,
+                                                 CACHED_STATUS,
+                                                 time.time() - start_time,
+                                                 '',
+                                                 0,
+                                                 0,
+                                                 output_cache.get_dependency_list(cache_key_list[index]),
+                                                 output_cache.get_implementation_size(cache_key_list[index]),
+                                                 output_cache.get_system_include_name_list(cache_key_list[index]),
+                                                 [])
+                continue
+        job_index_list.append(index)
+    job_list = [(class_arguments_list[index], output_directory) for index in job_index_list]
+    if job_count < 1:
+        job_count = multiprocessing.cpu_count()
+    job_count = min(job_count, len(job_list))
+    if parse_index_dict is not None:
+        job_result_list = [generate_class(class_arguments,
+                                          output_directory,
+                                          get_parse_index(parse_index_dict, class_arguments),
+                                          project_class_name_set,
+                                          minimal_includes,
+                                          precompiled_header_name)
+                           for class_arguments, output_directory in job_list]
+    elif job_count > 1:
+        pool = multiprocessing.Pool(job_count,
+                                    _initialize_job_process,
+                                    (get_type_registry_file_name(),
+                                     project_class_name_set,
+                                     minimal_includes,
+                                     precompiled_header_name))
+        try:
+            # Pool.map returns the results in the same order as the jobs.
+            job_result_list = pool.map(_generate_class_job, job_list, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        job_result_list = [generate_class(class_arguments,
+                                          output_directory,
+                                          None,
+                                          project_class_name_set,
+                                          minimal_includes,
+                                          precompiled_header_name)
+                           for class_arguments, output_directory in job_list]
+    for index, job_result in zip(job_index_list, job_result_list):
+        (elapsed_time, error_text, output_file_writer,
+         dependency_list, implementation_size, system_include_name_list, message_list) = job_result
+        status = CREATED_STATUS
+        if error_text:
+            status = FAILED_STATUS
+        elif output_cache and cache_key_list[index]:
+            output_cache.update(cache_key_list[index],
+                                output_file_writer.get_file_name_list(),
+                                dependency_list,
+                                implementation_size,
+                                system_include_name_list)
+        result_list[index] = ClassResult(class_arguments_list[index].class_name,
+                                         status,
+                                         elapsed_time,
+                                         error_text,
+                                         output_file_writer.get_written_file_count(),
+                                         output_file_writer.get_unchanged_file_count(),
+                                         dependency_list,
+                                         implementation_size,
+                                         system_include_name_list,
+                                         message_list)
+    # Print the messages of the classes in the order of the classes.
+    for result in result_list:
+        for message_text in result.message_list:
+            print message_text
+    if output_cache:
+        output_cache.save()
+    return result_list
+
+def print_summary(result_list, total_time):
+    """ Print the time for each class and the total time.  Return the
+        number of classes that failed.
+    """
+    print
+    print '{0:<40} {1:>12}  {2}'.format('Class', 'Time (ms)', 'Status')
+    for result in result_list:
+        print '{0:<40} {1:>12.1f}  {2}'.format(result.class_name, result.elapsed_time * 1000.0, result.status)
+    error_count = 0
+    cached_count = 0
+    written_file_count = 0
+    unchanged_file_count = 0
+    for result in result_list:
+        written_file_count += result.written_file_count
+        unchanged_file_count += result.unchanged_file_count
+        if result.status == CACHED_STATUS:
+            cached_count += 1
+        elif result.status == FAILED_STATUS:
+            error_count += 1
+            print
+            print 'Class {0}:'.format(result.class_name)
+            print result.error_text
+    print
+    print 'Created {0} of {1} classes ({2} up to date) in {3:.1f} ms.'.format(len(result_list) - error_count - cached_count,
+                                                                             len(result_list),
+                                                                             cached_count,
+                                                                             total_time * 1000.0)
+    print 'Wrote {0} class files, {1} class files unchanged.'.format(written_file_count, unchanged_file_count)
+    return error_count
+
+def create_dependency_graph(class_name_list, dependency_list_dict):
+    """ Return the dependency graph of the classes, where the dependency
+        dictionary has the project classes that each class definition file
+        includes.
+    """
+    dependency_graph = ClassDependencyGraph()
+    for class_name in class_name_list:
+        dependency_graph.add_class(class_name, dependency_list_dict.get(class_name) or [])
+    return dependency_graph
+
+def print_include_cycles(dependency_graph):
+    """ Print the include cycles of the class definition files.  Return
+        the number of include cycles.
+    """
+    cycle_list = dependency_graph.find_cycles()
+    for cycle in cycle_list:
+        print
+        print 'Include cycle: {0}'.format(' -> '.join(['{0}.h'.format(class_name) for class_name in cycle]))
+        print 'Each class uses the next class by value in a data member, the base class, or an inline'
+        print 'method.  Change one of these uses to a pointer or a reference to break the cycle.'
+    return len(cycle_list)
+
+def write_order_file(order_file_name, dependency_graph):
+    """ Write the class names, one on each line, in an order where each
+        class comes after the classes whose class definition files it
+        includes.
+    """
+    write_file_atomically(order_file_name,
+                          ''.join(['{0}\n'.format(class_name) for class_name in dependency_graph.get_topological_order()]))
+
+def write_unity_build(class_arguments_list,
+                      implementation_size_dict,
+                      output_directory,
+                      unity_file_count,
+                      precompiled_header_name=''):
+    """ Write the unity files that include the class implementation files
+        of the classes, where the implementation size dictionary has the
+        estimated size of the class implementation file of each class.  A
+        class that has no class implementation file, or that failed, is not
+        in any unity file.  Each unity file includes the precompiled header
+        first, if a precompiled header name is passed.
+    """
+    unity_source_list = []
+    for class_arguments in class_arguments_list:
+        implementation_size = implementation_size_dict.get(class_arguments.class_name)
+        if implementation_size:
+            implementation_file_name = os.path.join(get_class_directory(class_arguments, output_directory),
+                                                    '{0}.cpp'.format(class_arguments.class_name))
+            unity_source_list.append(UnitySource(class_arguments.class_name,
+                                                 implementation_file_name,
+                                                 implementation_size))
+    output_file_writer = OutputFileWriter()
+    write_unity_files(unity_source_list, unity_file_count, output_directory, output_file_writer, precompiled_header_name)
+    print 'Wrote {0} unity files for {1} classes, {2} unity files unchanged.'.format(output_file_writer.get_written_file_count(),
+                                                                                   len(unity_source_list),
+                                                                                   output_file_writer.get_unchanged_file_count())
+
+def get_precompiled_header_name(arguments):
+    """ Return the precompiled header name that the class implementation
+        files include, or the empty string if they do not include it.
+    """
+    if arguments.use_pch:
+        return precompiled_header_file_name
+    return ''
+
+def write_precompiled_header(class_arguments_list, system_include_dict, output_directory, minimum_class_count):
+    """ Write the precompiled header with the system include names that at
+        least the minimum class count of the classes include, where the
+        system include dictionary has the system include names of the class
+        definition file of each class.
+    """
+    class_count_dict = count_system_include_names([system_include_dict.get(class_arguments.class_name) or []
+                                                   for class_arguments in class_arguments_list])
+    include_name_list = find_common_include_names(class_count_dict, minimum_class_count)
+    output_file_writer = OutputFileWriter()
+    precompiled_header_path = os.path.join(output_directory, precompiled_header_file_name)
+    if output_file_writer.write_chunks(precompiled_header_path, list(render_precompiled_header(include_name_list))):
+        print 'Created precompiled header file {0} with {1} of {2} system headers.'.format(precompiled_header_file_name,
+                                                                                          len(include_name_list),
+                                                                                          len(class_count_dict))
+    else:
+        print 'Precompiled header file {0} is unchanged.'.format(precompiled_header_file_name)
+
+def write_build_files(arguments,
+                      class_arguments_list,
+                      output_directory,
+                      dependency_graph,
+                      implementation_size_dict,
+                      system_include_dict):
+    """ Write the order file, the unity files and the precompiled header
+        that the switches ask for.  An error writing one of the files is
+        printed, and the other files are still written.  Return the number
+        of files that could not be written.
+    """
+    error_count = 0
+    if arguments.order_file_name:
+        try:
+            write_order_file(arguments.order_file_name, dependency_graph)
+        except EnvironmentError as environment_error:
+            print environment_error
+            error_count += 1
+    if arguments.unity_file_count > 0:
+        try:
+            write_unity_build(class_arguments_list,
+                              implementation_size_dict,
+                              output_directory,
+                              arguments.unity_file_count,
+                              get_precompiled_header_name(arguments))
+        except EnvironmentError as environment_error:
+            print environment_error
+            error_count += 1
+    if arguments.pch_class_count > 0:
+        try:
+            write_precompiled_header(class_arguments_list, system_include_dict, output_directory, arguments.pch_class_count)
+        except EnvironmentError as environment_error:
+            print environment_error
+            error_count += 1
+    return error_count
+
+def analyze_class(class_arguments, project_class_name_set, minimal_includes=False):
+    """ Create a class in memory and return a ClassIncludes tuple for
+        the class.  Raises a ValueError if the input file has an error.
+    """
+    with open(class_arguments.input_file_name, 'r') as input_file:
+        file_buffer = open_file_buffer(input_file)
+    try:
+        generated_class = generate_cpp_class_from_file_buffer(file_buffer,
+                                                              class_arguments.class_name,
+                                                              class_arguments.base_class,
+                                                              class_arguments.author,
+                                                              class_arguments.full_header,
+                                                              class_arguments.abstract_class,
+                                                              class_arguments.date_time,
+                                                              None,
+                                                              None,
+                                                              project_class_name_set,
+                                                              minimal_includes)
+    finally:
+        file_buffer.close()
+    for diagnostic in generated_class.get_diagnostic_list():
+        if diagnostic.severity == ERROR_SEVERITY:
+            raise ValueError('{0}\nError parsing input file at line {1}.'.format(diagnostic.message, diagnostic.line_number))
+    definition_include_name_list = generated_class.get_definition_include_name_list()
+    return ClassIncludes(class_arguments.class_name,
+                         definition_include_name_list,
+                         generated_class.get_forward_declarable_include_name_list(),
+                         get_project_include_name_list(definition_include_name_list, project_class_name_set),
+                         get_project_include_name_list(generated_class.get_implementation_include_name_list(),
+                                                       project_class_name_set),
+                         generated_class.has_implementation())
+
+def analyze_classes(class_arguments_list, minimal_includes=False):
+    """ Print the include cost of the class definition file of every class,
+        without writing any files.  Return the program status.
+    """
+    status = 0
+    project_class_name_set = get_project_class_name_set(class_arguments_list)
+    include_cost_analyzer = IncludeCostAnalyzer()
+    for class_arguments in class_arguments_list:
+        try:
+            include_cost_analyzer.add_class(analyze_class(class_arguments, project_class_name_set, minimal_includes))
+        except (ValueError, EnvironmentError) as error:
+            print
+            print 'Class {0}:'.format(class_arguments.class_name)
+            print error
+            status = -1
+    print_include_analysis(include_cost_analyzer)
+    return status
+
+def print_include_analysis(include_cost_analyzer):
+    """ Print the includes of each class definition file, the include
+        names that could be forward declarations, and the fan-out score of
+        each include name.
+    """
+    print
+    print '{0:<40} {1:>8} {2:>12} {3:>12}'.format('Class', 'Includes', 'Forwardable', 'Units')
+    for class_includes in include_cost_analyzer.get_class_includes_list():
+        print '{0:<40} {1:>8} {2:>12} {3:>12}'.format(class_includes.class_name,
+                                                       len(class_includes.definition_include_name_list),
+                                                       len(class_includes.forward_declarable_name_list),
+                                                       include_cost_analyzer.get_translation_unit_count(class_includes.class_name))
+        if class_includes.forward_declarable_name_list:
+            print '    Could be forward declarations: {0}'.format(', '.join(class_includes.forward_declarable_name_list))
+    header_count_dict = include_cost_analyzer.get_header_count_dict()
+    fan_out_score_dict = include_cost_analyzer.get_fan_out_score_dict()
+    print
+    print '{0:<40} {1:>8} {2:>12}'.format('Include', 'Headers', 'Fan-out')
+    # The include names with the highest fan-out score are first.
+    for include_name in sorted(fan_out_score_dict, key=lambda include_name: (-fan_out_score_dict[include_name], include_name)):
+        print '{0:<40} {1:>8} {2:>12}'.format(include_name, header_count_dict[include_name], fan_out_score_dict[include_name])
+    total_fan_out_score = include_cost_analyzer.get_total_fan_out_score()
+    forward_declarable_fan_out_score = include_cost_analyzer.get_forward_declarable_fan_out_score()
+    print
+    print 'Total fan-out score {0}, {1} with the -m switch.'.format(total_fan_out_score,
+                                                                  total_fan_out_score - forward_declarable_fan_out_score)
+
+def watch_classes(arguments, class_arguments_list, output_directory, output_cache=None):
+    """ Create the classes, and then create the classes again whenever
+        their input files change, until Ctrl+C is pressed.  The manifest
+        file and the glob patterns are checked for added and removed classes
+        each time the files are checked.  When a class is added or removed,
+        every class is created again, because the project class names decide
+        which classes are included and which are forward declared.
+    """
+    spec_watcher = SpecWatcher(arguments.interval)
+    parse_index_dict = {}
+    dependency_list_dict = {}
+    implementation_size_dict = {}
+    system_include_dict = {}
+    for class_arguments in class_arguments_list:
+        spec_watcher.add_file(class_arguments.input_file_name)
+    # The watched classes are the classes whose input files have settled.
+    watched_class_arguments_list = class_arguments_list
+    project_class_name_set = get_project_class_name_set(watched_class_arguments_list)
+    # Create all of the classes first.
+    changed_class_arguments_list = class_arguments_list
+    try:
+        while True:
+            if changed_class_arguments_list:
+                start_time = time.time()
+                result_list = generate_classes(changed_class_arguments_list,
+                                               output_directory,
+                                               1,
+                                               output_cache,
+                                               parse_index_dict,
+                                               project_class_name_set,
+                                               arguments.minimal_includes,
+                                               get_precompiled_header_name(arguments))
+                print_summary(result_list, time.time() - start_time)
+                # Check the include cycles of all of the classes.
+                for result in result_list:
+                    dependency_list_dict[result.class_name] = result.dependency_list
+                    implementation_size_dict[result.class_name] = result.implementation_size
+                    system_include_dict[result.class_name] = result.system_include_name_list
+                dependency_graph = create_dependency_graph([class_arguments.class_name
+                                                            for class_arguments in watched_class_arguments_list],
+                                                           dependency_list_dict)
+                print_include_cycles(dependency_graph)
+                # An error writing a file is printed, and the files are
+                # written again after the next change.
+                write_build_files(arguments,
+                                  watched_class_arguments_list,
+                                  output_directory,
+                                  dependency_graph,
+                                  implementation_size_dict,
+                                  system_include_dict)
+                sys.stdout.flush()
+            last_class_arguments_dict = dict([(get_class_key(class_arguments), class_arguments)
+                                              for class_arguments in class_arguments_list])
+            time.sleep(arguments.interval)
+            try:
+                class_arguments_list = find_all_class_arguments(arguments)
+            except (ValueError, EnvironmentError) as error:
+                # Keep the last classes until the manifest file is fixed.
+                print error
+            # Find the classes whose input file changed, or whose arguments
+            # changed.  An input file that was not watched before is used
+            # once it settles.
+            changed_file_name_set = set(spec_watcher.find_changed_files([class_arguments.input_file_name
+                                                                         for class_arguments in class_arguments_list]))
+            changed_class_arguments_list = []
+            for class_arguments in class_arguments_list:
+                if (class_arguments.input_file_name in changed_file_name_set
+                    or (spec_watcher.is_watched(class_arguments.input_file_name)
+                        and last_class_arguments_dict.get(get_class_key(class_arguments)) != class_arguments)):
+                    changed_class_arguments_list.append(class_arguments)
+            # If a class was added or removed, then create every class again.
+            watched_class_arguments_list = [class_arguments for class_arguments in class_arguments_list
+                                            if spec_watcher.is_watched(class_arguments.input_file_name)]
+            watched_project_class_name_set = get_project_class_name_set(watched_class_arguments_list)
+            if watched_project_class_name_set != project_class_name_set:
+                project_class_name_set = watched_project_class_name_set
+                changed_class_arguments_list = watched_class_arguments_list
+            # Forget the parsed declarations of the classes that were removed.
+            class_key_set = set([get_class_key(class_arguments) for class_arguments in class_arguments_list])
+            for class_key in parse_index_dict.keys():
+                if class_key not in class_key_set:
+                    del parse_index_dict[class_key]
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+# Start of main program.
+def main(argv=None):
+    # Initialize the command line parser.
+    parser = ArgumentParser(description='This program creates C++ class files for many classes.',
+                            epilog='Copyright (c) 2013 William Hallahan.',
+                            add_help=True,
+                            argument_default=None, # Global argument default
+                            usage=__doc__)
+    parser.add_argument(action='store', dest='manifest_file_name', nargs='?', default='', help='The manifest file name.')
+    parser.add_argument('-g', '--glob', action='append', dest='glob_pattern_list', default=[], help='Create a class for each matching input file.')
+    parser.add_argument('-o', '--output', action='store', dest='output_directory', default='', help='The folder where the class folders are created.')
+    parser.add_argument('-c', '--cache', action='store', dest='cache_file_name', default='', help='The output cache file name.')
+    parser.add_argument('-j', '--jobs', action='store', type=int, dest='job_count', default=1, help='The number of processes that create classes.')
+    parser.add_argument('-w', '--watch', action='store_true', dest='watch', default=False, help='Create the classes again when the input files change.')
+    parser.add_argument('--interval', action='store', type=float, dest='interval', default=0.5, help='The time between checks for changed files.')
+    parser.add_argument('-m', '--minimal', action='store_true', dest='minimal_includes', default=False, help='Forward declare every class that is not needed by value.')
+    parser.add_argument('--analyze', action='store_true', dest='analyze', default=False, help='Print the include cost of the classes without writing files.')
+    parser.add_argument('-u', '--unity', action='store', type=int, dest='unity_file_count', default=0, help='The number of unity build files to write.')
+    parser.add_argument('--pch', action='store', type=int, dest='pch_class_count', default=0, help='Write a precompiled header of the common system headers.')
+    parser.add_argument('--use_pch', action='store_true', dest='use_pch', default=False, help='Include the precompiled header in every class implementation file.')
+    parser.add_argument('--order', action='store', dest='order_file_name', default='', help='The file where the class order is written.')
+    parser.add_argument('-r', '--registry', action='store', dest='registry_file_name', default=get_configured_type_registry_file_name(), help='The type registry file name.')
+    add_class_option_arguments(parser)
+    # Parse the command line.
+    arguments = parser.parse_args(args=argv)
+    if not arguments.manifest_file_name and not arguments.glob_pattern_list:
+        parser.error('A manifest file name or a glob pattern is required.')
+    if arguments.use_pch and arguments.pch_class_count < 1:
+        parser.error('The --use_pch switch is only used with the --pch switch.')
+    output_directory = arguments.output_directory
+    if not output_directory:
+        output_directory = os.getcwd()
+    status = 0
+    try:
+        use_type_registry(arguments.registry_file_name)
+        class_arguments_list = find_all_class_arguments(arguments)
+    except ValueError as value_error:
+        print value_error
+        return -1
+    except EnvironmentError as environment_error:
+        print environment_error
+        return -1
+    output_cache = None
+    if arguments.cache_file_name:
+        output_cache = OutputCache(arguments.cache_file_name)
+    if arguments.analyze:
+        return analyze_classes(class_arguments_list, arguments.minimal_includes)
+    if arguments.watch:
+        return watch_classes(arguments, class_arguments_list, output_directory, output_cache)
+    start_time = time.time()
+    result_list = generate_classes(class_arguments_list,
+                                   output_directory,
+                                   arguments.job_count,
+                                   output_cache,
+                                   None,
+                                   None,
+                                   arguments.minimal_includes,
+                                   get_precompiled_header_name(arguments))
+    error_count = print_summary(result_list, time.time() - start_time)
+    if error_count:
+        status = -1
+    dependency_graph = create_dependency_graph([result.class_name for result in result_list],
+                                               dict([(result.class_name, result.dependency_list)
+                                                     for result in result_list]))
+    if print_include_cycles(dependency_graph):
+        status = -1
+    if write_build_files(arguments,
+                         class_arguments_list,
+                         output_directory,
+                         dependency_graph,
+                         dict([(result.class_name, result.implementation_size) for result in result_list]),
+                         dict([(result.class_name, result.system_include_name_list) for result in result_list])):
+        status = -1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
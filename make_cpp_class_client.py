@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+This program creates the same C++ class files as make_cpp_class.py,
+but the classes are created by the make_cpp_class_server.py program.
+The client only sends the input file text to the server and writes the
+class files that the server returns, so the client starts much faster
+than make_cpp_class.py.  The server must be running.
+
+Usage:
+
+    python make_cpp_class_client.py <class_name> <input_file_name> [-b base_class_name] [-a author_name] [-f] [-t] [-d date]
+                                    [-s socket_file_name]
+
+    The program accepts the following switches:
+
+        -b base_class_name, --base_class base_class_name  - Inherit from the named base class.
+        -a author_name, --author author_name              - The author name.
+        -f, --full                                        - Write full detailed header information.
+        -t, --abstract                                    - Make all virtual methods be abstract methods.
+        -d date, --date date                              - The date written in the file headers, in the
+                                                            form YYYY-MM-DD.  If this switch is not used,
+                                                            the SOURCE_DATE_EPOCH environment variable is
+                                                            used if it is set, otherwise the current date
+                                                            and time are used.
+        -s socket_file_name, --socket socket_file_name    - The Unix domain socket file that the server
+                                                            listens on.  The default is the file
+                                                            make_cpp_class.sock in the XDG_RUNTIME_DIR
+                                                            folder, or if that environment variable is
+                                                            not set, in the make_cpp_class-<user_id>
+                                                            folder in the temporary folder.  The client
+                                                            does not connect to a socket that belongs
+                                                            to another user.
+        -h, --help                                        - Show help and exit
+
+The class files are written into a folder that has the class name, the
+same as make_cpp_class.py does.
+"""
+import sys
+import os
+import time
+import socket
+from contextlib import closing
+from argparse import ArgumentParser
+from class_options import add_class_option_arguments, create_folder_under_current_directory, get_header_date_time
+from generator_protocol import OK_STATUS, get_default_socket_name, check_private_directory, check_socket_owner, \
+    read_message, write_message
+from output_file_writer import OutputFileWriter
+
+def create_request(arguments, spec_text):
+    # The date is set by the client so that the class files are the
+    # same as the class files that make_cpp_class.py creates.
+    date_time = get_header_date_time(arguments.date_time)
+    return {'class_name': arguments.class_name,
+            'spec_text': spec_text,
+            'base_class': arguments.base_class,
+            'author': arguments.author,
+            'full_header': arguments.full_header,
+            'abstract_class': arguments.abstract_class,
+            'date': time.strftime('%Y-%m-%d', date_time)}
+
+def send_request(socket_name, request_dict):
+    """ Send one request to the server and return the response.  Raises
+        an EnvironmentError if the server cannot be reached, or if the
+        socket belongs to another user.
+    """
+    if socket_name == get_default_socket_name():
+        check_private_directory(os.path.dirname(socket_name))
+    check_socket_owner(socket_name)
+    with closing(socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)) as client_socket:
+        client_socket.connect(socket_name)
+        with closing(client_socket.makefile('r+b')) as socket_file:
+            write_message(socket_file, request_dict)
+            response_dict = read_message(socket_file)
+    if response_dict is None:
+        raise EnvironmentError('The server closed the connection.')
+    return response_dict
+
+def write_class_file(output_file_writer, output_directory, file_name, text, file_description):
+    if output_file_writer.write_file(os.path.join(output_directory, file_name), text):
+        print 'Created {0} {1}.'.format(file_description, file_name)
+    else:
+        print '{0} {1} is unchanged.'.format(file_description.capitalize(), file_name)
+
+# Start of main program.
+def main(argv=None):
+    # Initialize the command line parser.
+    parser = ArgumentParser(description='This program creates C++ class files using the class generator server.',
+                            epilog='Copyright (c) 2013 William Hallahan.',
+                            add_help=True,
+                            argument_default=None, # Global argument default
+                            usage=__doc__)
+    parser.add_argument(action='store', dest='class_name', help='The class name.')
+    parser.add_argument(action='store', dest='input_file_name', help='The input file name.')
+    add_class_option_arguments(parser)
+    parser.add_argument('-s', '--socket', action='store', dest='socket_name', default=get_default_socket_name(), help='The socket file name.')
+    # Parse the command line.
+    arguments = parser.parse_args(args=argv)
+    status = 0
+    # Create a 'class_name' folder for the class files.
+    new_path = create_folder_under_current_directory(arguments.class_name)
+    try:
+        with open(arguments.input_file_name, 'r') as input_file:
+            spec_text = input_file.read()
+        response_dict = send_request(arguments.socket_name, create_request(arguments, spec_text))
+        for diagnostic in response_dict.get('diagnostics', []):
+            if diagnostic['severity'] != 'warning':
+                raise ValueError('{0}\nError parsing input file at line {1}.'.format(diagnostic['message'],
+                                                                                  diagnostic['line_number']))
+            print 'Warning: {0}'.format(diagnostic['message'])
+        if response_dict.get('status') != OK_STATUS:
+            raise ValueError(response_dict.get('error_text', 'The server did not create the class.'))
+        output_file_writer = OutputFileWriter()
+        write_class_file(output_file_writer,
+                         new_path,
+                         response_dict['header_file_name'],
+                         response_dict['header_text'],
+                         'class definition file')
+        # If all methods are inline methods then there is no implementation file.
+        if response_dict['implementation_text']:
+            write_class_file(output_file_writer,
+                             new_path,
+                             response_dict['implementation_file_name'],
+                             response_dict['implementation_text'],
+                             'class implementation file')
+        print 'Wrote {0} class files, {1} class files unchanged.'.format(output_file_writer.get_written_file_count(),
+                                                                        output_file_writer.get_unchanged_file_count())
+    except ValueError as value_error:
+        print value_error
+        status = -1
+    except EnvironmentError as environment_error:
+        print environment_error
+        status = -1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
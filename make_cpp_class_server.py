@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+This program is a server that creates C++ class files for the
+make_cpp_class_client.py program.  The server loads the class generator
+once and keeps running, so a client does not have to start Python and
+load the parser and the code that renders the class files every time a
+class is created.  The server handles each client connection in a
+separate thread, so many clients can use the server at the same time.
+
+Usage:
+
+    python make_cpp_class_server.py [-s socket_file_name] [-r registry_file]
+
+    The program accepts the following switches:
+
+        -s socket_file_name, --socket socket_file_name    - The Unix domain socket file that the server
+                                                            listens on.  The default is the file
+                                                            make_cpp_class.sock in the XDG_RUNTIME_DIR
+                                                            folder, or if that environment variable is
+                                                            not set, in the make_cpp_class-<user_id>
+                                                            folder in the temporary folder.  The server
+                                                            creates the folder, which only the current
+                                                            user can use.
+        -r registry_file, --registry registry_file        - Use the type registry file to find the include
+                                                            file of each type.  If this switch is not used,
+                                                            the MAKE_CPP_CLASS_TYPE_REGISTRY environment
+                                                            variable is used if it is set.
+        -h, --help                                        - Show help and exit
+
+The server runs until it is interrupted.  The requests and responses are
+described in the generator_protocol.py file.
+"""
+import sys
+import os
+import time
+import socket
+import SocketServer
+from argparse import ArgumentParser
+from class_generator import generate_cpp_class
+from type_registry import get_configured_type_registry_file_name, use_type_registry
+from generator_protocol import OK_STATUS, ERROR_STATUS, get_default_socket_name, create_default_socket_directory, \
+    read_message, write_message, create_error_response
+
+def get_text_member(request_dict, member_name):
+    """ Return a string member of a request. """
+    value = request_dict.get(member_name, '')
+    if not isinstance(value, str):
+        raise ValueError('The request member {0} must be a string.'.format(member_name))
+    return value
+
+def get_boolean_member(request_dict, member_name):
+    """ Return a boolean member of a request.  A string, such as "no",
+        is not a boolean.
+    """
+    value = request_dict.get(member_name, False)
+    if not isinstance(value, bool):
+        raise ValueError('The request member {0} must be true or false.'.format(member_name))
+    return value
+
+def handle_request(request_dict):
+    """ Generate the class for one request and return the response. """
+    try:
+        class_name = get_text_member(request_dict, 'class_name')
+        if not class_name:
+            raise ValueError('The request does not have a class name.')
+        date_time = None
+        date_text = get_text_member(request_dict, 'date')
+        if date_text:
+            date_time = time.strptime(date_text, '%Y-%m-%d')
+        generated_class = generate_cpp_class(get_text_member(request_dict, 'spec_text'),
+                                             class_name,
+                                             get_text_member(request_dict, 'base_class'),
+                                             get_text_member(request_dict, 'author'),
+                                             get_boolean_member(request_dict, 'full_header'),
+                                             get_boolean_member(request_dict, 'abstract_class'),
+                                             date_time)
+    except ValueError as value_error:
+        return create_error_response(str(value_error))
+    except Exception as error:
+        # Report any other error to the client and keep the server running.
+        return create_error_response('{0}: {1}'.format(type(error).__name__, error))
+    status = OK_STATUS
+    if generated_class.has_errors():
+        status = ERROR_STATUS
+    return {'status': status,
+            'error_text': '',
+            'header_file_name': generated_class.get_header_file_name(),
+            'header_text': generated_class.get_header_text(),
+            'implementation_file_name': generated_class.get_implementation_file_name(),
+            'implementation_text': generated_class.get_implementation_text(),
+            'definition_include_names': generated_class.get_definition_include_name_list(),
+            'implementation_include_names': generated_class.get_implementation_include_name_list(),
+            'diagnostics': [diagnostic._asdict() for diagnostic in generated_class.get_diagnostic_list()]}
+
+class GeneratorRequestHandler(SocketServer.StreamRequestHandler):
+
+    def handle(self):
+        # A client can send any number of requests on one connection.
+        try:
+            while True:
+                try:
+                    request_dict = read_message(self.rfile)
+                except ValueError as value_error:
+                    write_message(self.wfile, create_error_response('Invalid request: {0}'.format(value_error)))
+                    continue
+                if request_dict is None:
+                    break
+                try:
+                    write_message(self.wfile, handle_request(request_dict))
+                except (TypeError, ValueError) as error:
+                    # The response could not be written as JSON.
+                    write_message(self.wfile, create_error_response('Invalid response: {0}'.format(error)))
+        except socket.error:
+            # The client closed the connection.
+            pass
+
+class GeneratorServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+
+    # Do not wait for the client connections to close when the server exits.
+    daemon_threads = True
+
+def remove_stale_socket(socket_name):
+    """ Remove a socket file that was left by a server that is no longer
+        running.  Raises an EnvironmentError if a server is using the socket.
+    """
+    if os.path.exists(socket_name):
+        test_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            test_socket.connect(socket_name)
+        except socket.error:
+            os.remove(socket_name)
+        else:
+            raise EnvironmentError('A server is already listening on socket {0}.'.format(socket_name))
+        finally:
+            test_socket.close()
+
+def warm_up():
+    """ Generate a small class so that everything the generator uses is
+        loaded before the first client request.
+    """
+    handle_request({'class_name': 'WarmUp',
+                    'spec_text': 'int m_count;\n@()\n{\n}\n',
+                    'date': '2000-01-01'})
+
+# Start of main program.
+def main(argv=None):
+    # Initialize the command line parser.
+    parser = ArgumentParser(description='This program is a server that creates C++ class files.',
+                            epilog='Copyright (c) 2013 William Hallahan.',
+                            add_help=True,
+                            argument_default=None, # Global argument default
+                            usage=__doc__)
+    parser.add_argument('-s', '--socket', action='store', dest='socket_name', default=get_default_socket_name(), help='The socket file name.')
+    parser.add_argument('-r', '--registry', action='store', dest='registry_file_name', default=get_configured_type_registry_file_name(), help='The type registry file name.')
+    # Parse the command line.
+    arguments = parser.parse_args(args=argv)
+    socket_name = arguments.socket_name
+    try:
+        use_type_registry(arguments.registry_file_name)
+    except (ValueError, EnvironmentError) as error:
+        print error
+        return -1
+    try:
+        if socket_name == get_default_socket_name():
+            create_default_socket_directory()
+        remove_stale_socket(socket_name)
+        server = GeneratorServer(socket_name, GeneratorRequestHandler)
+        # Only the user that started the server can connect to it.
+        os.chmod(socket_name, 0o600)
+    except EnvironmentError as environment_error:
+        print environment_error
+        return -1
+    warm_up()
+    print 'The class generator server is listening on socket {0}.'.format(socket_name)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_name):
+            os.remove(socket_name)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The output cache remembers the class files that were created for an
+  input file.  The cache key is a hash of the input file text, every
+  option that changes the class files, and the source code of the
+  generator itself, so changing any of these creates a new key.  If the
+  class files for a key still exist and have not been changed, then the
+  class does not have to be parsed or rendered again.
+"""
+import os
+import time
+import json
+import hashlib
+import type_info
+from output_file_writer import write_file_atomically
+from type_registry import get_type_registry_hash
+
+# The modules whose source code determines the generated class files.
+generator_module_name_list = ['bclass',
+                              'bparse',
+                              'blexer',
+                              'class_generator',
+                              'class_options',
+                              'file_buffer',
+                              'function_info',
+                              'include_file_manager',
+                              'output_file_writer',
+                              'parse_index',
+                              'template_type',
+                              'type_registry',
+                              'type_and_name_info',
+                              'type_info']
+
+_generator_version = ''
+
+def get_generator_version():
+    """ Return a hash of the source code of the generator modules. """
+    global _generator_version
+    if not _generator_version:
+        version_hash = hashlib.sha1()
+        for module_name in generator_module_name_list:
+            module = __import__(module_name)
+            source_file_name = os.path.splitext(module.__file__)[0] + '.py'
+            with open(source_file_name, 'rb') as source_file:
+                version_hash.update(source_file.read())
+        _generator_version = version_hash.hexdigest()
+    return _generator_version
+
+def get_file_hash(file_name):
+    """ Return the hash of the file contents, or the empty string
+        if the file cannot be read.
+    """
+    try:
+        with open(file_name, 'rb') as input_file:
+            return hashlib.sha1(input_file.read()).hexdigest()
+    except EnvironmentError:
+        return ''
+
+class OutputCache:
+
+    CACHE_FORMAT_VERSION = 1
+
+    def __init__(self, cache_file_name):
+        self.cache_file_name = cache_file_name
+        self.entry_dict = {}
+        # The project classes that the class definition file of each
+        # entry includes.
+        self.dependency_dict = {}
+        # The estimated size of the class implementation file of each entry.
+        self.implementation_size_dict = {}
+        # The bracketed include names of the class definition file of each
+        # entry.
+        self.system_include_dict = {}
+        # The key of the entry that owns each class file.
+        self.file_key_dict = {}
+        self.is_modified = False
+        self.load()
+
+    def load(self):
+        # A missing or damaged cache file is the same as an empty cache.
+        try:
+            with open(self.cache_file_name, 'r') as cache_file:
+                cache_dict = json.load(cache_file)
+            if cache_dict.get('format_version') == OutputCache.CACHE_FORMAT_VERSION:
+                self.entry_dict = cache_dict.get('entries', {})
+                self.dependency_dict = cache_dict.get('dependencies', {})
+                self.implementation_size_dict = cache_dict.get('implementation_sizes', {})
+                self.system_include_dict = cache_dict.get('system_includes', {})
+        except (EnvironmentError, ValueError):
+            self.entry_dict = {}
+            self.dependency_dict = {}
+            self.implementation_size_dict = {}
+            self.system_include_dict = {}
+        self.file_key_dict = {}
+        for key, file_hash_dict in self.entry_dict.items():
+            for file_name in file_hash_dict:
+                self.file_key_dict[file_name] = key
+
+    def save(self):
+        if not self.is_modified:
+            return
+        cache_dict = {'format_version' : OutputCache.CACHE_FORMAT_VERSION,
+                      'entries' : self.entry_dict,
+                      'dependencies' : self.dependency_dict,
+                      'implementation_sizes' : self.implementation_size_dict,
+                      'system_includes' : self.system_include_dict}
+        # A reader never sees a partly written cache file.
+        write_file_atomically(self.cache_file_name,
+                              json.dumps(cache_dict, indent=1, sort_keys=True))
+        self.is_modified = False
+
+    def get_key(self,
+                input_file_name,
+                class_name,
+                base_class,
+                author,
+                full_header,
+                abstract_class,
+                output_directory,
+                date_time=None,
+                project_class_name_set=None,
+                minimal_includes=False,
+                precompiled_header_name=''):
+        """ Return the cache key for one class.  The header date is part
+            of the key only when the date is fixed.  The intrinsic type
+            names are part of the key, because more names can be added
+            with an environment variable, and so are the type registry, the
+            project class names, the include mode and the precompiled header
+            name, which can change the includes.  Raises an EnvironmentError
+            if the input file cannot be read.
+        """
+        date_text = os.environ.get('SOURCE_DATE_EPOCH', '')
+        if date_time is not None:
+            date_text = time.strftime('%Y-%m-%d', date_time)
+        with open(input_file_name, 'rb') as input_file:
+            input_text = input_file.read()
+        key_hash = hashlib.sha1()
+        for key_text in [get_generator_version(),
+                         hashlib.sha1(input_text).hexdigest(),
+                         class_name,
+                         base_class,
+                         author,
+                         str(bool(full_header)),
+                         str(bool(abstract_class)),
+                         os.path.abspath(output_directory),
+                         date_text,
+                         ','.join(sorted(type_info.intrinsic_type_set)),
+                         get_type_registry_hash(),
+                         ','.join(sorted(project_class_name_set or [])),
+                         str(bool(minimal_includes)),
+                         precompiled_header_name]:
+            key_hash.update(key_text)
+            key_hash.update('\0')
+        return key_hash.hexdigest()
+
+    def is_current(self, key):
+        """ Return True if the class files for the key exist and still
+            contain the text that was written when the key was saved.
+        """
+        file_hash_dict = self.entry_dict.get(key)
+        if not file_hash_dict:
+            return False
+        for file_name, file_hash in file_hash_dict.items():
+            if get_file_hash(file_name) != file_hash:
+                return False
+        return True
+
+    def get_dependency_list(self, key):
+        """ Return the project classes that the class definition file for
+            the key includes, or None if they were not saved.
+        """
+        return self.dependency_dict.get(key)
+
+    def get_implementation_size(self, key):
+        """ Return the estimated size of the class implementation file for
+            the key, or None if it was not saved.
+        """
+        return self.implementation_size_dict.get(key)
+
+    def get_system_include_name_list(self, key):
+        """ Return the bracketed include names of the class definition file
+            for the key, or None if they were not saved.
+        """
+        return self.system_include_dict.get(key)
+
+    def update(self,
+               key,
+               output_file_name_list,
+               dependency_list=None,
+               implementation_size=None,
+               system_include_name_list=None):
+        """ Save the hash of every class file created for the key, the
+            project classes and the bracketed include names that the class
+            definition file includes, and the estimated size of the class
+            implementation file.  Any older entry for the same class files
+            is removed.
+        """
+        file_hash_dict = {}
+        for file_name in output_file_name_list:
+            file_name = os.path.abspath(file_name)
+            file_hash_dict[file_name] = get_file_hash(file_name)
+            old_key = self.file_key_dict.get(file_name)
+            if old_key and old_key != key:
+                self.entry_dict.pop(old_key, None)
+                self.dependency_dict.pop(old_key, None)
+                self.implementation_size_dict.pop(old_key, None)
+                self.system_include_dict.pop(old_key, None)
+            self.file_key_dict[file_name] = key
+        self.entry_dict[key] = file_hash_dict
+        if dependency_list is not None:
+            self.dependency_dict[key] = list(dependency_list)
+        if implementation_size is not None:
+            self.implementation_size_dict[key] = implementation_size
+        if system_include_name_list is not None:
+            self.system_include_dict[key] = list(system_include_name_list)
+        self.is_modified = True
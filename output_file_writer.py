@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The output file writer writes each class file only if its text changed.
+  A changed file is written to a temporary file in the same folder, which
+  is then renamed to the class file name.  The rename replaces the old
+  file in one step, so a class file is never left partly written, and
+  an unchanged file keeps its modification time so that build tools do
+  not rebuild anything that depends on it.
+"""
+import os
+import tempfile
+
+# The largest piece of a text chunk that is copied into a string when a
+# file is compared with a list of text chunks.
+compare_piece_size = 65536
+
+# Read the process umask once so new files get the usual permissions.
+_umask = os.umask(0)
+os.umask(_umask)
+
+def read_file_text(file_name):
+    """ Return the text of a file, or None if the file cannot be read. """
+    try:
+        with open(file_name, 'r') as input_file:
+            return input_file.read()
+    except EnvironmentError:
+        return None
+
+def iterate_pieces(chunk_list):
+    """ Generate the text of the chunks in pieces that are no larger
+        than the compare piece size.
+    """
+    for chunk in chunk_list:
+        for start in xrange(0, len(chunk), compare_piece_size):
+            yield chunk[start:start + compare_piece_size]
+
+def file_matches_chunks(file_name, chunk_list):
+    """ Return True if the file contains exactly the text of the chunks.
+        Only one piece of the file is read into memory at a time.
+    """
+    try:
+        with open(file_name, 'r') as input_file:
+            for piece in iterate_pieces(chunk_list):
+                if input_file.read(len(piece)) != piece:
+                    return False
+            return input_file.read(1) == ''
+    except EnvironmentError:
+        return False
+
+def write_file_atomically(file_name, text):
+    """ Write the text to a temporary file and rename the temporary file
+        to the file name.
+    """
+    write_chunks_atomically(file_name, [text])
+
+def write_chunks_atomically(file_name, chunk_list):
+    """ Write the text chunks to a temporary file and rename the temporary
+        file to the file name.  A chunk is either a string or a buffer.
+    """
+    directory = os.path.dirname(os.path.abspath(file_name))
+    file_descriptor, temporary_file_name = tempfile.mkstemp(prefix='.{0}.'.format(os.path.basename(file_name)),
+                                                            suffix='.tmp',
+                                                            dir=directory,
+                                                            text=True)
+    try:
+        with os.fdopen(file_descriptor, 'w') as output_file:
+            for chunk in chunk_list:
+                output_file.write(chunk)
+        # Keep the permissions of an existing file.  The temporary file is
+        # created readable only by the owner.
+        if os.path.exists(file_name):
+            os.chmod(temporary_file_name, os.stat(file_name).st_mode & 0o7777)
+        else:
+            os.chmod(temporary_file_name, 0o666 & ~_umask)
+        # On Windows, rename does not replace an existing file.
+        if os.name == 'nt' and os.path.exists(file_name):
+            os.remove(file_name)
+        os.rename(temporary_file_name, file_name)
+    except:
+        if os.path.exists(temporary_file_name):
+            os.remove(temporary_file_name)
+        raise
+
+def write_file_if_changed(file_name, text):
+    """ Write the text to the file only if the file does not already
+        contain exactly the same text.  Return True if the file was written.
+    """
+    if read_file_text(file_name) == text:
+        return False
+    write_file_atomically(file_name, text)
+    return True
+
+def write_chunks_if_changed(file_name, chunk_list):
+    """ Write the text chunks to the file only if the file does not
+        already contain exactly the same text.  The chunks are never
+        joined, so a chunk that is a buffer is written without being
+        copied into a string.  Return True if the file was written.
+    """
+    if file_matches_chunks(file_name, chunk_list):
+        return False
+    write_chunks_atomically(file_name, chunk_list)
+    return True
+
+class OutputFileWriter:
+
+    def __init__(self):
+        self.written_file_name_list = []
+        self.unchanged_file_name_list = []
+
+    def write_file(self, file_name, text):
+        """ Write the file if the text changed.  Return True if the file was written. """
+        is_written = write_file_if_changed(file_name, text)
+        self._add_file_name(file_name, is_written)
+        return is_written
+
+    def write_chunks(self, file_name, chunk_list):
+        """ Write the file if the text of the chunks changed.  Return True
+            if the file was written.
+        """
+        is_written = write_chunks_if_changed(file_name, chunk_list)
+        self._add_file_name(file_name, is_written)
+        return is_written
+
+    def _add_file_name(self, file_name, is_written):
+        if is_written:
+            self.written_file_name_list.append(file_name)
+        else:
+            self.unchanged_file_name_list.append(file_name)
+
+    def get_written_file_count(self):
+        return len(self.written_file_name_list)
+
+    def get_unchanged_file_count(self):
+        return len(self.unchanged_file_name_list)
+
+    def get_file_name_list(self):
+        return self.written_file_name_list + self.unchanged_file_name_list
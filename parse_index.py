@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The parse index remembers every declaration that was parsed in an
+  input file.  A declaration is the text from the start of a data member
+  or a method declaration up to the start of the next declaration.  The
+  index saves the offsets of each declaration, a hash of the text that
+  the parser read to parse the declaration, and the data members,
+  methods and include types that the declaration created.
+
+  When the input file is parsed again, the declarations at the start of
+  the file and the declarations at the end of the file whose text did not
+  change are not parsed again.  Only the text between them is parsed, so
+  the parse time depends on the size of the edit instead of on the size
+  of the file.  A method body is saved as an offset range, and the body
+  text is taken from the new input file text.
+"""
+import hashlib
+import cPickle
+from cStringIO import StringIO
+from collections import namedtuple
+from output_cache import get_generator_version
+from output_file_writer import write_file_atomically
+
+# One parsed declaration.  The text hash is the hash of the text from the
+# start offset to the hash end offset, which includes the tokens that the
+# parser looked at after the end of the declaration, or the rest of the
+# file if the declaration has a block comment that is not closed, because
+# any later text can close the comment.  The declaration data
+# is the pickled list of data members, list of methods and list of include
+# types that the declaration created.
+DeclarationRecord = namedtuple('DeclarationRecord', ['start',
+                                                     'end',
+                                                     'hash_end',
+                                                     'line_number',
+                                                     'text_hash',
+                                                     'has_copy_keyword',
+                                                     'has_nocopy_keyword',
+                                                     'declaration_data'])
+
+def get_text_hash(file_buffer, start, end):
+    """ Return the hash of a range of the file buffer text.  The hash is
+        only used to find changed text, so a fast hash is used.
+    """
+    return hashlib.md5(file_buffer.get_text_range(start, end)).digest()
+
+def dump_declaration_data(declaration_start,
+                          data_member_type_and_name_info_list,
+                          function_info_list,
+                          include_type_info_list,
+                          body_range_dict):
+    """ Return the pickled lists of a declaration.  The body range
+        dictionary maps the id of each method body that was copied from
+        the input file text to the offset range of the body.  Those
+        bodies are saved as offsets from the start of the declaration.
+    """
+    def get_body_id(body_text):
+        body_range = body_range_dict.get(id(body_text))
+        if body_range is None:
+            return None
+        return '{0} {1}'.format(body_range[0] - declaration_start, body_range[1] - declaration_start)
+    data_file = StringIO()
+    pickler = cPickle.Pickler(data_file, cPickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = get_body_id
+    pickler.dump((data_member_type_and_name_info_list, function_info_list, include_type_info_list))
+    return data_file.getvalue()
+
+def load_declaration_data(declaration_record, file_buffer):
+    """ Return new lists of data members, methods and include types for
+        a declaration.  The method bodies are taken from the file buffer
+        text at the declaration start offset.
+    """
+    declaration_start = declaration_record.start
+    def get_body_text(body_id):
+        body_start, body_end = [int(offset) for offset in body_id.split()]
+        return file_buffer.get_text_range(declaration_start + body_start, declaration_start + body_end)
+    unpickler = cPickle.Unpickler(StringIO(declaration_record.declaration_data))
+    unpickler.persistent_load = get_body_text
+    return unpickler.load()
+
+class ParseIndex:
+
+    INDEX_FORMAT_VERSION = 1
+
+    def __init__(self, index_file_name=''):
+        self.index_file_name = index_file_name
+        self.class_name = ''
+        self.text_size = 0
+        self.declaration_record_list = []
+        self.is_modified = False
+        if self.index_file_name:
+            self.load()
+
+    def load(self):
+        # A missing or damaged index file, or an index file that was saved
+        # by a different version of the generator, is the same as an empty
+        # index.
+        self.set_declaration_records('', 0, [])
+        self.is_modified = False
+        try:
+            with open(self.index_file_name, 'rb') as index_file:
+                index_dict = cPickle.load(index_file)
+            if (index_dict.get('format_version') == ParseIndex.INDEX_FORMAT_VERSION
+                and index_dict.get('generator_version') == get_generator_version()):
+                self.set_declaration_records(index_dict['class_name'],
+                                             index_dict['text_size'],
+                                             [DeclarationRecord(*record) for record in index_dict['declarations']])
+                self.is_modified = False
+        except (EnvironmentError, cPickle.UnpicklingError, EOFError, KeyError, ValueError, TypeError, AttributeError):
+            pass
+
+    def save(self):
+        if not self.index_file_name or not self.is_modified:
+            return
+        index_dict = {'format_version' : ParseIndex.INDEX_FORMAT_VERSION,
+                      'generator_version' : get_generator_version(),
+                      'class_name' : self.class_name,
+                      'text_size' : self.text_size,
+                      'declarations' : [tuple(record) for record in self.declaration_record_list]}
+        # A reader never sees a partly written index file.
+        write_file_atomically(self.index_file_name,
+                              cPickle.dumps(index_dict, cPickle.HIGHEST_PROTOCOL))
+        self.is_modified = False
+
+    def get_class_name(self):
+        return self.class_name
+
+    def get_text_size(self):
+        return self.text_size
+
+    def get_declaration_records(self):
+        return self.declaration_record_list
+
+    def set_declaration_records(self, class_name, text_size, declaration_record_list):
+        self.class_name = class_name
+        self.text_size = text_size
+        self.declaration_record_list = declaration_record_list
+        self.is_modified = True
+
+    def find_unchanged_declarations(self, file_buffer, class_name):
+        """ Compare the file buffer text with the index.  Return the
+            number of unchanged declarations at the start of the file and
+            the index of the first of the unchanged declarations at the end
+            of the file.  The declarations at the end of the file have moved
+            by the difference of the text sizes.
+        """
+        record_list = self.declaration_record_list
+        if class_name != self.class_name:
+            return 0, len(record_list)
+        text_size = file_buffer.get_file_size()
+        # A declaration that was parsed up to the end of the file is only
+        # unchanged at the start of the file if the size did not change.
+        start_count = 0
+        for record in record_list:
+            if record.hash_end > text_size or (record.hash_end == self.text_size and text_size != self.text_size):
+                break
+            if get_text_hash(file_buffer, record.start, record.hash_end) != record.text_hash:
+                break
+            start_count += 1
+        offset_delta = text_size - self.text_size
+        end_index = len(record_list)
+        while end_index > start_count:
+            record = record_list[end_index - 1]
+            start = record.start + offset_delta
+            # The declarations at the end must follow the unchanged declarations
+            # at the start.
+            if start < 0 or (start_count > 0 and start < record_list[start_count - 1].end):
+                break
+            if get_text_hash(file_buffer, start, record.hash_end + offset_delta) != record.text_hash:
+                break
+            end_index -= 1
+        return start_count, end_index
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The precompiled header of a batch includes the system headers, which
+  are the bracketed include names such as <vector>, that the most class
+  definition files include.  A compiler that precompiles the header parses
+  these system headers once for the whole build, instead of once for each
+  translation unit.  The class implementation files can include the
+  precompiled header before any other file.  The class definition files
+  still include their own system headers, so each class definition file
+  can be compiled without the precompiled header.
+"""
+
+precompiled_header_file_name = 'generated_pch.h'
+
+def count_system_include_names(system_include_name_list_list):
+    """ Return the number of classes that include each system include
+        name, where the list has the system include names of each class.
+    """
+    class_count_dict = {}
+    for system_include_name_list in system_include_name_list_list:
+        for include_name in set(system_include_name_list):
+            class_count_dict[include_name] = class_count_dict.get(include_name, 0) + 1
+    return class_count_dict
+
+def find_common_include_names(class_count_dict, minimum_class_count):
+    """ Return the sorted list of the include names that at least the
+        minimum class count of classes include.
+    """
+    return sorted([include_name for include_name, class_count in class_count_dict.items()
+                   if class_count >= minimum_class_count])
+
+def render_precompiled_header(include_name_list):
+    """ Generate the text chunks of the precompiled header. """
+    yield '//**********************************************************************\n'
+    yield '// Precompiled Header File: {0}\n'.format(precompiled_header_file_name)
+    yield '//\n'
+    yield '// Abstract:\n'
+    yield '//\n'
+    yield '//   This file includes the system headers that are used by the most\n'
+    yield '//   generated classes.  It was created by make_cpp_class_batch.py.\n'
+    yield '//   Do not edit this file.\n'
+    yield '//\n'
+    yield '//**********************************************************************\n'
+    yield '\n'
+    yield '#ifndef GENERATED_PCH_H\n'
+    yield '#define GENERATED_PCH_H\n'
+    yield '\n'
+    for include_name in include_name_list:
+        yield '#include {0}\n'.format(include_name)
+    yield '\n'
+    yield '#endif\n'
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  The spec watcher finds the input files that changed by polling the
+  files.  A file whose size or modification time changed is only
+  reported after the size and modification time have not changed for
+  the settle time, so a burst of saves is reported once.  The file is
+  then only reported if the hash of the file contents changed, so a file
+  that was saved without being changed is not reported.
+"""
+import os
+import time
+from output_cache import get_file_hash
+
+def get_file_stat(file_name):
+    """ Return the modification time and size of a file, or None if the
+        file does not exist.
+    """
+    try:
+        file_stat = os.stat(file_name)
+    except EnvironmentError:
+        return None
+    return (file_stat.st_mtime, file_stat.st_size)
+
+class SpecWatcher:
+
+    def __init__(self, settle_time):
+        self.settle_time = settle_time
+        # The size and modification time that were last seen for each file.
+        self.file_stat_dict = {}
+        # The hash of the contents of each file when the file was last reported.
+        self.file_hash_dict = {}
+        # The time that the size or modification time of a file last changed,
+        # for the files that have not settled.
+        self.change_time_dict = {}
+
+    def add_file(self, file_name):
+        """ Watch a file without reporting it as changed. """
+        self.file_stat_dict[file_name] = get_file_stat(file_name)
+        self.file_hash_dict[file_name] = get_file_hash(file_name)
+        self.change_time_dict.pop(file_name, None)
+
+    def is_watched(self, file_name):
+        return file_name in self.file_hash_dict
+
+    def find_changed_files(self, file_name_list, current_time=None):
+        """ Return the files in the list whose contents changed and then
+            settled.  A file that was not watched before is reported when
+            it settles.  Files that are not in the list are no longer
+            watched.
+        """
+        if current_time is None:
+            current_time = time.time()
+        changed_file_name_list = []
+        for file_name in file_name_list:
+            file_stat = get_file_stat(file_name)
+            if file_name not in self.file_stat_dict or file_stat != self.file_stat_dict[file_name]:
+                # Wait until the file stops changing.
+                self.file_stat_dict[file_name] = file_stat
+                self.change_time_dict[file_name] = current_time
+            elif (file_name in self.change_time_dict
+                  and current_time - self.change_time_dict[file_name] >= self.settle_time):
+                del self.change_time_dict[file_name]
+                file_hash = get_file_hash(file_name)
+                if file_name not in self.file_hash_dict or file_hash != self.file_hash_dict[file_name]:
+                    self.file_hash_dict[file_name] = file_hash
+                    changed_file_name_list.append(file_name)
+        # Forget the files that are no longer watched.
+        file_name_set = set(file_name_list)
+        for file_dict in [self.file_stat_dict, self.file_hash_dict, self.change_time_dict]:
+            for file_name in file_dict.keys():
+                if file_name not in file_name_set:
+                    del file_dict[file_name]
+        return changed_file_name_list
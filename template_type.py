@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  A template type, such as "std::map<std::string, std::vector<Foo *> >",
+  is parsed into a tree.  Each node of the tree has the type name, the
+  type modifier, such as '*' or '&', and the template argument types.
+  The include names of a template type are found by walking the tree, so
+  every type that is used in the template arguments is found.
+
+  The same template types are used many times, so each parsed type is
+  saved in a cache that is shared by the whole process.  The template
+  arguments are parsed with the cache too, so a nested type is only
+  parsed once, no matter how many template types use the nested type.
+"""
+from collections import namedtuple
+
+TemplateType = namedtuple('TemplateType', ['type_name', 'type_modifier', 'argument_list'])
+
+# The qualifiers that can precede a template argument type.  The
+# qualifiers do not change the include name of the type.
+qualifier_name_list = ['const ', 'volatile ', 'typename ', 'struct ', 'class ']
+
+# The parsed template types for each type text.
+template_type_dict = {}
+
+def get_template_type(type_text):
+    """ Return the TemplateType for the type text.  A type that is not a
+        template type has an empty argument list.
+    """
+    template_type = template_type_dict.get(type_text)
+    if template_type is None:
+        template_type = _parse_template_type(type_text)
+        template_type_dict[type_text] = template_type
+    return template_type
+
+def clear_template_type_cache():
+    template_type_dict.clear()
+
+def _parse_template_type(type_text):
+    type_text = type_text.strip()
+    argument_list = []
+    argument_start = type_text.find('<')
+    if argument_start < 0:
+        name_text = type_text
+    else:
+        name_text = type_text[:argument_start]
+        argument_end = type_text.rfind('>')
+        if argument_end < argument_start:
+            # The brackets are not closed, so use the rest of the text.
+            argument_end = len(type_text)
+        argument_list = [get_template_type(argument_text)
+                         for argument_text in split_template_arguments(type_text[argument_start + 1:argument_end])]
+        # The text after the closing bracket is either the type modifiers,
+        # or a member type of the template, such as "::iterator *".  The
+        # include name of a member type is the include name of the template,
+        # and a member type cannot be forward declared, so the template
+        # needs the definition.
+        member_text = type_text[argument_end + 1:]
+        modifier_text = member_text[len(member_text.rstrip(' *&')):]
+        if member_text.strip().startswith('::'):
+            modifier_text = ''
+        name_text = '{0}{1}'.format(name_text, modifier_text)
+    # Separate the type modifiers from the end of the type name.
+    type_name = name_text.rstrip(' *&')
+    type_modifier = name_text[len(type_name):].replace(' ', '')
+    # Remove the qualifiers from the start of the type name.
+    type_name = type_name.strip()
+    found_qualifier = True
+    while found_qualifier:
+        found_qualifier = False
+        for qualifier_name in qualifier_name_list:
+            if type_name.startswith(qualifier_name):
+                type_name = type_name[len(qualifier_name):].lstrip()
+                found_qualifier = True
+    return TemplateType(type_name, type_modifier, tuple(argument_list))
+
+def split_template_arguments(argument_list_text):
+    """ Split the text between the outer brackets of a template type at
+        the commas that are not inside of nested brackets.
+    """
+    argument_text_list = []
+    bracket_depth = 0
+    argument_start = 0
+    for index, character in enumerate(argument_list_text):
+        if character == '<':
+            bracket_depth += 1
+        elif character == '>':
+            bracket_depth -= 1
+        elif character == ',' and bracket_depth == 0:
+            argument_text_list.append(argument_list_text[argument_start:index])
+            argument_start = index + 1
+    argument_text_list.append(argument_list_text[argument_start:])
+    return argument_text_list
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  Tests for the type names that the parser finds.
+"""
+import unittest
+from class_generator import generate_cpp_class
+from include_file_manager import include_decision_cache
+from type_registry import compile_registry_text
+
+class NestedTemplateTestCase(unittest.TestCase):
+
+    def test_nested_template_member(self):
+        generated_class = generate_cpp_class('std::map<std::string, std::vector<Foo> > m_map;\n', 'Bar')
+        self.assertFalse(generated_class.has_errors())
+        header_text = generated_class.get_header_text()
+        self.assertIn('std::map<std::string, std::vector<Foo> > m_map;', header_text)
+        self.assertNotIn('>>', header_text)
+        self.assertEqual(generated_class.get_definition_include_name_list(), ['<map>', '<string>', '<vector>', 'Foo'])
+
+    def test_closing_brackets_without_space(self):
+        generated_class = generate_cpp_class('std::vector<std::vector<int>> m_grid;\n', 'Bar')
+        self.assertIn('std::vector<std::vector<int> > m_grid;', generated_class.get_header_text())
+
+    def test_template_member_type(self):
+        generated_class = generate_cpp_class('std::map<int, Bar>::iterator m_it;\n', 'Baz')
+        self.assertFalse(generated_class.has_errors())
+        self.assertIn('std::map<int, Bar>::iterator m_it;', generated_class.get_header_text())
+        self.assertEqual(generated_class.get_definition_include_name_list(), ['<map>', 'Bar'])
+
+class ValueAndPointerTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        include_decision_cache.set_type_registry(None)
+
+    def assert_included_not_declared(self, spec_text, include_name, type_name):
+        generated_class = generate_cpp_class(spec_text, 'Bar')
+        self.assertEqual(generated_class.get_definition_include_name_list(), [include_name])
+        self.assertNotIn('class {0};'.format(type_name), generated_class.get_header_text())
+
+    def test_value_then_pointer(self):
+        self.assert_included_not_declared('Foo m_a;\nFoo * m_b;\n', 'Foo', 'Foo')
+
+    def test_pointer_then_value(self):
+        self.assert_included_not_declared('Foo * m_b;\nFoo m_a;\n', 'Foo', 'Foo')
+
+    def test_registry_type_value_then_pointer(self):
+        include_decision_cache.set_type_registry(compile_registry_text('{"types": {"Widget": {"header": "gui/widget.h"}}}'))
+        self.assert_included_not_declared('Widget m_a;\nWidget * m_b;\n', 'gui/widget.h', 'Widget')
+
+    def test_registry_type_pointer_then_value(self):
+        include_decision_cache.set_type_registry(compile_registry_text('{"types": {"Widget": {"header": "gui/widget.h"}}}'))
+        self.assert_included_not_declared('Widget * m_b;\nWidget m_a;\n', 'gui/widget.h', 'Widget')
+
+if __name__ == '__main__':
+    unittest.main()
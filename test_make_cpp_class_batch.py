@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  Tests for creating the classes of a batch.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from StringIO import StringIO
+import make_cpp_class_batch
+
+class WatchClassesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory_name = tempfile.mkdtemp()
+        self.output_directory = os.path.join(self.directory_name, 'out')
+        self.saved_stdout = sys.stdout
+        self.saved_sleep = make_cpp_class_batch.time.sleep
+        sys.stdout = StringIO()
+
+    def tearDown(self):
+        sys.stdout = self.saved_stdout
+        make_cpp_class_batch.time.sleep = self.saved_sleep
+        shutil.rmtree(self.directory_name)
+
+    def write_spec_file(self, class_name, spec_text):
+        with open(os.path.join(self.directory_name, '{0}.txt'.format(class_name)), 'w') as spec_file:
+            spec_file.write(spec_text)
+
+    def read_header_file(self, class_name):
+        with open(os.path.join(self.output_directory, class_name, '{0}.h'.format(class_name)), 'r') as header_file:
+            return header_file.read()
+
+    def watch(self, sleep_action_list):
+        # Each time the watch loop sleeps, the next action changes the
+        # input files.  The watch stops after the last action.
+        sleep_action_list = list(sleep_action_list)
+        def sleep(interval):
+            if not sleep_action_list:
+                raise KeyboardInterrupt()
+            sleep_action_list.pop(0)()
+        make_cpp_class_batch.time.sleep = sleep
+        return make_cpp_class_batch.main(['-g', os.path.join(self.directory_name, '*.txt'),
+                                          '-o', self.output_directory,
+                                          '-w',
+                                          '--interval', '0'])
+
+    def test_add_class(self):
+        self.write_spec_file('Eta', 'void take(Zeta z)\n{\n}\n')
+        # The added input file is seen by the first check, and it has
+        # settled at the second check.
+        self.assertEqual(self.watch([lambda: self.write_spec_file('Zeta', 'int m_count;\n'),
+                                     lambda: None]), 0)
+        header_text = self.read_header_file('Eta')
+        self.assertIn('class Zeta;', header_text)
+        self.assertNotIn('#include "Zeta.h"', header_text)
+        self.assertTrue(os.path.exists(os.path.join(self.output_directory, 'Zeta', 'Zeta.h')))
+
+    def test_remove_class(self):
+        self.write_spec_file('Eta', 'void take(Zeta z)\n{\n}\n')
+        self.write_spec_file('Zeta', 'int m_count;\n')
+        self.assertEqual(self.watch([lambda: os.remove(os.path.join(self.directory_name, 'Zeta.txt'))]), 0)
+        self.assertIn('#include "Zeta.h"', self.read_header_file('Eta'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  Tests for the requests that the class generator server handles.
+"""
+import unittest
+from StringIO import StringIO
+from generator_protocol import OK_STATUS, ERROR_STATUS, read_message, write_message
+from make_cpp_class_server import handle_request
+
+class HandleRequestTestCase(unittest.TestCase):
+
+    def send(self, request_dict):
+        # Send the request and the response through the protocol, the
+        # same as the client and the server do.
+        message_file = StringIO()
+        write_message(message_file, request_dict)
+        message_file.seek(0)
+        response_file = StringIO()
+        write_message(response_file, handle_request(read_message(message_file)))
+        response_file.seek(0)
+        return read_message(response_file)
+
+    def test_latin1_spec_text(self):
+        response_dict = self.send({'class_name': 'Foo',
+                                   'spec_text': 'int m_count;\nvoid F()\n{\n    // caf\xe9\n}\n',
+                                   'date': '2000-01-01'})
+        self.assertEqual(response_dict['status'], OK_STATUS)
+        self.assertIn('// caf\xe9\n', response_dict['implementation_text'])
+
+    def test_boolean_member_not_boolean(self):
+        response_dict = self.send({'class_name': 'Foo',
+                                   'spec_text': 'int m_count;\n',
+                                   'full_header': 'no'})
+        self.assertEqual(response_dict['status'], ERROR_STATUS)
+
+    def test_request_not_utf8(self):
+        self.assertRaises(ValueError, read_message, StringIO('{"class_name": "Foo", "spec_text": "\xe9"}\n'))
+
+if __name__ == '__main__':
+    unittest.main()
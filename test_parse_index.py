@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  Tests for parsing an input file again with a parse index.
+"""
+import time
+import unittest
+from class_generator import generate_cpp_class
+from parse_index import ParseIndex
+
+class ParseIndexTestCase(unittest.TestCase):
+
+    def generate(self, spec_text, parse_index=None):
+        # Return the class files, or the error if the parser raised one.
+        try:
+            generated_class = generate_cpp_class(spec_text, 'Foo', '', 'Author', False, False,
+                                                 time.gmtime(0), None, parse_index)
+        except Exception as error:
+            return repr(error)
+        return (generated_class.get_header_text(),
+                generated_class.get_implementation_text(),
+                generated_class.get_diagnostic_list())
+
+    def assert_same_as_full_parse(self, spec_text, edited_spec_text):
+        parse_index = ParseIndex()
+        self.generate(spec_text, parse_index)
+        self.assertEqual(self.generate(edited_spec_text, parse_index), self.generate(edited_spec_text))
+
+    def test_edit_after_declaration(self):
+        spec_text = 'int m_a;\nvoid F()\n{\n}\nint m_b;\n'
+        self.assert_same_as_full_parse(spec_text, spec_text.replace('m_b', 'm_c'))
+
+    def test_edit_closes_comment(self):
+        # The comment in the body of F is only closed by the edit in the
+        # body of G, so F must be parsed again.
+        spec_text = 'int m_a;\nvoid F()\n{\n    /* open\n}\nint m_b;\nvoid G()\n{\n}\n'
+        self.assert_same_as_full_parse(spec_text, spec_text.replace('void G()\n{\n', 'void G()\n{\n    */\n'))
+
+    def test_edit_removes_comment_end(self):
+        spec_text = 'int m_a;\nvoid F()\n{\n    /* open\n}\nint m_b;\nvoid G()\n{\n    */\n}\n'
+        self.assert_same_as_full_parse(spec_text, spec_text.replace('    */\n', ''))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  Tests for the shared type of a TypeAndNameInfo instance.
+"""
+import unittest
+import cPickle
+from type_and_name_info import TypeAndNameInfo, empty_type_info
+
+class EmptyTypeInfoTestCase(unittest.TestCase):
+
+    def test_empty_type_cannot_be_changed(self):
+        type_and_name_info = TypeAndNameInfo()
+        self.assertRaises(TypeError, type_and_name_info.get_type_info().set_name, 'Foo')
+        self.assertEqual(TypeAndNameInfo().get_type_info().get_name(), '')
+
+    def test_copy_can_be_changed(self):
+        the_type_info = empty_type_info.copy()
+        the_type_info.set_name('Foo')
+        self.assertEqual(the_type_info.get_name(), 'Foo')
+
+    def test_pickle_keeps_shared_instance(self):
+        self.assertTrue(cPickle.loads(cPickle.dumps(empty_type_info, 2)) is empty_type_info)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  Tests for compiling the text of a type registry file.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import type_info
+from type_registry import compile_registry_text, use_type_registry
+
+class CompileRegistryTextTestCase(unittest.TestCase):
+
+    def test_valid_registry(self):
+        type_registry = compile_registry_text('{"types": {"Widget": {"header": "gui/widget.h"}},'
+                                              ' "intrinsic_types": ["real_t"],'
+                                              ' "namespace_aliases": {"g": "gui"}}')
+        self.assertEqual(type_registry.find_type_entry('Widget').include_name, 'gui/widget.h')
+        self.assertEqual(type_registry.get_intrinsic_type_list(), ['real_t'])
+
+    def assert_invalid(self, registry_text):
+        self.assertRaises(ValueError, compile_registry_text, registry_text)
+
+    def test_invalid_json(self):
+        self.assert_invalid('{"types": ')
+
+    def test_registry_not_object(self):
+        self.assert_invalid('[]')
+
+    def test_types_not_object(self):
+        self.assert_invalid('{"types": []}')
+
+    def test_type_entry_not_object(self):
+        self.assert_invalid('{"types": {"Widget": "gui/widget.h"}}')
+
+    def test_header_not_string(self):
+        self.assert_invalid('{"types": {"Widget": {"header": 1}}}')
+
+    def test_intrinsic_types_not_array(self):
+        self.assert_invalid('{"intrinsic_types": "real_t"}')
+
+    def test_intrinsic_type_not_string(self):
+        self.assert_invalid('{"intrinsic_types": [1]}')
+
+    def test_namespace_aliases_not_object(self):
+        self.assert_invalid('{"namespace_aliases": ["gui"]}')
+
+    def test_namespace_alias_not_string(self):
+        self.assert_invalid('{"namespace_aliases": {"g": 1}}')
+
+class UseTypeRegistryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory_name = tempfile.mkdtemp()
+
+    def tearDown(self):
+        use_type_registry('')
+        shutil.rmtree(self.directory_name)
+
+    def write_registry_file(self, file_name, registry_text):
+        registry_file_name = os.path.join(self.directory_name, file_name)
+        with open(registry_file_name, 'w') as registry_file:
+            registry_file.write(registry_text)
+        return registry_file_name
+
+    def test_intrinsic_types_of_active_registry(self):
+        real_registry_file_name = self.write_registry_file('real.json', '{"intrinsic_types": ["real_t"]}')
+        index_registry_file_name = self.write_registry_file('index.json', '{"intrinsic_types": ["index_t"]}')
+        use_type_registry(real_registry_file_name)
+        self.assertTrue(type_info.is_intrinsic_type('real_t'))
+        use_type_registry(index_registry_file_name)
+        self.assertFalse(type_info.is_intrinsic_type('real_t'))
+        self.assertTrue(type_info.is_intrinsic_type('index_t'))
+        use_type_registry('')
+        self.assertFalse(type_info.is_intrinsic_type('index_t'))
+        self.assertTrue(type_info.is_intrinsic_type('int'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,13 +25,36 @@
 
 from type_info import TypeInfo
 
-class TypeAndNameInfo:
+class EmptyTypeInfo(TypeInfo):
+    """ The type of a TypeAndNameInfo instance until the type is set.  A
+        single instance is shared by every TypeAndNameInfo instance, so it
+        cannot be changed.  Calling a set method raises a TypeError.
+    """
+
+    __slots__ = []
+
+    def __init__(self):
+        for slot_name in TypeInfo.__slots__:
+            object.__setattr__(self, slot_name, '')
+
+    def __setattr__(self, name, value):
+        raise TypeError('The empty type cannot be changed.  Set a new TypeInfo instance instead.')
+
+    def __reduce__(self):
+        # The shared instance is pickled by name.
+        return 'empty_type_info'
+
+empty_type_info = EmptyTypeInfo()
+
+class TypeAndNameInfo(object):
 
     RENDER_NO_VALUE = 0
     RENDER_VALUE = 1
 
+    __slots__ = ['the_type_info', 'name', 'value']
+
     def __init__(self):
-        self.the_type_info = TypeInfo()
+        self.the_type_info = empty_type_info
         self.name = ''
         self.value = ''
 
@@ -39,14 +62,9 @@ class TypeAndNameInfo:
         return self.the_type_info
 
     def set_type_info(self, value):
-        a = value.get_static_virtual_qualifier_type()
-        self.the_type_info.set_static_virtual_qualifier_type(a)
-        b = value.get_const_volatile_qualifier_type()
-        self.the_type_info.set_const_volatile_qualifier_type(b)
-        c = value.get_name()
-        self.the_type_info.set_name(c)
-        d = value.get_type_modifier()
-        self.the_type_info.set_type_modifier(d)
+        # The type is shared instead of copied, so the type must not be
+        # changed after it is set.
+        self.the_type_info = value
 
     def get_name(self):
         return self.name
@@ -22,8 +22,53 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 #=======================================================================
-
-class TypeInfo:
+import os
+
+# The names of the intrinsic types, and of common typedefs of intrinsic
+# types.  An intrinsic type never needs an include statement or a forward
+# declaration.
+default_intrinsic_type_list = ['signed', 'unsigned', 'char', 'signed char', 'unsigned char', 'wchar_t',
+                               'short', 'signed short', 'unsigned short', 'int', 'signed int', 'unsigned int',
+                               'long', 'signed long', 'unsigned long', '__int64', 'signed __int64', 'unsigned __int64',
+                               'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16', 'uint32', 'uint64',
+                               'int8_t', 'int16_t', 'int32_t', 'int64_t', 'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t',
+                               'float',  'double', 'bool', 'void', 'BOOL', 'VOID', 'TCHAR', 'BYTE', 'WORD', 'DWORD',
+                               'LPVOID', 'LPTCHAR', 'LPBYTE', 'LPWORD', 'LPDWORD', 'BYTE_PTR', 'WORD_PTR', 'INT_PTR',
+                               'UINT_PTR', 'DWORD_PTR']
+
+# The environment variable that contains a comma separated list of more
+# intrinsic type names, for example 'real_t, index_t'.
+intrinsic_types_variable_name = 'MAKE_CPP_CLASS_INTRINSIC_TYPES'
+
+def get_configured_intrinsic_type_list():
+    """ Return the intrinsic type names in the environment variable. """
+    type_name_text = os.environ.get(intrinsic_types_variable_name, '')
+    return [type_name.strip() for type_name in type_name_text.split(',') if type_name.strip()]
+
+# The set is built once, and is shared by every TypeInfo instance.  The
+# intrinsic types of the type registry that is used are added to the
+# base set.
+base_intrinsic_type_set = frozenset(default_intrinsic_type_list + get_configured_intrinsic_type_list())
+intrinsic_type_set = base_intrinsic_type_set
+
+def set_registry_intrinsic_types(type_name_list):
+    """ Set the intrinsic type names of the type registry that is used.
+        The intrinsic type names of any registry that was used before are
+        no longer intrinsic types.
+    """
+    global intrinsic_type_set
+    intrinsic_type_set = base_intrinsic_type_set.union([type_name.strip() for type_name in type_name_list])
+
+def is_intrinsic_type(name):
+    return name in intrinsic_type_set
+
+class TypeInfo(object):
+    """ The type of a data member, an argument, or a method return value.
+        A TypeInfo instance can be shared by many TypeAndNameInfo
+        instances, so a TypeInfo instance must not be changed after it is
+        passed to TypeAndNameInfo.set_type_info.  Use the copy method to
+        create a changed type.
+    """
 
     # static-virtual type declarations
     NORMAL_QUALIFIER_TYPE = 0
@@ -40,19 +85,18 @@ class TypeInfo:
     RENDER_DEFINITION_METHOD_RETURN_TYPE = 1
     RENDER_IMPLEMENTATION_OR_ARGUMENT_TYPE = 2
 
+    # There is no instance dictionary, because there is a TypeInfo
+    # instance for every type in the input file.
+    __slots__ = ['static_virtual_qualifier_type',
+                 'const_volatile_qualifier_type',
+                 'type_name',
+                 'type_modifier_text']
+
     def __init__(self):
         self.static_virtual_qualifier_type = ''
         self.const_volatile_qualifier_type = ''
         self.type_name = ''
         self.type_modifier_text = ''
-        self.intrinsic_type_list = ['signed', 'unsigned', 'char', 'signed char', 'unsigned char', 'wchar_t',
-                                    'short', 'signed short' 'unsigned short', 'int', 'signed int', 'unsigned int',
-                                    'long', 'signed long', 'unsigned long', '__int64', 'signed __int64', 'unsigned __int64',
-                                    'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16', 'uint32', 'uint64',
-                                    'int8_t', 'int16_t', 'int32_t', 'int64_t', 'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t',
-                                    'float',  'double', 'bool', 'void', 'BOOL', 'VOID', 'TCHAR', 'BYTE', 'WORD', 'DWORD',
-                                    'LPVOID', 'LPTCHAR', 'LPBYTE', 'LPWORD', 'LPDWORD', 'BYTE_PTR', 'WORD_PTR', 'INT_PTR',
-                                    'UINT_PTR', 'DWORD_PTR']
 
     def get_static_virtual_qualifier_type(self):
         return self.static_virtual_qualifier_type
@@ -101,6 +145,20 @@ class TypeInfo:
             type_text = '{0} {1}'.format(type_text, self.type_modifier_text)
         return type_text
 
+    def copy(self):
+        the_type_info = TypeInfo()
+        the_type_info.static_virtual_qualifier_type = self.static_virtual_qualifier_type
+        the_type_info.const_volatile_qualifier_type = self.const_volatile_qualifier_type
+        the_type_info.type_name = self.type_name
+        the_type_info.type_modifier_text = self.type_modifier_text
+        return the_type_info
+
+    def get_key(self):
+        return (self.static_virtual_qualifier_type,
+                self.const_volatile_qualifier_type,
+                self.type_name,
+                self.type_modifier_text)
+
     def clear(self):
         self.static_virtual_qualifier_type = ''
         self.const_volatile_qualifier_type = ''
@@ -108,4 +166,29 @@ class TypeInfo:
         self.type_modifier_text = ''
 
     def is_intrinsic_type(self, name):
-        return name in self.intrinsic_type_list
+        return is_intrinsic_type(name)
+
+class TypeInfoTable(object):
+    """ A table of shared TypeInfo instances.  The same type is used many
+        times in an input file, so all equal types are one TypeInfo
+        instance.  Equal types in the same table are the same instance,
+        so types can be compared with the 'is' operator.
+    """
+
+    def __init__(self):
+        self.type_info_dict = {}
+
+    def intern_type_info(self, the_type_info):
+        """ Return the shared TypeInfo instance that is equal to the passed
+            type.  The passed type is copied if the type is new, so the passed
+            instance can be changed and passed again.
+        """
+        type_key = the_type_info.get_key()
+        shared_type_info = self.type_info_dict.get(type_key)
+        if shared_type_info is None:
+            shared_type_info = the_type_info.copy()
+            self.type_info_dict[type_key] = shared_type_info
+        return shared_type_info
+
+    def get_type_info_count(self):
+        return len(self.type_info_dict)
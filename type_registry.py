@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  A type registry tells the program the include file for each type in a
+  project, which types are intrinsic types, and which types cannot be
+  forward declared.  Without a type registry, the include file for a
+  type is the type name followed by ".h".  The registry is a JSON file
+  in the following form:
+
+    {
+        "types": {
+            "Widget": {"header": "gui/widget.h"},
+            "mycompany::Handle": {"header": "core/handle.h", "forward_declarable": false},
+            "QString": {"header": "<QString>"},
+            "real_t": {"intrinsic": true}
+        },
+        "intrinsic_types": ["index_t", "count_t"],
+        "namespace_aliases": {"mc": "mycompany"}
+    }
+
+  A type name that starts with a namespace alias, such as "mc::Handle",
+  is the same type as the type name with the full namespace name.
+
+  The registry file is compiled into a dictionary that maps every type
+  name, and every type name that uses a namespace alias, to a TypeEntry.
+  The compiled registry is saved in a cache file next to the registry
+  file, which is used until the registry file changes, and each registry
+  file is only loaded once in a process.
+"""
+import os
+import json
+import hashlib
+import cPickle
+from collections import namedtuple
+import type_info
+from include_file_manager import include_decision_cache
+from output_file_writer import write_file_atomically
+
+TypeEntry = namedtuple('TypeEntry', ['include_name', 'is_intrinsic', 'is_forward_declarable'])
+
+# The environment variable that names the type registry file, which is
+# used when the registry file name is not passed on the command line.
+type_registry_variable_name = 'MAKE_CPP_CLASS_TYPE_REGISTRY'
+
+# The compiled registry file is saved in a file that has this extension
+# added to the registry file name.
+compiled_registry_extension = '.cache'
+
+REGISTRY_FORMAT_VERSION = 1
+
+class TypeRegistry:
+
+    def __init__(self, type_entry_dict=None, intrinsic_type_list=None, registry_hash=''):
+        if type_entry_dict is None:
+            type_entry_dict = {}
+        if intrinsic_type_list is None:
+            intrinsic_type_list = []
+        self.type_entry_dict = type_entry_dict
+        self.intrinsic_type_list = intrinsic_type_list
+        self.registry_hash = registry_hash
+        self.registry_file_name = ''
+
+    def find_type_entry(self, type_name):
+        """ Return the TypeEntry for the type name, or None if the type
+            is not in the registry.
+        """
+        return self.type_entry_dict.get(type_name)
+
+    def get_type_count(self):
+        return len(self.type_entry_dict)
+
+    def get_intrinsic_type_list(self):
+        return self.intrinsic_type_list
+
+    def get_registry_hash(self):
+        """ Return a hash of the registry file text. """
+        return self.registry_hash
+
+    def get_registry_file_name(self):
+        return self.registry_file_name
+
+    def set_registry_file_name(self, registry_file_name):
+        self.registry_file_name = registry_file_name
+
+def _get_registry_section(registry_dict, section_name, section_type, default_value):
+    # Raise a ValueError if a section of the registry has the wrong type.
+    section_value = registry_dict.get(section_name, default_value)
+    if not isinstance(section_value, section_type):
+        raise ValueError('The type registry {0} section must be a JSON {1}.'.format(section_name,
+                                                                                  'object' if section_type is dict else 'array'))
+    return section_value
+
+def _check_registry_string(string_value, description_text):
+    if not isinstance(string_value, basestring):
+        raise ValueError('The type registry {0} must be a string.'.format(description_text))
+    return string_value
+
+def compile_registry_text(registry_text):
+    """ Return a TypeRegistry for the text of a registry file.  Raises a
+        ValueError if the text is not a valid registry.
+    """
+    try:
+        registry_dict = json.loads(registry_text)
+    except ValueError as value_error:
+        raise ValueError('The type registry is not valid JSON. {0}'.format(value_error))
+    if not isinstance(registry_dict, dict):
+        raise ValueError('The type registry must be a JSON object.')
+    type_entry_dict = {}
+    for type_name, type_dict in _get_registry_section(registry_dict, 'types', dict, {}).items():
+        if not isinstance(type_dict, dict):
+            raise ValueError('The type registry entry for type {0} must be a JSON object.'.format(type_name))
+        type_name = str(type_name.strip())
+        include_name = str(_check_registry_string(type_dict.get('header', type_name),
+                                                  'header of type {0}'.format(type_name)))
+        type_entry_dict[type_name] = TypeEntry(include_name,
+                                               bool(type_dict.get('intrinsic', False)),
+                                               bool(type_dict.get('forward_declarable', True)))
+    for type_name in _get_registry_section(registry_dict, 'intrinsic_types', list, []):
+        type_name = str(_check_registry_string(type_name, 'intrinsic type name').strip())
+        type_entry_dict[type_name] = TypeEntry(type_name, True, True)
+    intrinsic_type_list = sorted(type_name for type_name, type_entry in type_entry_dict.items()
+                                 if type_entry.is_intrinsic)
+    # Add the type names that start with a namespace alias, so that
+    # finding a type is a single dictionary lookup.
+    for alias_name, namespace_name in _get_registry_section(registry_dict, 'namespace_aliases', dict, {}).items():
+        _check_registry_string(namespace_name, 'namespace of alias {0}'.format(alias_name))
+        namespace_prefix = '{0}::'.format(namespace_name.strip())
+        alias_prefix = '{0}::'.format(alias_name.strip())
+        for type_name, type_entry in type_entry_dict.items():
+            if type_name.startswith(namespace_prefix):
+                alias_type_name = str('{0}{1}'.format(alias_prefix, type_name[len(namespace_prefix):]))
+                type_entry_dict.setdefault(alias_type_name, type_entry)
+    return TypeRegistry(type_entry_dict,
+                        intrinsic_type_list,
+                        hashlib.md5(registry_text).hexdigest())
+
+# The loaded registry and the registry file modification time and size
+# for each registry file name.
+_type_registry_dict = {}
+
+def get_registry_file_stat(registry_file_name):
+    registry_file_stat = os.stat(registry_file_name)
+    return (registry_file_stat.st_mtime, registry_file_stat.st_size)
+
+def load_type_registry(registry_file_name):
+    """ Return the TypeRegistry for a registry file.  Raises a ValueError
+        if the file is not a valid registry, or an EnvironmentError if the
+        file cannot be read.
+    """
+    registry_file_name = os.path.abspath(registry_file_name)
+    registry_file_stat = get_registry_file_stat(registry_file_name)
+    registry_stat, type_registry = _type_registry_dict.get(registry_file_name, (None, None))
+    if registry_stat == registry_file_stat:
+        return type_registry
+    compiled_file_name = '{0}{1}'.format(registry_file_name, compiled_registry_extension)
+    type_registry = _load_compiled_registry(compiled_file_name, registry_file_stat)
+    if type_registry is None:
+        with open(registry_file_name, 'rb') as registry_file:
+            type_registry = compile_registry_text(registry_file.read())
+        _save_compiled_registry(compiled_file_name, registry_file_stat, type_registry)
+    type_registry.set_registry_file_name(registry_file_name)
+    _type_registry_dict[registry_file_name] = (registry_file_stat, type_registry)
+    return type_registry
+
+def _load_compiled_registry(compiled_file_name, registry_file_stat):
+    # A missing or damaged compiled registry file, or a compiled registry
+    # for a different version of the registry file, is not used.
+    try:
+        with open(compiled_file_name, 'rb') as compiled_file:
+            compiled_dict = cPickle.load(compiled_file)
+        if (compiled_dict.get('format_version') == REGISTRY_FORMAT_VERSION
+            and compiled_dict.get('registry_stat') == registry_file_stat):
+            return TypeRegistry(dict((type_name, TypeEntry(*type_entry))
+                                     for type_name, type_entry in compiled_dict['types'].iteritems()),
+                                compiled_dict['intrinsic_types'],
+                                compiled_dict['registry_hash'])
+    except (EnvironmentError, cPickle.UnpicklingError, EOFError, KeyError, ValueError, TypeError, AttributeError):
+        pass
+    return None
+
+def _save_compiled_registry(compiled_file_name, registry_file_stat, type_registry):
+    compiled_dict = {'format_version' : REGISTRY_FORMAT_VERSION,
+                     'registry_stat' : registry_file_stat,
+                     'types' : dict((type_name, tuple(type_entry))
+                                    for type_name, type_entry in type_registry.type_entry_dict.iteritems()),
+                     'intrinsic_types' : type_registry.get_intrinsic_type_list(),
+                     'registry_hash' : type_registry.get_registry_hash()}
+    # The compiled registry only makes loading faster, so the registry
+    # is still used if the compiled registry cannot be written.
+    try:
+        write_file_atomically(compiled_file_name,
+                              cPickle.dumps(compiled_dict, cPickle.HIGHEST_PROTOCOL))
+    except EnvironmentError:
+        pass
+
+def get_configured_type_registry_file_name():
+    """ Return the registry file name that is set in the environment, or
+        the empty string if there is none.
+    """
+    return os.environ.get(type_registry_variable_name, '').strip()
+
+def use_type_registry(registry_file_name):
+    """ Load the registry file and use the registry for every class that is
+        created by this process.  The intrinsic types in the registry are
+        intrinsic types only while the registry is used.  Raises a ValueError if the file is
+        not a valid registry, or an EnvironmentError if the file cannot be
+        read.
+    """
+    type_registry = None
+    registry_intrinsic_type_list = []
+    if registry_file_name:
+        type_registry = load_type_registry(registry_file_name)
+        registry_intrinsic_type_list = type_registry.get_intrinsic_type_list()
+    type_info.set_registry_intrinsic_types(registry_intrinsic_type_list)
+    include_decision_cache.set_type_registry(type_registry)
+    return type_registry
+
+def get_type_registry_file_name():
+    """ Return the file name of the registry that is used, or the empty
+        string if no registry is used.
+    """
+    type_registry = include_decision_cache.get_type_registry()
+    if type_registry is None:
+        return ''
+    return type_registry.get_registry_file_name()
+
+def get_type_registry_hash():
+    """ Return the hash of the registry that is used, or the empty string
+        if no registry is used.
+    """
+    type_registry = include_decision_cache.get_type_registry()
+    if type_registry is None:
+        return ''
+    return type_registry.get_registry_hash()
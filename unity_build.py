@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+#=======================================================================
+# Copyright (C) 2013 William Hallahan
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#=======================================================================
+"""
+  A unity build compiles many class implementation files as a single
+  translation unit, so the headers that the classes share are parsed once
+  for each unity file instead of once for each class.  The class
+  implementation files of a batch are divided into a number of unity
+  files that each have about the same size, and each unity file only
+  includes its class implementation files, after the precompiled header
+  if the class implementation files use one.
+
+  The size of a class implementation file is estimated from the method
+  bodies of the class.  The largest class implementation files are placed
+  first, each one in the unity file that is the smallest so far.
+"""
+import os
+import re
+import heapq
+from collections import namedtuple
+
+# The first line of every unity file.  A file that starts with this line
+# was written by this module and can be removed when there are fewer
+# unity files.
+unity_file_marker_text = '// Unity build file created by make_cpp_class_batch.py.  Do not edit this file.\n'
+
+unity_file_name_pattern = re.compile(r'^unity_(\d+)\.cpp$')
+
+UnitySource = namedtuple('UnitySource', ['class_name',
+                                         'implementation_file_name',
+                                         'implementation_size'])
+
+def get_unity_file_name(unit_index):
+    return 'unity_{0}.cpp'.format(unit_index)
+
+def divide_unity_sources(unity_source_list, unit_count):
+    """ Divide the unity sources into at most the unit count lists that
+        each have about the same total implementation size.  The sources
+        in each list are sorted by class name, so the same classes always
+        produce the same unity files.
+    """
+    unit_count = max(1, min(unit_count, len(unity_source_list)))
+    unit_list = [[] for unit_index in xrange(unit_count)]
+    # The heap has the total size and the index of each unit, so the
+    # smallest unit is always first.
+    unit_size_heap = [(0, unit_index) for unit_index in xrange(unit_count)]
+    for unity_source in sorted(unity_source_list,
+                               key=lambda unity_source: (-unity_source.implementation_size, unity_source.class_name)):
+        unit_size, unit_index = heapq.heappop(unit_size_heap)
+        unit_list[unit_index].append(unity_source)
+        heapq.heappush(unit_size_heap, (unit_size + unity_source.implementation_size, unit_index))
+    return [sorted(unit, key=lambda unity_source: unity_source.class_name) for unit in unit_list if unit]
+
+def render_unity_file(unity_source_list, unity_directory, precompiled_header_name=''):
+    """ Generate the text chunks of a unity file that includes the class
+        implementation files of the unity sources.  The include paths are
+        relative to the unity file folder.  If a precompiled header name is
+        passed, then the precompiled header is included first, because it
+        is only used if it is the first include of the translation unit.
+    """
+    yield unity_file_marker_text
+    yield '\n'
+    if precompiled_header_name:
+        yield '#include "{0}"\n'.format(precompiled_header_name)
+    for unity_source in unity_source_list:
+        include_path = os.path.relpath(unity_source.implementation_file_name, unity_directory)
+        yield '#include "{0}"\n'.format(include_path.replace(os.sep, '/'))
+
+def write_unity_files(unity_source_list, unit_count, unity_directory, output_file_writer, precompiled_header_name=''):
+    """ Write the unity files for the unity sources to the unity folder,
+        and remove the unity files that are left from a build that had more
+        unity files.  Only unity files that changed are written.  Every
+        unity file includes the precompiled header first, if a precompiled
+        header name is passed.  Return the list of the unity file names.
+    """
+    unity_file_name_list = []
+    for unit_index, unit in enumerate(divide_unity_sources(unity_source_list, unit_count)):
+        unity_file_name = os.path.join(unity_directory, get_unity_file_name(unit_index))
+        output_file_writer.write_chunks(unity_file_name,
+                                        list(render_unity_file(unit, unity_directory, precompiled_header_name)))
+        unity_file_name_list.append(unity_file_name)
+    remove_old_unity_files(unity_directory, len(unity_file_name_list))
+    return unity_file_name_list
+
+def remove_old_unity_files(unity_directory, unit_count):
+    """ Remove the unity files in the unity folder whose unit index is not
+        less than the unit count.  Otherwise a build that compiles every
+        unity file would compile some classes twice.
+    """
+    for file_name in os.listdir(unity_directory):
+        match = unity_file_name_pattern.match(file_name)
+        if not match or int(match.group(1)) < unit_count:
+            continue
+        unity_file_name = os.path.join(unity_directory, file_name)
+        try:
+            with open(unity_file_name, 'r') as unity_file:
+                is_unity_file = unity_file.readline() == unity_file_marker_text
+            if is_unity_file:
+                os.remove(unity_file_name)
+        except EnvironmentError:
+            pass